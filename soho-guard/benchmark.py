@@ -0,0 +1,248 @@
+# ==================================================
+# BENCHMARK SOHO GUARD (Tanpa GUI)
+# ==================================================
+"""
+Script benchmark untuk logika inti SOHO Guard.
+
+Cara pakai:
+    python benchmark.py
+    python benchmark.py --json hasil.json
+    python benchmark.py --baseline baseline.json --tolerance 0.25
+
+Hasil bisa disimpan sebagai JSON. Dengan --baseline, setiap metrik
+dibandingkan dengan hasil sebelumnya dan script keluar dengan kode 1 jika
+ada metrik yang memburuk melebihi toleransi (untuk gate rilis).
+"""
+import argparse
+import ipaddress
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+from soho_core.subnet import split_network, summarize_subnet
+
+BENCH_NETWORK = "192.168.1.0/24"
+TAIL_LINES = 1_000_000  # Ukuran log untuk benchmark tail
+RESULT_VERSION = 1
+
+
+def _metric(value, unit, better):
+    """Satu hasil benchmark; better = 'lower' atau 'higher'"""
+    return {"value": value, "unit": unit, "better": better}
+
+
+def _write_log_file(path, lines):
+    """Membuat file log sintetis berformat logs.txt dengan `lines` baris"""
+    with open(path, "w", encoding="utf-8") as file:
+        batch = []
+        for index in range(lines):
+            status = "BLOCKED" if index % 4 == 0 else "ALLOWED"
+            batch.append(f"2026-01-01 08:00:00 | SRC=192.168.1.{index % 254 + 1} "
+                         f"-> DST=10.0.{index % 200}.{index % 250 + 1} | {status}\n")
+            if len(batch) >= 100_000:
+                file.write("".join(batch))
+                batch = []
+        file.write("".join(batch))
+
+
+def bench_subnet(repeat=2000, base="10.0.0.0"):
+    """
+    Mengukur waktu split + ringkasan subnet untuk prefix /8 sampai /30.
+    Mengembalikan list (prefix, mikrodetik per operasi).
+    """
+    results = []
+    for prefix in range(8, 31):
+        network = ipaddress.ip_network(f"{base}/{prefix}", strict=False)
+        start = time.perf_counter()
+        for _ in range(repeat):
+            internal, guest = split_network(network)
+            summarize_subnet(internal)
+            summarize_subnet(guest)
+        elapsed = time.perf_counter() - start
+        results.append((prefix, elapsed / repeat * 1e6))
+    return results
+
+
+def bench_decisions(repeat=100_000):
+    """
+    Mengukur evaluasi satu traffic: policy langsung (tanpa cache) dan
+    GuardEngine.evaluate dengan cache keputusan.
+    Mengembalikan dict (mikrodetik per keputusan).
+    """
+    from soho_core.engine import GuardEngine
+
+    engine = GuardEngine(os.devnull)
+    engine.generate_subnet(BENCH_NETWORK)
+    pairs = [(f"192.168.1.{index % 254 + 1}", f"192.168.1.{(index * 7) % 254 + 1}")
+             for index in range(1024)]
+
+    start = time.perf_counter()
+    for index in range(repeat):
+        source, destination = pairs[index % 1024]
+        engine.policy.evaluate(source, destination)
+    uncached = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for index in range(repeat):
+        source, destination = pairs[index % 1024]
+        engine.evaluate(source, destination, log=False)
+    cached = time.perf_counter() - start
+    return {"uncached": uncached / repeat * 1e6, "cached": cached / repeat * 1e6}
+
+
+def bench_batch(workdir, rows=200_000):
+    """Throughput evaluasi file flow (baris per detik)"""
+    from soho_core.flows import evaluate_flow_file
+
+    path = os.path.join(workdir, "flows.csv")
+    with open(path, "w") as file:
+        file.write("src,dst\n")
+        file.write("".join(f"192.168.1.{index % 254 + 1},192.168.1.{(index * 7) % 254 + 1}\n"
+                           for index in range(rows)))
+    internal, guest = split_network(ipaddress.ip_network(BENCH_NETWORK))
+    return evaluate_flow_file(path, internal, guest)["rows_per_sec"]
+
+
+def bench_log_write(workdir, lines=200_000):
+    """Throughput LogSink sampai semua baris tersimpan di disk (baris per detik)"""
+    from soho_core.logsink import LogSink
+
+    sink = LogSink(os.path.join(workdir, "write.txt"))
+    start = time.perf_counter()
+    for index in range(lines):
+        sink.write(f"192.168.1.{index % 254 + 1}", "192.168.1.10", "ALLOWED")
+    sink.close()
+    return lines / (time.perf_counter() - start)
+
+
+def bench_tail(log_path, repeat=200):
+    """Waktu membaca 12 baris terakhir dari log besar (milidetik)"""
+    from soho_core.logread import tail_lines
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        tail_lines(log_path, 12)
+    return (time.perf_counter() - start) / repeat * 1e3
+
+
+def bench_pdf(workdir, lines=20_000):
+    """Waktu membuat laporan PDF dari log `lines` baris (detik)"""
+    from soho_core.report import build_report
+
+    log_path = os.path.join(workdir, "report_logs.txt")
+    _write_log_file(log_path, lines)
+    internal, guest = split_network(ipaddress.ip_network(BENCH_NETWORK))
+    return build_report(os.path.join(workdir, "report.pdf"), log_path, internal, guest)["elapsed"]
+
+
+def run_benchmarks(quick=False, skip_pdf=False, progress=print):
+    """
+    Menjalankan semua benchmark.
+    Mengembalikan dict nama_metrik -> {value, unit, better}.
+    """
+    scale = 10 if quick else 1
+    results = {}
+
+    progress("Subnet generation (split + summary)")
+    for prefix, micros in bench_subnet(repeat=2000 // scale):
+        results[f"subnet./{prefix}"] = _metric(micros, "us/op", "lower")
+
+    progress("Rule evaluation (per keputusan)")
+    decisions = bench_decisions(repeat=100_000 // scale)
+    results["decision.uncached"] = _metric(decisions["uncached"], "us/op", "lower")
+    results["decision.cached"] = _metric(decisions["cached"], "us/op", "lower")
+
+    with tempfile.TemporaryDirectory(prefix="soho_bench_") as workdir:
+        progress("Batch flow evaluation")
+        results["batch.rows_per_sec"] = _metric(bench_batch(workdir, 200_000 // scale),
+                                                "rows/s", "higher")
+
+        progress("Log write throughput")
+        results["log_write.lines_per_sec"] = _metric(bench_log_write(workdir, 200_000 // scale),
+                                                     "lines/s", "higher")
+
+        progress(f"Tail read ({TAIL_LINES // scale:,} baris log)")
+        tail_path = os.path.join(workdir, "tail.txt")
+        _write_log_file(tail_path, TAIL_LINES // scale)
+        results["tail.ms"] = _metric(bench_tail(tail_path), "ms", "lower")
+        os.remove(tail_path)
+
+        if not skip_pdf:
+            progress("PDF report generation")
+            try:
+                results["pdf.seconds"] = _metric(bench_pdf(workdir, 20_000 // scale), "s", "lower")
+            except ImportError:
+                progress("  ReportLab tidak tersedia, benchmark PDF dilewati")
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """
+    Bandingkan hasil dengan baseline.
+    Mengembalikan list (nama, nilai_baseline, nilai_baru, perubahan, regresi).
+    perubahan > 0 berarti lebih buruk (relatif terhadap baseline).
+    """
+    rows = []
+    for name, metric in results.items():
+        old = baseline.get(name)
+        if old is None or not old["value"]:
+            continue
+        if metric["better"] == "lower":
+            change = metric["value"] / old["value"] - 1
+        else:
+            change = old["value"] / metric["value"] - 1 if metric["value"] else float("inf")
+        rows.append((name, old["value"], metric["value"], change, change > tolerance))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark SOHO Guard (tanpa GUI)")
+    parser.add_argument("--json", metavar="FILE", help="simpan hasil sebagai JSON")
+    parser.add_argument("--baseline", metavar="FILE", help="bandingkan dengan hasil JSON sebelumnya")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="batas penurunan performa relatif (default: 0.2 = 20%%)")
+    parser.add_argument("--quick", action="store_true", help="ukuran data 10x lebih kecil")
+    parser.add_argument("--skip-pdf", action="store_true", help="lewati benchmark PDF")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(quick=args.quick, skip_pdf=args.skip_pdf)
+    print()
+    for name, metric in results.items():
+        print(f"  {name:<26} {metric['value']:>14,.3f} {metric['unit']}")
+
+    if args.json:
+        document = {
+            "version": RESULT_VERSION,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "quick": args.quick,
+            "results": results,
+        }
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(document, file, indent=2)
+        print(f"\nHasil disimpan ke {args.json}")
+
+    if not args.baseline:
+        return 0
+    with open(args.baseline, "r", encoding="utf-8") as file:
+        baseline = json.load(file)
+    if baseline.get("quick") != args.quick:
+        print("\nPeringatan: baseline dibuat dengan mode --quick yang berbeda", file=sys.stderr)
+    rows = compare(results, baseline.get("results", {}), args.tolerance)
+    regressions = [row for row in rows if row[4]]
+    print(f"\nPerbandingan dengan {args.baseline} (toleransi {args.tolerance:.0%}, + = lebih buruk)")
+    for name, old, new, change, regressed in rows:
+        flag = "REGRESI" if regressed else "ok"
+        print(f"  {name:<26} {old:>14,.3f} -> {new:>14,.3f} ({change:+.1%}) {flag}")
+    if regressions:
+        print(f"\n{len(regressions)} metrik memburuk melebihi toleransi", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,9 @@
+# ==================================================
+# SOHO GUARD CORE
+# ==================================================
+"""
+Logika inti SOHO Guard yang tidak bergantung pada GUI (Tkinter).
+
+Modul-modul di paket ini bisa dipakai dari script, server, atau benchmark
+tanpa membuat jendela aplikasi.
+"""
@@ -0,0 +1,194 @@
+# ==================================================
+# TRAFFIC ANALYTICS (Statistik Inkremental + Checkpoint)
+# ==================================================
+"""
+Statistik traffic dari logs.txt yang diperbarui secara inkremental.
+
+Offset byte terakhir yang sudah diproses disimpan di file checkpoint (JSON),
+sehingga setiap refresh hanya mem-parsing baris yang baru ditambahkan.
+Checkpoint ditulis paling sering sekali per checkpoint_interval detik (dan
+saat close()), karena isinya ikut membesar bersama jumlah alamat unik.
+
+refresh() boleh berjalan di thread job sementara GUI membaca statistik:
+counter hanya diubah per blok di bawah lock, dan method query membaca di
+bawah lock yang sama (tanpa menunggu seluruh refresh selesai).
+"""
+import json
+import os
+import threading
+import time
+from collections import Counter
+
+from soho_core.logread import parse_log_line
+
+READ_SIZE = 1024 * 1024
+CHECKPOINT_INTERVAL = 30.0  # Jeda minimum (detik) antar penulisan checkpoint
+
+
+def bucket_of(timestamp):
+    """Kunci bucket waktu per jam, contoh: '2026-01-14 08:00'"""
+    return timestamp[:13] + ":00"
+
+
+class TrafficAnalytics:
+    """
+    Counter per source, per destination dan per status, ditambah rollup per jam.
+    - log_path: file log teks
+    - checkpoint_path: file JSON untuk menyimpan offset dan counter
+    - checkpoint_interval: jeda minimum (detik) antar penulisan checkpoint;
+      0 = tulis setiap refresh
+    """
+
+    def __init__(self, log_path, checkpoint_path=None, checkpoint_interval=CHECKPOINT_INTERVAL):
+        self.log_path = log_path
+        self.checkpoint_path = checkpoint_path or os.path.splitext(log_path)[0] + ".analytics.json"
+        self.checkpoint_interval = checkpoint_interval
+        self._refresh_lock = threading.Lock()  # Satu refresh/checkpoint dalam satu waktu
+        self._lock = threading.Lock()          # Melindungi counter (refresh vs query)
+        self._dirty = False            # Ada perubahan yang belum ditulis ke checkpoint
+        self._saved_at = None
+        self.reset()
+        self._load_checkpoint()
+
+    def reset(self):
+        """Kosongkan semua counter dan mulai lagi dari awal file"""
+        self.offset = 0
+        self.status_counts = Counter()
+        self.source_counts = Counter()
+        self.blocked_sources = Counter()
+        self.destination_counts = Counter()
+        self.buckets = {}  # bucket -> Counter status
+
+    def _load_checkpoint(self):
+        try:
+            with open(self.checkpoint_path, "r") as file:
+                data = json.load(file)
+        except (FileNotFoundError, ValueError):
+            return
+        self.offset = data.get("offset", 0)
+        self.status_counts = Counter(data.get("status_counts", {}))
+        self.source_counts = Counter(data.get("source_counts", {}))
+        self.blocked_sources = Counter(data.get("blocked_sources", {}))
+        self.destination_counts = Counter(data.get("destination_counts", {}))
+        self.buckets = {key: Counter(value) for key, value in data.get("buckets", {}).items()}
+
+    def save_checkpoint(self):
+        """Simpan offset + counter secara atomik (tulis file sementara lalu rename)"""
+        with self._lock:  # Salinan counter, agar json.dump tidak menahan lock
+            data = {
+                "offset": self.offset,
+                "status_counts": dict(self.status_counts),
+                "source_counts": dict(self.source_counts),
+                "blocked_sources": dict(self.blocked_sources),
+                "destination_counts": dict(self.destination_counts),
+                "buckets": {key: dict(value) for key, value in self.buckets.items()},
+            }
+        tmp_path = self.checkpoint_path + ".tmp"
+        with open(tmp_path, "w") as file:
+            json.dump(data, file)
+        os.replace(tmp_path, self.checkpoint_path)
+        self._dirty = False
+        self._saved_at = time.monotonic()
+
+    def close(self):
+        """Tulis checkpoint jika masih ada perubahan yang belum disimpan"""
+        with self._refresh_lock:
+            if self._dirty:
+                self.save_checkpoint()
+
+    def add_record(self, record):
+        """Tambahkan satu LogRecord ke semua counter (pemanggil memegang _lock)"""
+        self.status_counts[record.status] += 1
+        self.source_counts[record.source] += 1
+        self.destination_counts[record.destination] += 1
+        if record.status == "BLOCKED":
+            self.blocked_sources[record.source] += 1
+        bucket = bucket_of(record.timestamp)
+        counts = self.buckets.get(bucket)
+        if counts is None:
+            counts = self.buckets[bucket] = Counter()
+        counts[record.status] += 1
+
+    def refresh(self, progress=None):
+        """
+        Proses baris baru sejak offset terakhir. Jika file log lebih kecil
+        dari offset (dihapus/dirotasi), statistik dihitung ulang dari awal.
+        - progress: callback opsional fungsi(fraksi 0.0-1.0) per blok yang
+          dibaca; exception dari callback menghentikan refresh (counter dan
+          offset tetap konsisten)
+        Checkpoint ditulis jika sudah lewat checkpoint_interval.
+        Mengembalikan jumlah baris baru.
+        """
+        with self._refresh_lock:
+            try:
+                return self._refresh(progress)
+            finally:
+                if self._dirty and (self._saved_at is None or
+                                    time.monotonic() - self._saved_at >= self.checkpoint_interval):
+                    self.save_checkpoint()
+
+    def _refresh(self, progress):
+        try:
+            size = os.path.getsize(self.log_path)
+        except FileNotFoundError:
+            size = 0
+        if size < self.offset:
+            with self._lock:
+                self.reset()
+            self._dirty = True
+        if size == self.offset:
+            return 0
+
+        added = 0
+        start = self.offset
+        with open(self.log_path, "rb") as file:
+            file.seek(self.offset)
+            pending = b""
+            while True:
+                block = file.read(READ_SIZE)
+                if not block:
+                    break
+                block = pending + block
+                cut = block.rfind(b"\n") + 1  # Hanya baris yang sudah lengkap
+                pending = block[cut:]
+                lines = block[:cut].decode("utf-8", errors="replace").splitlines()
+                records = [record for record in map(parse_log_line, lines) if record is not None]
+                with self._lock:
+                    for record in records:
+                        self.add_record(record)
+                    self.offset += cut
+                added += len(records)
+                self._dirty = True
+                if progress is not None:
+                    progress(min(1.0, (self.offset - start) / max(1, size - start)))
+        return added
+
+    # ---------- Query ----------
+    @property
+    def total(self):
+        with self._lock:
+            return sum(self.status_counts.values())
+
+    @property
+    def blocked_ratio(self):
+        with self._lock:
+            total = sum(self.status_counts.values())
+            return self.status_counts["BLOCKED"] / total if total else 0.0
+
+    def top_blocked_sources(self, n=5):
+        with self._lock:
+            return self.blocked_sources.most_common(n)
+
+    def top_destinations(self, n=5):
+        with self._lock:
+            return self.destination_counts.most_common(n)
+
+    def blocked_ratio_series(self, last=None):
+        """List (bucket, total, rasio blocked) terurut waktu"""
+        series = []
+        with self._lock:
+            for bucket in sorted(self.buckets):
+                counts = self.buckets[bucket]
+                total = sum(counts.values())
+                series.append((bucket, total, counts["BLOCKED"] / total if total else 0.0))
+        return series[-last:] if last else series
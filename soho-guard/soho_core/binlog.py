@@ -0,0 +1,239 @@
+# ==================================================
+# BINARY LOG FORMAT (Log Biner Ringkas + Rotasi)
+# ==================================================
+"""
+Format log biner opsional untuk SOHO Guard.
+
+Segmen versi 1 (hanya IPv4): setiap record berukuran tetap 13 byte:
+    epoch detik (uint32) | IP source (4 byte) | IP destination (4 byte) | status (1 byte)
+
+Segmen versi 3 dipakai setelah ada alamat IPv6. Setiap record diberi tag
+famili per alamat:
+    epoch detik (uint32) | tag (1 byte) | IP source (4/16 byte) | IP destination (4/16 byte)
+Tag: bit 0 = status, bit 1 = source IPv6, bit 2 = destination IPv6. Record
+IPv4 tetap 13 byte, jadi satu alamat IPv6 tidak membuat seluruh log membesar,
+dan alamat IPv6 asli seperti ::ffff:a.b.c.d tetap IPv6 saat dibaca ulang.
+Versi segmen tercatat di header, jadi satu log bisa berisi segmen versi 1
+dan versi 3.
+
+Record ditulis ke file segmen yang dirotasi berdasarkan ukuran
+(logs.bin.000001, logs.bin.000002, ...). GuardEngine(binary_log=...) /
+opsi CLI --binary-log memakai BinaryLogWriter sebagai log keputusan live.
+Modul ini juga menyediakan konverter dari/ke format teks logs.txt.
+"""
+import glob
+import socket
+import struct
+import threading
+import time
+
+from soho_core.logread import parse_log_line
+from soho_core.logsink import TIMESTAMP_FORMAT, format_log_line
+
+MAGIC = b"SGLB\x01\x00\x00\x00"           # Header segmen versi 1 (IPv4)
+MAGIC_V3 = b"SGLB\x03\x00\x00\x00"        # Header segmen versi 3 (dual-stack, tag per record)
+RECORD = struct.Struct("<I4s4sB")           # epoch, src, dst, status
+TAGGED_HEAD = struct.Struct("<IB")          # epoch, tag (versi 3, diikuti alamat)
+TAG_STATUS = 0x01                           # Bit status (0 = ALLOWED, 1 = BLOCKED)
+TAG_SRC_V6 = 0x02                           # Source 16 byte
+TAG_DST_V6 = 0x04                           # Destination 16 byte
+MAX_SEGMENT_BYTES = 64 * 1024 * 1024        # Ukuran maksimum satu segmen
+
+STATUS_CODES = {"ALLOWED": 0, "BLOCKED": 1}
+STATUS_NAMES = {code: name for name, code in STATUS_CODES.items()}
+
+
+def segment_path(base_path, number):
+    """Nama file segmen ke-n, contoh: logs.bin.000003"""
+    return f"{base_path}.{number:06d}"
+
+
+def list_segments(base_path):
+    """Daftar file segmen yang ada, terurut dari yang paling lama"""
+    return sorted(glob.glob(glob.escape(base_path) + ".[0-9][0-9][0-9][0-9][0-9][0-9]"))
+
+
+def _pack_ip(address):
+    """
+    Alamat dalam bentuk bytes: 4 byte untuk IPv4, 16 byte untuk IPv6.
+    ValueError jika alamat tidak valid (termasuk alamat dengan scope, fe80::1%eth0).
+    """
+    text = str(address)
+    family = socket.AF_INET6 if ":" in text else socket.AF_INET
+    try:
+        return socket.inet_pton(family, text)
+    except (OSError, ValueError):
+        # inet_pton melempar OSError; bedakan dari error disk saat menulis
+        raise ValueError(f"Alamat IP tidak valid: {text!r}") from None
+
+
+def unpack_ip(packed):
+    """Bytes alamat (4 atau 16 byte) menjadi string"""
+    if len(packed) == 4:
+        return socket.inet_ntoa(packed)
+    return socket.inet_ntop(socket.AF_INET6, packed)
+
+
+class BinaryLogWriter:
+    """
+    Penulis log biner dengan rotasi segmen.
+    Signature write/flush/close sama dengan LogSink, jadi GuardEngine bisa
+    memakainya sebagai sink. Berbeda dengan LogSink, record langsung ditulis
+    ke buffer file di thread pemanggil (timeout diabaikan); aman dipanggil
+    dari beberapa thread.
+    """
+
+    def __init__(self, base_path, max_segment_bytes=MAX_SEGMENT_BYTES):
+        self.base_path = base_path
+        self.max_segment_bytes = max_segment_bytes
+        segments = list_segments(base_path)
+        self._number = len(segments) and int(segments[-1].rsplit(".", 1)[1])
+        self._file = None
+        self._lock = threading.Lock()
+        self._tagged = False  # True = segmen versi 3 (tag famili per record)
+        if segments:
+            with open(segments[-1], "rb") as file:
+                self._tagged = file.read(len(MAGIC)) == MAGIC_V3
+            self._file = open(segments[-1], "ab")
+        else:
+            self._rotate()
+
+    def _rotate(self):
+        if self._file is not None:
+            self._file.close()
+        self._number += 1
+        self._file = open(segment_path(self.base_path, self._number), "ab")
+        if self._file.tell() == 0:
+            self._file.write(MAGIC_V3 if self._tagged else MAGIC)
+
+    def write(self, source, destination, status, timeout=None, epoch=None):
+        """
+        Tambahkan satu record (epoch default = waktu sekarang).
+        ValueError jika alamat tidak valid; tidak ada yang ditulis.
+        timeout hanya untuk kecocokan dengan LogSink.write.
+        """
+        src = _pack_ip(source)
+        dst = _pack_ip(destination)
+        if epoch is None:
+            epoch = int(time.time())
+        with self._lock:
+            if self._file is None:
+                raise ValueError("BinaryLogWriter sudah ditutup")
+            self._write(src, dst, STATUS_CODES[status], epoch)
+
+    def _write(self, src, dst, code, epoch):
+        if not self._tagged and (len(src) == 16 or len(dst) == 16):
+            # Alamat IPv6 pertama: lanjut di segmen versi 3 (segmen yang masih
+            # kosong langsung diganti header-nya, tanpa membuat segmen baru)
+            self._tagged = True
+            if self._file.tell() <= len(MAGIC):
+                self._file.truncate(0)
+                self._file.write(MAGIC_V3)
+            else:
+                self._rotate()
+        if self._tagged:
+            tag = code
+            if len(src) == 16:
+                tag |= TAG_SRC_V6
+            if len(dst) == 16:
+                tag |= TAG_DST_V6
+            data = TAGGED_HEAD.pack(epoch, tag) + src + dst
+        else:
+            data = RECORD.pack(epoch, src, dst, code)
+        if self._file.tell() + len(data) > self.max_segment_bytes:
+            self._rotate()
+        self._file.write(data)
+
+    def flush(self, timeout=None):
+        """Tulis buffer ke disk (timeout hanya untuk kecocokan dengan LogSink)"""
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+        return True
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def _iter_tagged(body):
+    """Record segmen versi 3 (panjang bervariasi) sebagai tuple mentah"""
+    position, size = 0, len(body)
+    head = TAGGED_HEAD.size
+    while position + head <= size:
+        epoch, tag = TAGGED_HEAD.unpack_from(body, position)
+        src_end = position + head + (16 if tag & TAG_SRC_V6 else 4)
+        dst_end = src_end + (16 if tag & TAG_DST_V6 else 4)
+        if dst_end > size:
+            break  # Record terpotong di akhir segmen
+        yield epoch, bytes(body[position + head:src_end]), bytes(body[src_end:dst_end]), tag & TAG_STATUS
+        position = dst_end
+
+
+def iter_raw_records(base_path):
+    """
+    Membaca semua record sebagai tuple mentah (epoch, src_bytes, dst_bytes, status_code).
+    Segmen versi 1 dibaca sekaligus lalu di-unpack dengan struct.iter_unpack.
+    Alamat IPv4 selalu 4 byte, IPv6 16 byte.
+    """
+    for path in list_segments(base_path):
+        with open(path, "rb") as file:
+            data = file.read()
+        body = memoryview(data)[len(MAGIC):]
+        if data.startswith(MAGIC_V3):
+            yield from _iter_tagged(body)
+            continue
+        if not data.startswith(MAGIC):
+            raise ValueError(f"Bukan file log SOHO Guard: {path}")
+        usable = len(body) - len(body) % RECORD.size  # Abaikan record terpotong
+        yield from RECORD.iter_unpack(body[:usable])
+
+
+def iter_records(base_path):
+    """Membaca record sebagai (epoch, source, destination, status) dalam bentuk string"""
+    for epoch, src, dst, code in iter_raw_records(base_path):
+        yield epoch, unpack_ip(src), unpack_ip(dst), STATUS_NAMES[code]
+
+
+def text_to_binary(text_path, base_path, max_segment_bytes=MAX_SEGMENT_BYTES):
+    """
+    Konversi logs.txt ke format biner. Baris yang tidak dikenali dilewati,
+    termasuk baris dengan alamat atau timestamp tidak valid dan byte non-UTF-8.
+    Mengembalikan jumlah record yang ditulis.
+    """
+    writer = BinaryLogWriter(base_path, max_segment_bytes)
+    written = 0
+    last_stamp, last_epoch = None, None
+    try:
+        with open(text_path, "r", encoding="utf-8", errors="replace") as file:
+            for line in file:
+                record = parse_log_line(line)
+                if record is None or record.status not in STATUS_CODES:
+                    continue
+                try:
+                    if record.timestamp != last_stamp:
+                        last_epoch = int(time.mktime(time.strptime(record.timestamp, TIMESTAMP_FORMAT)))
+                        last_stamp = record.timestamp
+                    writer.write(record.source, record.destination, record.status, epoch=last_epoch)
+                except (ValueError, OverflowError, struct.error):
+                    continue  # Alamat/timestamp tidak valid atau di luar rentang uint32
+                written += 1
+    finally:
+        writer.close()
+    return written
+
+
+def binary_to_text(base_path, text_path):
+    """Konversi log biner kembali ke format teks logs.txt (mode append)"""
+    written = 0
+    last_epoch, last_stamp = None, None
+    with open(text_path, "a", encoding="utf-8", newline="") as file:
+        for epoch, source, destination, status in iter_records(base_path):
+            if epoch != last_epoch:
+                last_epoch = epoch
+                last_stamp = time.strftime(TIMESTAMP_FORMAT, time.localtime(epoch))
+            file.write(format_log_line(source, destination, status, last_stamp))
+            written += 1
+    return written
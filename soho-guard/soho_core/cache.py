@@ -0,0 +1,84 @@
+# ==================================================
+# DECISION CACHE (LRU untuk Pasangan Source/Destination)
+# ==================================================
+"""
+Cache LRU untuk keputusan firewall.
+
+Traffic nyata didominasi oleh pasangan source/destination yang berulang.
+Kunci cache adalah pasangan alamat dalam bentuk packed bytes, jadi pada
+cache hit tidak ada objek ipaddress yang dibuat dan subnet tidak dicek ulang.
+"""
+import ipaddress
+import socket
+from collections import OrderedDict
+
+
+def pack_address(address):
+    """
+    Alamat (string atau objek ip_address) menjadi packed bytes:
+    4 byte untuk IPv4, 16 byte untuk IPv6. ValueError jika tidak valid.
+    """
+    if not isinstance(address, str):
+        return address.packed
+    try:
+        if ":" in address:
+            return socket.inet_pton(socket.AF_INET6, address)
+        return socket.inet_pton(socket.AF_INET, address)
+    except OSError:
+        # Bentuk lain yang diterima ipaddress (misal scope id IPv6)
+        return ipaddress.ip_address(address).packed
+
+
+def unpack_address(packed):
+    """Kebalikan pack_address: packed bytes menjadi string kanonik"""
+    family = socket.AF_INET if len(packed) == 4 else socket.AF_INET6
+    return socket.inet_ntop(family, packed)
+
+
+class DecisionCache:
+    """
+    Cache LRU berukuran tetap.
+    - maxsize: jumlah entri maksimum sebelum entri paling lama dibuang
+    """
+
+    def __init__(self, maxsize=65_536):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key):
+        """Ambil keputusan dari cache (None jika tidak ada)"""
+        value = self._data.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """Kosongkan cache (dipanggil saat subnet atau policy berubah)"""
+        self._data.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
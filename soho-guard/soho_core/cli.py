@@ -0,0 +1,397 @@
+# ==================================================
+# COMMAND LINE INTERFACE (Tanpa GUI)
+# ==================================================
+"""
+CLI SOHO Guard. Contoh:
+
+    python -m soho_core subnet 192.168.1.0/24
+    python -m soho_core vlsm 192.168.1.0/24 internal=100 guest=20 iot=10
+    python -m soho_core eval --network 192.168.1.0/24 192.168.1.200 192.168.1.10
+    python -m soho_core batch --network 192.168.1.0/24 flows.csv
+    python -m soho_core batch --network 192.168.1.0/24 --workers 0 --log flows.csv
+    python -m soho_core report --network 192.168.1.0/24
+    python -m soho_core --snapshot policy.snap batch --workers 0 flows.csv
+    python -m soho_core replay --network 192.168.1.0/24 logs.txt
+    python -m soho_core analytics
+    python -m soho_core inventory --network 10.20.0.0/24 inventory.txt
+    python -m soho_core search --from "2026-01-14 08:00" --to "2026-01-14 09:00" --src 192.168.1.130
+    python -m soho_core ingest --network 192.168.1.0/24 --tcp 9514 --udp 9514
+    python -m soho_core send-flows --network 192.168.1.0/24 --tcp 9514 --count 100000
+    python -m soho_core convert to-binary logs.txt logs.bin
+    python -m soho_core --metrics-file metrics.prom replay --network 192.168.1.0/24 logs.txt
+
+Modul berat (ReportLab, NumPy) hanya di-import oleh perintah yang membutuhkannya.
+"""
+import argparse
+import sys
+
+from soho_core.engine import LOG_FILE, REPORT_FILE, GuardEngine
+
+
+def _engine_from_args(args):
+    """
+    Membuat GuardEngine dari opsi --network dan/atau --policy.
+    Dengan --snapshot: policy tersebut ditulis sebagai snapshot; tanpa
+    --network/--policy, policy dibaca dari snapshot yang sudah ada.
+    """
+    network = getattr(args, "network", None)
+    policy = getattr(args, "policy", None)
+    engine = GuardEngine(args.log_file, snapshot_path=args.snapshot if network or policy else None,
+                         binary_log=args.binary_log)
+    if network:
+        engine.generate_subnet(network)
+    if policy:
+        engine.load_policy(policy)
+    if engine.snapshot_error is not None:
+        raise SystemExit(f"Error: snapshot policy gagal ditulis: {engine.snapshot_error}")
+    if engine.policy is None and args.snapshot:
+        engine.use_snapshot(args.snapshot)
+    if engine.policy is None:
+        raise SystemExit("Error: gunakan --network, --policy atau --snapshot")
+    return engine
+
+
+def cmd_subnet(args):
+    engine = GuardEngine(args.log_file)
+    for name, summary in zip(("Internal", "Guest"), engine.generate_subnet(args.network)):
+        print(f"{name} Subnet : {summary.network}")
+        print(f"  Network    : {summary.network_address}")
+        print(f"  Broadcast  : {summary.broadcast_address}")
+        print(f"  Host Range : {summary.first_host} - {summary.last_host} ({summary.host_count:,} host)")
+    return 0
+
+
+def cmd_vlsm(args):
+    from soho_core.vlsm import parse_requirements, plan_vlsm
+
+    try:
+        plan = plan_vlsm(args.network, parse_requirements(",".join(args.requirements)))
+    except ValueError as error:
+        print(f"Error: {error}", file=sys.stderr)
+        return 2
+    for alloc in plan.allocations:
+        summary = alloc.summary
+        print(f"{alloc.name:<16} {str(alloc.network):<20} {summary.first_host} - {summary.last_host} "
+              f"({alloc.hosts:,}/{summary.host_count:,} host)")
+    print(f"Alamat teralokasi : {plan.allocated_addresses:,} / {plan.parent.num_addresses:,}")
+    print(f"Utilisasi host    : {plan.utilization:.1%}")
+    print(f"Blok bebas        : {', '.join(str(net) for net in plan.free_blocks) or '-'}")
+    return 0
+
+
+def cmd_eval(args):
+    engine = _engine_from_args(args)
+    try:
+        decision = engine.evaluate(args.source, args.destination, log=not args.no_log)
+    except ValueError:
+        print("Error: IP Source atau Destination tidak valid!", file=sys.stderr)
+        return 2
+    finally:
+        engine.close()
+    src_name = decision.src_segment or "luar"
+    dst_name = decision.dst_segment or "luar"
+    print(f"{decision.action} - {src_name} ke {dst_name}")
+    if engine.policy_version:
+        print(f"Policy: {engine.policy_version}")
+    return 0
+
+
+def cmd_batch(args):
+    from soho_core.flows import evaluate_flow_file
+
+    if args.log and args.binary_log:
+        raise SystemExit("Error: batch --log hanya menulis log teks (--log-file)")
+    engine = _engine_from_args(args)
+    if args.workers == 1 and not args.log and not args.snapshot:
+        result = evaluate_flow_file(args.flow_file, engine.internal_subnet, engine.guest_subnet)
+    else:
+        from soho_core.shards import evaluate_flow_file_parallel
+
+        result = evaluate_flow_file_parallel(args.flow_file, engine.internal_subnet,
+                                             engine.guest_subnet, workers=args.workers,
+                                             log_path=args.log_file if args.log else None,
+                                             snapshot_path=args.snapshot)
+    print(f"Total   : {result['total']:,}")
+    print(f"ALLOWED : {result['allowed']:,}")
+    print(f"BLOCKED : {result['blocked']:,}")
+    print(f"Invalid : {result['invalid']:,}")
+    print(f"Waktu   : {result['elapsed']:.3f} detik ({result['rows_per_sec']:,.0f} baris/detik)")
+    if "workers" in result:
+        print(f"Worker  : {result['workers']} proses, {result['shards']} shard")
+    if result.get("policy_versions"):
+        print(f"Policy  : {', '.join(result['policy_versions'])}")
+    return 0
+
+
+def cmd_replay(args):
+    import time
+
+    from soho_core.logread import parse_log_line
+
+    engine = _engine_from_args(args)
+    start = time.perf_counter()
+    with open(args.replay_file, "r", encoding="utf-8", errors="replace") as file:
+        records = (parse_log_line(line) for line in file)
+        counts = engine.evaluate_many((r.source, r.destination) for r in records if r is not None)
+    elapsed = time.perf_counter() - start
+    for action, count in sorted(counts.items()):
+        print(f"{action:<8}: {count:,}")
+    stats = engine.cache.stats()
+    print(f"Waktu   : {elapsed:.3f} detik")
+    print(f"Cache   : {stats['hits']:,} hit, {stats['misses']:,} miss, "
+          f"{stats['evictions']:,} eviction ({stats['hit_rate']:.1%} hit rate)")
+    return 0
+
+
+def cmd_report(args):
+    import os
+
+    from soho_core.analytics import TrafficAnalytics
+    from soho_core.engine import ensure_storage
+    from soho_core.reportcache import ReportCache
+
+    engine = _engine_from_args(args)
+    ensure_storage(args.log_file, os.path.dirname(args.output))
+    analytics = TrafficAnalytics(args.log_file)
+    analytics.refresh()
+    cache = ReportCache(args.output, keep=args.keep)
+    if args.force and os.path.exists(cache.state_path):
+        os.remove(cache.state_path)
+    result = cache.build(args.log_file, engine.internal_subnet, engine.guest_subnet,
+                         analytics=analytics)
+    if result["cached"]:
+        print(f"{args.output}: tidak berubah ({result['pages']} halaman, {result['records']:,} log)")
+        return 0
+    redrawn = f", {result['drawn']:,} digambar ulang" if result["drawn"] < result["pages"] else ""
+    print(f"{args.output}: {result['pages']:,} halaman{redrawn}, {result['records']:,} log "
+          f"({result['pages_per_sec']:,.0f} halaman/detik)")
+    if result["volumes"]:
+        print(f"Volume riwayat lanjutan: {len(result['volumes'])} file "
+              f"({os.path.basename(result['volumes'][0])} s/d {os.path.basename(result['volumes'][-1])})")
+    return 0
+
+
+def cmd_analytics(args):
+    from soho_core.analytics import TrafficAnalytics
+
+    analytics = TrafficAnalytics(args.log_file)
+    added = analytics.refresh()
+    print(f"Log baru diproses : {added:,}")
+    print(f"Total log         : {analytics.total:,} ({analytics.blocked_ratio:.1%} blocked)")
+    print("Top Blocked Sources:")
+    for source, count in analytics.top_blocked_sources(args.top):
+        print(f"  {source:<40} {count:,}")
+    print("Busiest Destinations:")
+    for destination, count in analytics.top_destinations(args.top):
+        print(f"  {destination:<40} {count:,}")
+    return 0
+
+
+def cmd_ingest(args):
+    import asyncio
+
+    from soho_core.ingest import FlowIngestService, run_service
+
+    engine = _engine_from_args(args)
+    service = FlowIngestService(engine, args.host, udp_port=args.udp, tcp_port=args.tcp,
+                                log=not args.no_log, udp_idle_timeout=args.udp_idle)
+    try:
+        asyncio.run(run_service(service, args.stats_interval))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        engine.close()
+    totals = service.totals()
+    print(f"Total: {totals['events']:,} event, {totals['blocked']:,} blocked, "
+          f"{totals['invalid']:,} invalid, {totals['dropped']:,} log dropped")
+    return 0
+
+
+def cmd_send_flows(args):
+    import asyncio
+    import ipaddress
+
+    from soho_core.ingest import make_test_events, send_events
+    from soho_core.subnet import split_network
+
+    internal, guest = split_network(ipaddress.ip_network(args.network, strict=False))
+    protocol, port = ("tcp", args.tcp) if args.tcp else ("udp", args.udp)
+    if port is None:
+        raise SystemExit("Error: gunakan --tcp atau --udp")
+    lines = make_test_events(internal, guest, args.count)
+    sent, elapsed = asyncio.run(send_events(lines, args.host, port, protocol))
+    print(f"{sent:,} event dikirim lewat {protocol.upper()} dalam {elapsed:.3f} detik "
+          f"({sent / elapsed if elapsed > 0 else 0:,.0f} event/detik)")
+    return 0
+
+
+def cmd_search(args):
+    import os
+
+    from soho_core.timeindex import TimeIndex
+
+    index = TimeIndex(args.log_file)
+    try:
+        if args.rebuild_index:
+            index.reset()
+        indexed = index.update()
+        if indexed:
+            print(f"Indeks diperbarui: {indexed:,} byte log baru", file=sys.stderr)
+        found = 0
+        for record in index.search(args.time_from, args.time_to, args.src, args.dst,
+                                   args.status, args.limit, refresh=False):
+            print(f"{record.timestamp} | SRC={record.source} -> DST={record.destination} | {record.status}")
+            found += 1
+    except ValueError as error:
+        print(f"Error: {error}", file=sys.stderr)
+        return 2
+    finally:
+        index.close()
+    size = os.path.getsize(args.log_file) if os.path.exists(args.log_file) else 0
+    print(f"{found:,} baris ditemukan, {index.last_scanned_bytes:,} dari {size:,} byte log dipindai",
+          file=sys.stderr)
+    return 0
+
+
+def cmd_inventory(args):
+    from soho_core.inventory import format_report
+
+    engine = _engine_from_args(args)
+    try:
+        report = engine.check_inventory(args.inventory_file, top_gaps=args.top)
+    except (ValueError, RuntimeError) as error:
+        print(f"Error: {error}", file=sys.stderr)
+        return 2
+    for line in format_report(report):
+        print(line)
+    return 1 if report.conflicts else 0
+
+
+def cmd_convert(args):
+    from soho_core import binlog
+
+    if args.direction == "to-binary":
+        written = binlog.text_to_binary(args.source, args.target)
+    else:
+        written = binlog.binary_to_text(args.source, args.target)
+    print(f"{written:,} record dikonversi")
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="soho_guard", description="SOHO Guard (tanpa GUI)")
+    parser.add_argument("--log-file", default=LOG_FILE, help="file log traffic (default: logs.txt)")
+    parser.add_argument("--binary-log", metavar="BASE",
+                        help="tulis keputusan eval/ingest ke log biner BASE.000001, ... "
+                             "menggantikan --log-file (report/analytics/search tetap membaca log teks)")
+    parser.add_argument("--snapshot", metavar="FILE",
+                        help="snapshot policy biner: ditulis dari --network/--policy, atau dibaca jika keduanya tidak ada")
+    parser.add_argument("--metrics-file", help="aktifkan metrics dan tulis hasilnya (format Prometheus) ke file ini")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_policy_options(command):
+        command.add_argument("--network", help="network yang dibagi menjadi Internal/Guest, contoh 192.168.1.0/24")
+        command.add_argument("--policy", help="file policy JSON (multi-segmen)")
+
+    sub = commands.add_parser("subnet", help="bagi network menjadi subnet Internal dan Guest")
+    sub.add_argument("network")
+    sub.set_defaults(func=cmd_subnet)
+
+    sub = commands.add_parser("vlsm", help="bagi network dengan VLSM (nama=jumlah_host ...)")
+    sub.add_argument("network")
+    sub.add_argument("requirements", nargs="+", metavar="nama=host")
+    sub.set_defaults(func=cmd_vlsm)
+
+    sub = commands.add_parser("eval", help="evaluasi satu traffic source -> destination")
+    add_policy_options(sub)
+    sub.add_argument("source")
+    sub.add_argument("destination")
+    sub.add_argument("--no-log", action="store_true", help="jangan tulis keputusan ke log")
+    sub.set_defaults(func=cmd_eval)
+
+    sub = commands.add_parser("batch", help="evaluasi file flow CSV (src,dst)")
+    sub.add_argument("--network", help="wajib kecuali memakai --snapshot")
+    sub.add_argument("--workers", type=int, default=1,
+                     help="jumlah proses paralel (0 = semua core, default: 1)")
+    sub.add_argument("--log", action="store_true",
+                     help="tambahkan keputusan setiap flow ke --log-file")
+    sub.add_argument("flow_file")
+    sub.set_defaults(func=cmd_batch)
+
+    sub = commands.add_parser("replay", help="evaluasi ulang log lama dengan policy saat ini")
+    add_policy_options(sub)
+    sub.add_argument("replay_file", help="file log teks (format logs.txt)")
+    sub.set_defaults(func=cmd_replay)
+
+    sub = commands.add_parser("report", help="buat laporan PDF")
+    sub.add_argument("--network", required=True)
+    sub.add_argument("--output", default=REPORT_FILE)
+    sub.add_argument("--keep", type=int, default=10, help="jumlah arsip laporan lama yang disimpan")
+    sub.add_argument("--force", action="store_true", help="abaikan cache dan buat laporan dari awal")
+    sub.set_defaults(func=cmd_report)
+
+    sub = commands.add_parser("analytics", help="tampilkan statistik traffic (inkremental)")
+    sub.add_argument("--top", type=int, default=5)
+    sub.set_defaults(func=cmd_analytics)
+
+    sub = commands.add_parser("inventory", help="cek overlap/gap segmen baru terhadap inventaris CIDR")
+    add_policy_options(sub)
+    sub.add_argument("inventory_file", help="file CIDR yang sudah dialokasikan (satu per baris, opsional nama)")
+    sub.add_argument("--top", type=int, default=5, help="jumlah gap terbesar yang ditampilkan")
+    sub.set_defaults(func=cmd_inventory)
+
+    sub = commands.add_parser("ingest", help="daemon penerima event flow live (UDP/TCP lokal)")
+    add_policy_options(sub)
+    sub.add_argument("--host", default="127.0.0.1")
+    sub.add_argument("--tcp", type=int, help="port TCP")
+    sub.add_argument("--udp", type=int, help="port UDP")
+    sub.add_argument("--no-log", action="store_true", help="jangan tulis keputusan ke log")
+    sub.add_argument("--stats-interval", type=float, default=5.0,
+                     help="jeda cetak statistik per koneksi (detik)")
+    sub.add_argument("--udp-idle", type=float, default=60.0,
+                     help="pengirim UDP yang diam selama ini (detik) dianggap selesai")
+    sub.set_defaults(func=cmd_ingest)
+
+    sub = commands.add_parser("send-flows", help="kirim event flow uji ke daemon ingest")
+    sub.add_argument("--network", required=True)
+    sub.add_argument("--host", default="127.0.0.1")
+    sub.add_argument("--tcp", type=int, help="port TCP")
+    sub.add_argument("--udp", type=int, help="port UDP")
+    sub.add_argument("--count", type=int, default=10_000)
+    sub.set_defaults(func=cmd_send_flows)
+
+    sub = commands.add_parser("search", help="cari log berdasarkan waktu, source, destination dan status")
+    sub.add_argument("--from", dest="time_from", help="awal jendela waktu, contoh '2026-01-14 08:00'")
+    sub.add_argument("--to", dest="time_to", help="akhir jendela waktu (inklusif)")
+    sub.add_argument("--src", help="alamat source (persis)")
+    sub.add_argument("--dst", help="alamat destination (persis)")
+    sub.add_argument("--status", choices=["ALLOWED", "BLOCKED"])
+    sub.add_argument("--limit", type=int)
+    sub.add_argument("--rebuild-index", action="store_true", help="bangun ulang indeks waktu dari awal")
+    sub.set_defaults(func=cmd_search)
+
+    sub = commands.add_parser("convert", help="konversi log teks <-> biner")
+    sub.add_argument("direction", choices=["to-binary", "to-text"])
+    sub.add_argument("source")
+    sub.add_argument("target")
+    sub.set_defaults(func=cmd_convert)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if not args.metrics_file:
+        return args.func(args)
+
+    from soho_core import metrics
+
+    metrics.enable()
+    try:
+        return args.func(args)
+    finally:
+        metrics.write_prometheus_file(args.metrics_file)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
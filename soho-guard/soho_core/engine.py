@@ -0,0 +1,251 @@
+# ==================================================
+# GUARD ENGINE (Inti SOHO Guard Tanpa GUI)
+# ==================================================
+"""
+GuardEngine menyatukan subnetting, evaluasi aturan firewall dan logging
+dalam satu objek yang tidak bergantung pada Tkinter.
+
+Dipakai oleh GUI (soho_guard.py), CLI (python -m soho_core) maupun script lain.
+"""
+import ipaddress
+import os
+
+from soho_core import metrics
+from soho_core.cache import DecisionCache, pack_address, unpack_address
+from soho_core.policy import BLOCKED, Decision, Policy, Rule, Segment, default_policy, load_policy
+from soho_core.subnet import split_network, summarize_subnet
+
+LOG_FILE = "logs.txt"                                            # File log traffic
+REPORT_DIR = "reports"                                           # Folder laporan PDF
+REPORT_FILE = os.path.join(REPORT_DIR, "soho_guard_report.pdf")  # Path file PDF
+POLICY_SNAPSHOT = "policy.snap"                                  # Snapshot policy untuk proses lain
+
+
+def ensure_storage(log_file=LOG_FILE, report_dir=REPORT_DIR):
+    """Membuat file log dan folder reports jika belum ada"""
+    if not os.path.exists(log_file):
+        open(log_file, "w").close()
+    if report_dir and not os.path.exists(report_dir):
+        os.makedirs(report_dir)
+
+
+class GuardEngine:
+    """
+    State firewall SOHO Guard:
+    - internal_subnet / guest_subnet: hasil generate_subnet
+    - policy: policy aktif (default: Guest -> Internal diblokir)
+    - cache: DecisionCache, dikosongkan otomatis setiap policy berubah
+    - snapshot_path: jika diisi, setiap policy baru ditulis sebagai snapshot
+      biner (lihat soho_core.snapshot) agar bisa dipakai proses lain
+    - policy_version: versi (digest) snapshot policy aktif, jika ada
+    - snapshot_error: error terakhir saat menulis snapshot (None jika berhasil)
+    - binary_log: jika diisi, keputusan ditulis ke log biner ringkas dengan
+      path dasar ini (lihat soho_core.binlog) menggantikan log_file
+    - log sink dibuat saat log pertama kali ditulis
+    """
+
+    def __init__(self, log_file=LOG_FILE, cache_size=65_536, snapshot_path=None, binary_log=None):
+        self.log_file = log_file
+        self.binary_log = binary_log
+        self.internal_subnet = None
+        self.guest_subnet = None
+        self.policy = None
+        self.policy_version = None
+        self.snapshot_error = None
+        self.snapshot_path = snapshot_path
+        self.cache = DecisionCache(cache_size)
+        self._snapshot = None
+        self._sink = None
+
+    # ---------- Subnetting ----------
+    def generate_subnet(self, network):
+        """
+        Membagi network menjadi subnet Internal dan Guest, lalu memasang
+        policy bawaan. Mengembalikan (ringkasan internal, ringkasan guest).
+        """
+        started = metrics.start()
+        network = ipaddress.ip_network(network, strict=False)
+        self.internal_subnet, self.guest_subnet = split_network(network)
+        self.set_policy(default_policy(self.internal_subnet, self.guest_subnet))
+        summaries = summarize_subnet(self.internal_subnet), summarize_subnet(self.guest_subnet)
+        metrics.observe("soho_subnet_generation_seconds", started)
+        return summaries
+
+    def plan_segments(self, network, requirements):
+        """
+        Membagi network dengan VLSM sesuai kebutuhan host (lihat soho_core.vlsm).
+        Semua segmen menjadi segmen policy; jika ada segmen 'internal' dan
+        'guest', aturan Guest -> Internal = BLOCKED tetap berlaku.
+        Mengembalikan VlsmPlan.
+        """
+        from soho_core.vlsm import plan_vlsm
+
+        started = metrics.start()
+        plan = plan_vlsm(network, requirements)
+        networks = {alloc.name: alloc.network for alloc in plan.allocations}
+        rules = []
+        if "internal" in networks and "guest" in networks:
+            rules.append(Rule("guest", "internal", BLOCKED))
+        self.internal_subnet = networks.get("internal")
+        self.guest_subnet = networks.get("guest")
+        self.set_policy(Policy([Segment(name, net) for name, net in networks.items()], rules))
+        metrics.observe("soho_subnet_generation_seconds", started)
+        return plan
+
+    # ---------- Policy ----------
+    def set_policy(self, policy):
+        """
+        Ganti policy aktif; keputusan lama di cache tidak berlaku lagi.
+        Jika snapshot_path diisi, snapshot policy ditulis ulang (atomik).
+        Gagal menulis snapshot tidak membatalkan policy lokal: error-nya
+        disimpan di snapshot_error agar pemanggil bisa melaporkannya.
+        """
+        self.policy = policy
+        self._snapshot = None
+        self.policy_version = None
+        self.snapshot_error = None
+        self.cache.clear()
+        if self.snapshot_path:
+            from soho_core.snapshot import write_snapshot
+            try:
+                self.policy_version = write_snapshot(policy, self.snapshot_path)
+            except (OSError, ValueError) as error:
+                self.snapshot_error = error
+
+    def use_snapshot(self, path):
+        """
+        Pakai snapshot policy (read-only, di-mmap) yang ditulis proses lain.
+        Snapshot dimuat ulang otomatis saat file diganti.
+        """
+        from soho_core.snapshot import PolicySnapshot
+
+        snapshot = PolicySnapshot(path)
+        self.policy = snapshot
+        self.policy_version = snapshot.version
+        self.internal_subnet = self.guest_subnet = None
+        self.cache.clear()
+        self._snapshot = snapshot
+        return snapshot
+
+    def reload_snapshot(self):
+        """Cek perubahan snapshot; True jika policy baru sudah dimuat"""
+        if self._snapshot is None or not self._snapshot.maybe_reload():
+            return False
+        self.policy_version = self._snapshot.version
+        self.cache.clear()
+        return True
+
+    def load_policy(self, path):
+        """Memuat policy dari file JSON dan menjadikannya policy aktif"""
+        self.set_policy(load_policy(path))
+        return self.policy
+
+    def check_inventory(self, inventory, top_gaps=5):
+        """
+        Cek segmen policy aktif (hasil generate_subnet / plan_segments, atau
+        snapshot policy) terhadap inventaris CIDR yang sudah ada (lihat
+        soho_core.inventory).
+        - inventory: path file inventaris atau list Prefix
+        - top_gaps: jumlah gap terbesar yang dilaporkan
+        Mengembalikan InventoryReport.
+        """
+        from soho_core.inventory import check_inventory, load_inventory
+
+        if self.policy is None:
+            raise RuntimeError("Subnet belum dibuat!")
+        if self._snapshot is not None:
+            self.reload_snapshot()
+        segments = self.policy.segments  # Policy atau PolicySnapshot
+        if isinstance(inventory, str):
+            inventory = load_inventory(inventory)
+        return check_inventory(inventory, [(segment.name, segment.network) for segment in segments],
+                               top_gaps)
+
+    # ---------- Evaluasi ----------
+    def evaluate(self, source, destination, log=True):
+        """
+        Evaluasi satu traffic dengan policy aktif.
+        - source, destination: string atau objek ip_address
+        - log: tulis keputusan ke file log
+        Mengembalikan Decision; ValueError jika IP tidak valid.
+
+        Keputusan disimpan di cache LRU dengan kunci pasangan alamat packed.
+        """
+        if self.policy is None:
+            raise RuntimeError("Subnet belum dibuat!")
+        if self._snapshot is not None:
+            self.reload_snapshot()
+        started = metrics.start()
+        src = pack_address(source)
+        dst = pack_address(destination)
+        key = (src, dst)  # Tuple, bukan src + dst: panjang IPv4/IPv6 berbeda
+        decision = self.cache.get(key)
+        if decision is None:
+            decision = self._decide(src, dst)
+            self.cache.put(key, decision)
+        if started is not None:
+            metrics.observe("soho_decision_seconds", started)
+            metrics.inc("soho_decisions_total", f'action="{decision.action}"')
+        if log:
+            self.write_log(unpack_address(src), unpack_address(dst), decision.action)
+        return decision
+
+    def _decide(self, src, dst):
+        """Evaluasi policy langsung dari alamat packed (tanpa objek ipaddress)"""
+        policy = self.policy
+        src_segment = policy.segment_of_int(int.from_bytes(src, "big"), 4 if len(src) == 4 else 6)
+        dst_segment = policy.segment_of_int(int.from_bytes(dst, "big"), 4 if len(dst) == 4 else 6)
+        return Decision(policy.decide_segments(src_segment, dst_segment), src_segment, dst_segment)
+
+    def evaluate_many(self, pairs, log=False):
+        """
+        Evaluasi banyak pasangan (source, destination) sekaligus, misalnya
+        untuk replay log atau file flow. Pasangan yang tidak valid dilewati.
+        Mengembalikan dict jumlah per aksi ditambah 'invalid'.
+        """
+        counts = {"invalid": 0}
+        for source, destination in pairs:
+            try:
+                action = self.evaluate(source, destination, log=log).action
+            except ValueError:
+                counts["invalid"] += 1
+                continue
+            counts[action] = counts.get(action, 0) + 1
+        return counts
+
+    # ---------- Logging ----------
+    @property
+    def sink(self):
+        """
+        LogSink untuk log_file (indeks waktu <log>.tidx ikut diperbarui),
+        atau BinaryLogWriter jika binary_log diisi
+        """
+        if self._sink is None:
+            if self.binary_log:
+                from soho_core.binlog import BinaryLogWriter
+                self._sink = BinaryLogWriter(self.binary_log)
+                return self._sink
+            from soho_core.logsink import LogSink
+            from soho_core.timeindex import TimeIndex
+            self._sink = LogSink(self.log_file, time_index=TimeIndex(self.log_file))
+        return self._sink
+
+    def write_log(self, source, destination, status, timeout=None):
+        """
+        Catat satu keputusan ke log (format baris logs.txt).
+        Jika antrian log penuh, menunggu maksimal timeout detik (lalu queue.Full).
+        """
+        started = metrics.start()
+        self.sink.write(source, destination, status, timeout=timeout)
+        metrics.observe("soho_log_write_seconds", started)
+
+    def flush(self):
+        """Pastikan semua log sudah tertulis ke disk"""
+        if self._sink is not None:
+            self._sink.flush()
+
+    def close(self):
+        """Tutup log sink; error penulisan log yang tertunda dilempar di sini"""
+        sink, self._sink = self._sink, None
+        if sink is not None:
+            sink.close()
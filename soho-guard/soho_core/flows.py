@@ -0,0 +1,189 @@
+# ==================================================
+# BATCH TRAFFIC EVALUATION (Evaluasi File Flow Sekaligus)
+# ==================================================
+"""
+Menjalankan aturan firewall Guest -> Internal terhadap file flow (CSV src,dst).
+
+Alamat diubah menjadi integer lalu dievaluasi per potongan (chunk) dengan
+perbandingan rentang, bukan dengan objek ipaddress per baris. Jika NumPy
+tersedia, perbandingan IPv4 dilakukan secara vektor; jika tidak (atau untuk
+IPv6 yang tidak muat di uint32), dipakai loop integer biasa dengan hasil yang sama.
+"""
+import os
+import socket
+import struct
+import time
+
+CHUNK_ROWS = 100_000  # Jumlah baris yang diproses per potongan
+
+_unpack_u32 = struct.Struct("!I").unpack
+_unpack_u64x2 = struct.Struct("!QQ").unpack
+_numpy = False  # Belum dicoba import; None = NumPy tidak tersedia
+
+
+def _get_numpy():
+    """Import NumPy saat pertama kali dibutuhkan (opsional)"""
+    global _numpy
+    if _numpy is False:
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        _numpy = numpy
+    return _numpy
+
+
+def ipv4_to_int(text):
+    """Konversi string IPv4 menjadi integer (ValueError jika tidak valid)"""
+    try:
+        return _unpack_u32(socket.inet_pton(socket.AF_INET, text))[0]
+    except OSError:
+        raise ValueError(f"IP tidak valid: {text!r}") from None
+
+
+def ip_to_int(text):
+    """
+    Konversi string IPv4/IPv6 menjadi (versi, integer).
+    ValueError jika tidak valid.
+    """
+    if ":" not in text:
+        return 4, ipv4_to_int(text)
+    try:
+        high, low = _unpack_u64x2(socket.inet_pton(socket.AF_INET6, text))
+    except OSError:
+        raise ValueError(f"IP tidak valid: {text!r}") from None
+    return 6, (high << 64) | low
+
+
+def subnet_bounds(subnet):
+    """Mengembalikan (awal, akhir) subnet sebagai integer inklusif"""
+    return int(subnet.network_address), int(subnet.broadcast_address)
+
+
+def is_header(line):
+    """
+    True jika baris adalah header CSV (contoh 'src,dst'): kolom pertama
+    bukan alamat IP. Alamat IPv6 seperti 'fd00::1' tidak dianggap header.
+    """
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return False
+    try:
+        ip_to_int(line.split(",", 1)[0].strip())
+    except ValueError:
+        return True
+    return False
+
+
+def parse_flow_lines(lines, version=4):
+    """
+    Parsing baris CSV 'src,dst' menjadi dua list integer untuk versi IP
+    `version` (4 atau 6).
+    Baris kosong dan komentar (#) dilewati; baris yang tidak valid dihitung
+    sebagai invalid; baris valid dengan versi IP lain (atau campuran)
+    dihitung sebagai other.
+    Mengembalikan (src_list, dst_list, invalid, other).
+    """
+    srcs, dsts = [], []
+    invalid = other = 0
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        parts = line.split(",")
+        try:
+            src_version, src = ip_to_int(parts[0].strip())
+            dst_version, dst = ip_to_int(parts[1].strip())
+        except (ValueError, IndexError):
+            invalid += 1
+            continue
+        if src_version != version or dst_version != version:
+            other += 1
+            continue
+        srcs.append(src)
+        dsts.append(dst)
+    return srcs, dsts, invalid, other
+
+
+def count_blocked(srcs, dsts, guest_bounds, internal_bounds):
+    """
+    Menghitung jumlah flow yang diblokir (source di Guest DAN destination di Internal).
+    - srcs, dsts: list integer alamat
+    - guest_bounds, internal_bounds: (awal, akhir) dari subnet_bounds()
+    """
+    g_lo, g_hi = guest_bounds
+    i_lo, i_hi = internal_bounds
+
+    np = _get_numpy() if max(g_hi, i_hi) <= 0xFFFFFFFF else None
+    if np is not None:
+        src = np.fromiter(srcs, dtype=np.uint32, count=len(srcs))
+        dst = np.fromiter(dsts, dtype=np.uint32, count=len(dsts))
+        mask = (src >= g_lo) & (src <= g_hi) & (dst >= i_lo) & (dst <= i_hi)
+        return int(np.count_nonzero(mask))
+
+    blocked = 0
+    for src, dst in zip(srcs, dsts):
+        if g_lo <= src <= g_hi and i_lo <= dst <= i_hi:
+            blocked += 1
+    return blocked
+
+
+def _read_chunks(file, chunk_rows):
+    chunk = []
+    for line in file:
+        chunk.append(line)
+        if len(chunk) >= chunk_rows:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def evaluate_flow_file(path, internal_subnet, guest_subnet, chunk_rows=CHUNK_ROWS,
+                       progress=None):
+    """
+    Evaluasi seluruh file flow CSV terhadap aturan Guest -> Internal.
+
+    Baris pertama boleh berupa header (contoh: 'src,dst'). Flow dengan versi
+    IP yang berbeda dari subnet tidak mungkin Guest -> Internal, jadi
+    dihitung ALLOWED.
+    progress: callback opsional fungsi(fraksi 0.0-1.0) yang dipanggil setiap
+    potongan selesai; exception dari callback menghentikan evaluasi.
+    Mengembalikan dict berisi total, allowed, blocked, invalid, elapsed
+    (detik) dan rows_per_sec.
+    """
+    version = guest_subnet.version
+    guest_bounds = subnet_bounds(guest_subnet)
+    internal_bounds = subnet_bounds(internal_subnet)
+
+    total = blocked = invalid = 0
+    size = os.path.getsize(path) or 1
+    consumed = 0
+    start = time.perf_counter()
+
+    with open(path, "r") as file:
+        first_chunk = True
+        for chunk in _read_chunks(file, chunk_rows):
+            if progress is not None:
+                consumed += sum(map(len, chunk))  # Perkiraan byte (log berisi ASCII)
+            if first_chunk:
+                first_chunk = False
+                # Lewati header jika kolom pertama bukan alamat IP
+                if chunk and is_header(chunk[0]):
+                    chunk = chunk[1:]
+            srcs, dsts, bad, other = parse_flow_lines(chunk, version)
+            invalid += bad
+            total += len(srcs) + other
+            blocked += count_blocked(srcs, dsts, guest_bounds, internal_bounds)
+            if progress is not None:
+                progress(min(1.0, consumed / size))
+
+    elapsed = time.perf_counter() - start
+    return {
+        "total": total,
+        "allowed": total - blocked,
+        "blocked": blocked,
+        "invalid": invalid,
+        "elapsed": elapsed,
+        "rows_per_sec": total / elapsed if elapsed > 0 else 0.0,
+    }
@@ -0,0 +1,318 @@
+# ==================================================
+# FLOW INGESTION DAEMON (Event Flow Live via UDP/TCP)
+# ==================================================
+"""
+Layanan asyncio yang menerima event flow dari router/sensor lokal lalu
+mengevaluasinya dengan GuardEngine (aturan yang sama seperti simulate_traffic).
+
+Format event (satu event per baris, beberapa baris boleh dalam satu paket):
+    192.168.1.130,192.168.1.4                          (CSV src,dst)
+    192.168.1.130 192.168.1.4                          (dipisah spasi)
+    <134>Jan 14 08:32:15 gw kernel: IN=br0 SRC=192.168.1.130 DST=192.168.1.4 ...
+                                                       (gaya syslog/iptables)
+
+Keputusan ditulis ke log lewat LogSink tanpa memblokir event loop:
+- TCP: jika antrian log penuh, pembacaan koneksi itu ditunda (backpressure
+  diteruskan ke pengirim lewat TCP)
+- UDP: tidak punya flow control, jadi log yang tidak muat dihitung sebagai dropped
+"""
+import asyncio
+import queue
+import re
+import time
+
+from soho_core.policy import BLOCKED
+
+_TOTAL_FIELDS = ("events", "allowed", "blocked", "invalid", "dropped")
+_SYSLOG_FIELDS = re.compile(r"\bSRC=(\S+).*?\bDST=(\S+)")
+READ_SIZE = 64 * 1024        # Byte per pembacaan TCP
+MAX_LINE = 4096              # Baris lebih panjang dari ini dianggap invalid
+BACKPRESSURE_SLEEP = 0.005   # Jeda saat antrian log penuh (detik)
+UDP_IDLE_TIMEOUT = 60.0      # Pengirim UDP tanpa datagram selama ini (detik) dianggap selesai
+
+
+def parse_event(line):
+    """
+    Ambil (source, destination) dari satu baris event.
+    Mengembalikan None jika baris kosong atau format tidak dikenali
+    (validasi alamat dilakukan oleh GuardEngine.evaluate).
+    """
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return None
+    if "SRC=" in line:
+        match = _SYSLOG_FIELDS.search(line)
+        return match.groups() if match else None
+    parts = line.replace(",", " ").split()
+    if len(parts) < 2:
+        return None
+    return parts[0], parts[1]
+
+
+class ConnectionStats:
+    """Statistik per koneksi TCP atau per pengirim UDP"""
+
+    def __init__(self, protocol, peer):
+        self.protocol = protocol
+        self.peer = peer
+        self.started = time.monotonic()
+        self.last_seen = self.started
+        self.events = 0
+        self.allowed = 0
+        self.blocked = 0
+        self.invalid = 0
+        self.dropped = 0     # Log yang dibuang karena antrian penuh (UDP)
+        self.stalls = 0      # Berapa kali pembacaan ditunda karena backpressure (TCP)
+        self.bytes = 0
+        self.closed = False
+
+    @property
+    def rate(self):
+        """Event per detik sejak koneksi dimulai"""
+        elapsed = self.last_seen - self.started
+        return self.events / elapsed if elapsed > 0 else 0.0
+
+    def describe(self):
+        state = "closed" if self.closed else "open"
+        return (f"{self.protocol} {self.peer[0]}:{self.peer[1]} [{state}] "
+                f"{self.events:,} event ({self.rate:,.0f}/s) "
+                f"allowed={self.allowed:,} blocked={self.blocked:,} invalid={self.invalid:,} "
+                f"dropped={self.dropped:,} stalls={self.stalls:,}")
+
+
+class FlowIngestService:
+    """
+    Menerima event flow lewat UDP dan/atau TCP lokal.
+    - engine: GuardEngine dengan policy aktif
+    - log: tulis setiap keputusan ke log engine
+    - udp_idle_timeout: pengirim UDP yang diam selama ini (detik) ditutup
+      oleh prune(), karena UDP tidak punya penanda akhir koneksi
+    """
+
+    def __init__(self, engine, host="127.0.0.1", udp_port=None, tcp_port=None, log=True,
+                 udp_idle_timeout=UDP_IDLE_TIMEOUT):
+        if udp_port is None and tcp_port is None:
+            raise ValueError("Tentukan port UDP dan/atau TCP")
+        self.engine = engine
+        self.host = host
+        self.udp_port = udp_port
+        self.tcp_port = tcp_port
+        self.log = log
+        self.udp_idle_timeout = udp_idle_timeout
+        self.connections = []
+        self._retired = dict.fromkeys(_TOTAL_FIELDS, 0)  # Jumlah dari koneksi yang sudah ditutup
+        self._udp_peers = {}
+        self._tcp_server = None
+        self._udp_transport = None
+
+    # ---------- Evaluasi ----------
+    def _handle_line(self, line, stats, blocking):
+        """
+        Evaluasi satu baris event. Mengembalikan keputusan yang belum sempat
+        masuk ke antrian log (source, destination, action), atau None.
+        """
+        stats.events += 1
+        event = parse_event(line)
+        if event is None:
+            stats.invalid += 1
+            return None
+        try:
+            decision = self.engine.evaluate(event[0], event[1], log=False)
+        except ValueError:
+            stats.invalid += 1
+            return None
+        if decision.action == BLOCKED:
+            stats.blocked += 1
+        else:
+            stats.allowed += 1
+        if not self.log:
+            return None
+        pending = (event[0], event[1], decision.action)
+        try:
+            self.engine.write_log(*pending, timeout=0)
+        except queue.Full:
+            if blocking:
+                return pending
+            stats.dropped += 1
+        return None
+
+    async def _write_pending(self, pending, stats):
+        """Tunggu sampai antrian log punya ruang (tanpa memblokir event loop)"""
+        stats.stalls += 1
+        while True:
+            await asyncio.sleep(BACKPRESSURE_SLEEP)
+            try:
+                self.engine.write_log(*pending, timeout=0)
+                return
+            except queue.Full:
+                continue
+
+    # ---------- TCP ----------
+    async def _handle_tcp(self, reader, writer):
+        stats = ConnectionStats("tcp", writer.get_extra_info("peername")[:2])
+        self.connections.append(stats)
+        leftover = b""
+        try:
+            while True:
+                data = await reader.read(READ_SIZE)
+                if not data:
+                    break
+                stats.bytes += len(data)
+                stats.last_seen = time.monotonic()
+                lines = (leftover + data).split(b"\n")
+                leftover = lines.pop()
+                if len(leftover) > MAX_LINE:
+                    stats.invalid += 1
+                    leftover = b""
+                for line in lines:
+                    if not line.strip():
+                        continue  # Baris kosong bukan event (sama seperti UDP)
+                    pending = self._handle_line(line.decode("ascii", "replace"), stats, True)
+                    if pending is not None:
+                        # Berhenti membaca socket sampai log sempat ditulis
+                        await self._write_pending(pending, stats)
+            if leftover.strip():
+                pending = self._handle_line(leftover.decode("ascii", "replace"), stats, True)
+                if pending is not None:
+                    await self._write_pending(pending, stats)
+        except ConnectionError:
+            pass
+        finally:
+            stats.closed = True
+            writer.close()
+
+    # ---------- UDP ----------
+    def _handle_datagram(self, data, addr):
+        stats = self._udp_peers.get(addr)
+        if stats is None:
+            stats = self._udp_peers[addr] = ConnectionStats("udp", addr[:2])
+            self.connections.append(stats)
+        stats.bytes += len(data)
+        stats.last_seen = time.monotonic()
+        for line in data.decode("ascii", "replace").split("\n"):
+            if line.strip():
+                self._handle_line(line, stats, False)
+
+    # ---------- Lifecycle ----------
+    async def start(self):
+        """Buka socket UDP/TCP. Port 0 = pilih port bebas (lihat self.*_port)"""
+        loop = asyncio.get_running_loop()
+        if self.tcp_port is not None:
+            self._tcp_server = await asyncio.start_server(self._handle_tcp, self.host, self.tcp_port)
+            self.tcp_port = self._tcp_server.sockets[0].getsockname()[1]
+        if self.udp_port is not None:
+            service = self
+
+            class _Protocol(asyncio.DatagramProtocol):
+                def datagram_received(self, data, addr):
+                    service._handle_datagram(data, addr)
+
+            self._udp_transport, _ = await loop.create_datagram_endpoint(
+                _Protocol, local_addr=(self.host, self.udp_port))
+            self.udp_port = self._udp_transport.get_extra_info("sockname")[1]
+
+    async def close(self):
+        if self._tcp_server is not None:
+            self._tcp_server.close()
+            await self._tcp_server.wait_closed()
+            self._tcp_server = None
+        if self._udp_transport is not None:
+            self._udp_transport.close()
+            self._udp_transport = None
+
+    def prune(self, now=None):
+        """
+        Tutup pengirim UDP yang sudah diam lebih dari udp_idle_timeout, lalu
+        pindahkan statistik koneksi yang sudah ditutup ke total.
+        """
+        now = time.monotonic() if now is None else now
+        for addr, stats in list(self._udp_peers.items()):
+            if now - stats.last_seen > self.udp_idle_timeout:
+                stats.closed = True
+                del self._udp_peers[addr]
+        for stats in self.connections:
+            if stats.closed:
+                for field in _TOTAL_FIELDS:
+                    self._retired[field] += getattr(stats, field)
+        self.connections = [stats for stats in self.connections if not stats.closed]
+
+    def totals(self):
+        """Jumlah seluruh koneksi: dict events, allowed, blocked, invalid, dropped"""
+        return {field: self._retired[field] + sum(getattr(stats, field) for stats in self.connections)
+                for field in _TOTAL_FIELDS}
+
+
+async def run_service(service, stats_interval=5.0, report=print):
+    """Jalankan service sampai dibatalkan, cetak statistik setiap stats_interval detik"""
+    await service.start()
+    report(f"Mendengarkan di {service.host} (TCP: {service.tcp_port or '-'}, UDP: {service.udp_port or '-'})")
+    try:
+        while True:
+            await asyncio.sleep(stats_interval)
+            for stats in service.connections:
+                report("  " + stats.describe())
+            service.prune()
+    finally:
+        await service.close()
+
+
+# ==================================================
+# TEST SENDER (Pengganti Router untuk Uji Lokal)
+# ==================================================
+def make_test_events(internal_subnet, guest_subnet, count, seed=0):
+    """Membuat `count` baris event acak antara subnet Guest dan Internal"""
+    import random
+
+    rng = random.Random(seed)
+    subnets = [internal_subnet, guest_subnet]
+    for index in range(count):
+        src_net = rng.choice(subnets)
+        dst_net = rng.choice(subnets)
+        src = src_net.network_address + rng.randrange(src_net.num_addresses)
+        dst = dst_net.network_address + rng.randrange(dst_net.num_addresses)
+        if index % 2:
+            yield f"{src},{dst}\n"
+        else:
+            yield f"<134>gw kernel: IN=br0 OUT=br0 SRC={src} DST={dst} PROTO=TCP\n"
+
+
+async def send_events(lines, host, port, protocol="tcp", batch=64):
+    """
+    Kirim baris event ke daemon. UDP mengirim `batch` baris per datagram.
+    Mengembalikan (jumlah event, detik).
+    """
+    start = time.perf_counter()
+    sent = 0
+    if protocol == "tcp":
+        _, writer = await asyncio.open_connection(host, port)
+        chunk = []
+        for line in lines:
+            chunk.append(line)
+            if len(chunk) >= batch:
+                writer.write("".join(chunk).encode("ascii"))
+                sent += len(chunk)
+                chunk = []
+                await writer.drain()
+        if chunk:
+            writer.write("".join(chunk).encode("ascii"))
+            sent += len(chunk)
+        await writer.drain()
+        writer.close()
+        await writer.wait_closed()
+    else:
+        loop = asyncio.get_running_loop()
+        transport, _ = await loop.create_datagram_endpoint(
+            asyncio.DatagramProtocol, remote_addr=(host, port))
+        chunk = []
+        for line in lines:
+            chunk.append(line)
+            if len(chunk) >= batch:
+                transport.sendto("".join(chunk).encode("ascii"))
+                sent += len(chunk)
+                chunk = []
+                await asyncio.sleep(0)  # Beri kesempatan event loop lain berjalan
+        if chunk:
+            transport.sendto("".join(chunk).encode("ascii"))
+            sent += len(chunk)
+        transport.close()
+    return sent, time.perf_counter() - start
@@ -0,0 +1,218 @@
+# ==================================================
+# INVENTORY VALIDATOR (Cek Overlap, Containment & Gap)
+# ==================================================
+"""
+Validasi hasil subnetting terhadap inventaris alokasi yang sudah ada.
+
+File inventaris berisi satu CIDR per baris, opsional dengan nama:
+    10.0.0.0/16 kantor-pusat
+    10.1.0.0/24,site-bandung
+    # komentar diabaikan
+
+Semua prefix (inventaris + segmen baru) diubah menjadi rentang integer,
+diurutkan sekali, lalu disapu (sweep) dengan stack rentang yang masih
+terbuka; rentang yang sama persis digabung menjadi satu entri stack.
+Total O(n log n), bukan perbandingan berpasangan O(n^2).
+"""
+import heapq
+import ipaddress
+import time
+from collections import namedtuple
+
+from soho_core.flows import ip_to_int
+
+Prefix = namedtuple("Prefix", ["name", "version", "start", "end"])
+Conflict = namedtuple("Conflict", ["kind", "segment", "existing"])
+Gap = namedtuple("Gap", ["version", "start", "end"])
+InventoryReport = namedtuple("InventoryReport", [
+    "prefixes",           # Jumlah prefix inventaris
+    "conflicts",          # List Conflict antara segmen baru dan inventaris
+    "inventory_overlaps", # Jumlah prefix inventaris yang duplikat atau berada di dalam prefix inventaris lain
+    "overlap_samples",    # Contoh pasangan (prefix luar/asli, prefix dalam/duplikat)
+    "gap_count",          # Jumlah rentang alamat kosong di antara alokasi
+    "largest_gaps",       # Gap terbesar (list Gap)
+    "segment_gaps",       # nama segmen -> (gap sebelum, gap sesudah) dalam jumlah alamat
+    "elapsed",            # Detik
+])
+
+# Jenis konflik segmen baru terhadap prefix inventaris
+EQUAL = "equal"        # Sama persis
+INSIDE = "inside"      # Segmen baru berada di dalam prefix yang ada
+CONTAINS = "contains"  # Segmen baru mencakup prefix yang ada
+
+_MAX_BITS = {4: 32, 6: 128}
+SAMPLE_LIMIT = 10
+
+
+def parse_prefix(text, name=None):
+    """
+    CIDR (string) menjadi Prefix. Host bit diizinkan (seperti strict=False).
+    ValueError jika tidak valid.
+    """
+    address, _, length = text.strip().partition("/")
+    version, value = ip_to_int(address)
+    bits = _MAX_BITS[version]
+    prefixlen = int(length) if length else bits
+    if not 0 <= prefixlen <= bits:
+        raise ValueError(f"Prefix tidak valid: {text!r}")
+    size = 1 << (bits - prefixlen)
+    start = value & ~(size - 1)
+    return Prefix(name or text.strip(), version, start, start + size - 1)
+
+
+def prefix_of_network(name, network):
+    """Objek ip_network (atau string CIDR) menjadi Prefix"""
+    network = ipaddress.ip_network(network, strict=False)
+    return Prefix(name, network.version, int(network.network_address), int(network.broadcast_address))
+
+
+def load_inventory(path):
+    """
+    Membaca file inventaris. Mengembalikan list Prefix.
+    ValueError (dengan nomor baris) jika ada CIDR yang tidak valid.
+    """
+    prefixes = []
+    with open(path, "r", encoding="utf-8", errors="replace") as file:
+        for number, line in enumerate(file, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            cidr, _, name = line.replace(",", " ", 1).partition(" ")
+            try:
+                prefixes.append(parse_prefix(cidr, name.strip() or None))
+            except ValueError:
+                raise ValueError(f"Baris {number}: CIDR tidak valid: {cidr!r}") from None
+    return prefixes
+
+
+def format_prefix(prefix):
+    """Prefix menjadi teks 'nama (CIDR)'"""
+    return f"{prefix.name} ({format_range(prefix.version, prefix.start, prefix.end)})"
+
+
+def format_range(version, start, end):
+    """Rentang integer menjadi CIDR jika pas satu blok, atau 'awal - akhir'"""
+    make = ipaddress.IPv4Address if version == 4 else ipaddress.IPv6Address
+    size = end - start + 1
+    if size & (size - 1) == 0 and start % size == 0:
+        prefixlen = _MAX_BITS[version] - size.bit_length() + 1
+        return f"{make(start)}/{prefixlen}"
+    return f"{make(start)} - {make(end)}"
+
+
+def check_inventory(inventory, segments, top_gaps=5):
+    """
+    Cek segmen baru terhadap inventaris.
+    - inventory: list Prefix (lihat load_inventory)
+    - segments: list (nama, network) hasil generate_subnet / plan_segments
+    Mengembalikan InventoryReport.
+    """
+    started = time.perf_counter()
+    new = [prefix_of_network(name, network) for name, network in segments]
+
+    # (versi, awal, -akhir, flag) -> prefix yang lebih besar diproses lebih
+    # dulu, dan rentang yang sama persis berurutan (inventaris dulu)
+    items = [(p.version, p.start, -p.end, 0, p) for p in inventory]
+    items += [(p.version, p.start, -p.end, 1, p) for p in new]
+    items.sort(key=lambda item: item[:4])
+
+    conflicts = []
+    overlaps = 0
+    samples = []
+    gaps = []
+    segment_gaps = {p.name: [None, None] for p in new}
+    waiting = []         # Segmen baru yang menunggu gap sesudahnya
+    stack = []           # Rantai rentang terbuka: [awal, akhir, prefix inventaris, segmen baru]
+    version = None
+    covered = -1         # Alamat terakhir yang sudah tercakup
+
+    for item_version, start, _, is_new, prefix in items:
+        end = prefix.end
+        if item_version != version:
+            version, covered, stack, waiting = item_version, -1, [], []
+        while stack and stack[-1][1] < start:
+            stack.pop()
+
+        # Rentang yang sama persis digabung ke entri stack yang sudah ada, jadi
+        # stack selalu rantai bersarang (maksimal satu entri per panjang prefix)
+        same = stack[-1] if stack and stack[-1][0] == start and stack[-1][1] == end else None
+        enclosing = stack[:-1] if same is not None else stack
+
+        # Gap sebelum rentang ini (hanya jika tidak berada di dalam rentang lain)
+        if start > covered + 1 and covered >= 0:
+            gaps.append(Gap(version, covered + 1, start - 1))
+        gap_before = start - covered - 1 if covered >= 0 else None
+        if start > covered:
+            for name in waiting:
+                segment_gaps[name][1] = start - covered - 1
+            waiting = []
+
+        # CIDR tidak bisa tumpang tindih sebagian: semua rentang di stack
+        # mencakup rentang ini, jadi konflik cukup dicek terhadap stack
+        outer = None
+        for _, _, open_existing, open_segments in enclosing:
+            if open_existing:
+                outer = open_existing[0]
+                if is_new:
+                    conflicts.extend(Conflict(INSIDE, prefix, existing) for existing in open_existing)
+            if open_segments and not is_new:
+                conflicts.extend(Conflict(CONTAINS, segment, prefix) for segment in open_segments)
+
+        if is_new:
+            if same is not None:
+                conflicts.extend(Conflict(EQUAL, prefix, existing) for existing in same[2])
+            segment_gaps[prefix.name][0] = gap_before if start > covered else 0
+        else:
+            # Prefix inventaris duplikat atau di dalam prefix inventaris lain
+            container = same[2][0] if same is not None and same[2] else outer
+            if container is not None:
+                overlaps += 1
+                if len(samples) < SAMPLE_LIMIT:
+                    samples.append((container, prefix))
+
+        if same is None:
+            same = [start, end, [], []]
+            stack.append(same)
+        same[3 if is_new else 2].append(prefix)
+        if end > covered:
+            covered = end
+            if is_new:
+                waiting.append(prefix.name)
+        elif is_new:
+            segment_gaps[prefix.name][1] = 0  # Berada di dalam rentang lain
+
+    return InventoryReport(
+        prefixes=len(inventory),
+        conflicts=conflicts,
+        inventory_overlaps=overlaps,
+        overlap_samples=samples,
+        gap_count=len(gaps),
+        largest_gaps=heapq.nlargest(top_gaps, gaps, key=lambda gap: gap.end - gap.start),
+        segment_gaps={name: tuple(values) for name, values in segment_gaps.items()},
+        elapsed=time.perf_counter() - started,
+    )
+
+
+def format_report(report):
+    """InventoryReport menjadi list baris teks (untuk CLI)"""
+    lines = [f"Prefix inventaris : {report.prefixes:,} ({report.elapsed * 1000:.0f} ms)"]
+    if report.conflicts:
+        lines.append(f"KONFLIK ({len(report.conflicts)}):")
+        for conflict in report.conflicts:
+            lines.append(f"  {conflict.kind:<8} {format_prefix(conflict.segment)} <-> "
+                         f"{format_prefix(conflict.existing)}")
+    else:
+        lines.append("Tidak ada konflik dengan inventaris")
+    for name, (before, after) in report.segment_gaps.items():
+        before = "-" if before is None else f"{before:,}"
+        after = "-" if after is None else f"{after:,}"
+        lines.append(f"  {name:<12} gap sebelum: {before} alamat, sesudah: {after} alamat")
+    lines.append(f"Tumpang tindih di inventaris : {report.inventory_overlaps:,}")
+    for outer, inner in report.overlap_samples:
+        relation = "duplikat dari" if (inner.start, inner.end) == (outer.start, outer.end) else "di dalam"
+        lines.append(f"  {format_prefix(inner)} {relation} {format_prefix(outer)}")
+    lines.append(f"Gap (alamat belum dialokasikan) : {report.gap_count:,}")
+    for gap in report.largest_gaps:
+        lines.append(f"  {format_range(gap.version, gap.start, gap.end):<40} "
+                     f"{gap.end - gap.start + 1:,} alamat")
+    return lines
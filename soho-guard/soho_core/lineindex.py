@@ -0,0 +1,133 @@
+# ==================================================
+# SPARSE LINE INDEX (Akses Baris Log per Offset Byte)
+# ==================================================
+"""
+Indeks baris yang jarang (sparse) untuk file log.
+
+Hanya offset byte setiap `stride` baris yang disimpan, jadi memori yang
+dipakai sekitar 8 byte per `stride` baris. Baris ke-n dibaca dengan seek ke
+checkpoint terdekat lalu membaca maju paling banyak `stride` baris.
+
+Indeks bisa difilter (status, source, destination): hanya baris yang cocok
+yang dihitung, sehingga tampilan log yang difilter juga bisa di-scroll.
+"""
+from array import array
+
+READ_SIZE = 256 * 1024
+
+
+def make_filter(status=None, source=None, destination=None, exact=False):
+    """
+    Membuat predicate untuk baris log mentah (bytes).
+    - status: "ALLOWED" / "BLOCKED" / None (semua)
+    - source / destination: awalan alamat, contoh "192.168.1." (None = semua)
+    - exact: source/destination harus sama persis, bukan awalan
+    Mengembalikan None jika tidak ada filter.
+    """
+    needles = []
+    if source:
+        needles.append(b"SRC=" + source.strip().encode() + (b" " if exact else b""))
+    if destination:
+        needles.append(b"DST=" + destination.strip().encode() + (b" " if exact else b""))
+    suffix = f"| {status}".encode() if status else None
+    if not needles and suffix is None:
+        return None
+
+    def predicate(line):
+        if suffix is not None and not line.rstrip().endswith(suffix):
+            return False
+        return all(needle in line for needle in needles)
+
+    return predicate
+
+
+class SparseLineIndex:
+    """
+    - path: file log
+    - predicate: fungsi(baris_bytes) -> bool, atau None untuk semua baris
+    - stride: jarak antar checkpoint (dalam jumlah baris yang cocok)
+    """
+
+    def __init__(self, path, predicate=None, stride=1024):
+        self.path = path
+        self.predicate = predicate
+        self.stride = stride
+        self.count = 0              # Jumlah baris (yang cocok) yang sudah diindeks
+        self.scanned = 0            # Offset byte yang sudah dipindai
+        self._checkpoints = array("Q")  # Offset baris ke-0, ke-stride, ke-2*stride, ...
+
+    @property
+    def memory_bytes(self):
+        return self._checkpoints.itemsize * len(self._checkpoints)
+
+    def reset(self):
+        self.count = 0
+        self.scanned = 0
+        self._checkpoints = array("Q")
+
+    def refresh(self, budget_bytes=None):
+        """
+        Pindai baris baru sejak pemindaian terakhir.
+        - budget_bytes: batas byte yang dipindai per panggilan (None = sampai akhir),
+          berguna agar GUI bisa memindai file besar sedikit demi sedikit.
+        Mengembalikan True jika sudah sampai akhir file.
+        """
+        try:
+            file = open(self.path, "rb")
+        except FileNotFoundError:
+            self.reset()
+            return True
+
+        with file:
+            file.seek(0, 2)
+            size = file.tell()
+            if size < self.scanned:
+                self.reset()  # File dipotong/dirotasi
+            file.seek(self.scanned)
+            limit = size if budget_bytes is None else min(size, self.scanned + budget_bytes)
+
+            predicate = self.predicate
+            stride = self.stride
+            pending = b""
+            while self.scanned + len(pending) < limit:
+                block = file.read(min(READ_SIZE, limit - self.scanned - len(pending)))
+                if not block:
+                    break
+                block = pending + block
+                cut = block.rfind(b"\n") + 1
+                pending = block[cut:]
+                offset = self.scanned
+                for line in block[:cut].splitlines(keepends=True):
+                    if predicate is None or predicate(line):
+                        if self.count % stride == 0:
+                            self._checkpoints.append(offset)
+                        self.count += 1
+                    offset += len(line)
+                self.scanned = offset
+            # Sisa baris tanpa '\n' di akhir file dihitung setelah baris itu lengkap
+            return limit >= size
+
+    def read_lines(self, start, count):
+        """Ambil `count` baris (yang cocok) mulai dari baris ke-`start`, tanpa '\\n'"""
+        if count <= 0 or start >= self.count:
+            return []
+        start = max(0, start)
+        checkpoint = start // self.stride
+        skip = start - checkpoint * self.stride
+        result = []
+        with open(self.path, "rb") as file:
+            file.seek(self._checkpoints[checkpoint])
+            position = self._checkpoints[checkpoint]
+            for line in file:
+                if position >= self.scanned:
+                    break  # Baris setelah batas indeks belum dihitung
+                position += len(line)
+                if self.predicate is not None and not self.predicate(line):
+                    continue
+                if skip:
+                    skip -= 1
+                    continue
+                result.append(line.rstrip(b"\r\n").decode("utf-8", errors="replace"))
+                if len(result) >= count:
+                    break
+        return result
@@ -0,0 +1,66 @@
+# ==================================================
+# LOG READER (Membaca Log dari Belakang)
+# ==================================================
+"""
+Pembaca log yang membaca file dari akhir per potongan (chunk).
+
+Hanya bagian ekor file yang dibaca, sehingga waktu dan memori bergantung
+pada jumlah baris yang diminta, bukan pada ukuran logs.txt.
+"""
+import os
+from collections import namedtuple
+
+CHUNK_SIZE = 8192
+
+# Satu baris log yang sudah di-parse (timestamp tetap berupa string)
+LogRecord = namedtuple("LogRecord", ["timestamp", "source", "destination", "status"])
+
+
+def parse_log_line(line):
+    """
+    Parsing satu baris log teks:
+    '2026-01-14 08:32:15 | SRC=1.2.3.4 -> DST=5.6.7.8 | BLOCKED'
+    Mengembalikan LogRecord, atau None jika format baris tidak dikenali.
+    """
+    parts = line.rstrip("\n").split(" | ")
+    if len(parts) != 3:
+        return None
+    addresses = parts[1].split(" -> ")
+    if len(addresses) != 2 or not addresses[0].startswith("SRC=") or not addresses[1].startswith("DST="):
+        return None
+    return LogRecord(parts[0], addresses[0][4:], addresses[1][4:], parts[2].strip())
+
+
+def tail_lines(path, count, chunk_size=CHUNK_SIZE, encoding="utf-8"):
+    """
+    Mengembalikan maksimal `count` baris terakhir dari file (tanpa '\\n').
+    File yang belum ada dianggap kosong.
+    """
+    if count <= 0:
+        return []
+
+    try:
+        file = open(path, "rb")
+    except FileNotFoundError:
+        return []
+
+    with file:
+        file.seek(0, os.SEEK_END)
+        position = file.tell()
+        chunks = []
+        newlines = 0
+
+        # Baris terakhir biasanya diakhiri '\n', jadi butuh count+1 pemisah
+        while position > 0 and newlines <= count:
+            read_size = min(chunk_size, position)
+            position -= read_size
+            file.seek(position)
+            chunk = file.read(read_size)
+            chunks.append(chunk)
+            newlines += chunk.count(b"\n")
+
+    data = b"".join(reversed(chunks))
+    lines = data.split(b"\n")
+    if lines and lines[-1] == b"":
+        lines.pop()  # Sisa setelah '\n' terakhir
+    return [line.decode(encoding, errors="replace") for line in lines[-count:]]
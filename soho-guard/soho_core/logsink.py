@@ -0,0 +1,161 @@
+# ==================================================
+# BUFFERED LOG SINK (Penulis Log di Background Thread)
+# ==================================================
+"""
+Log sink dengan antrian di memori dan thread penulis terpisah.
+
+File log dibuka sekali, lalu baris-baris log ditulis per batch (berdasarkan
+jumlah baris atau interval waktu). Format di disk sama persis dengan
+write_log lama:
+
+    2026-01-14 08:32:15 | SRC=192.168.1.130 -> DST=192.168.1.4 | BLOCKED
+"""
+import os
+import queue
+import threading
+import time
+
+from soho_core import metrics
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def format_log_line(source, destination, status, timestamp):
+    """Format satu baris log (timestamp berupa string yang sudah diformat)"""
+    return f"{timestamp} | SRC={source} -> DST={destination} | {status}\n"
+
+
+class _Flush:
+    """Penanda di antrian: minta writer menulis semua isi buffer ke disk"""
+
+    def __init__(self):
+        self.done = threading.Event()
+
+
+_CLOSE = object()  # Penanda di antrian: writer harus berhenti
+
+
+class LogSink:
+    """
+    Penulis log berbuffer.
+    - path: file log (mode append)
+    - batch_size: jumlah baris maksimum sebelum ditulis ke disk
+    - flush_interval: jeda maksimum (detik) sebelum buffer ditulis
+    - max_queue: kapasitas antrian; jika penuh, write() menunggu (backpressure).
+      0 = tanpa batas.
+    - time_index: objek TimeIndex opsional yang diperbarui setiap batch ditulis
+      (ditutup bersama sink)
+
+    Jika penulisan ke disk gagal (misalnya disk penuh), error disimpan dan
+    dilempar ulang oleh write(), flush() atau close() berikutnya. Thread
+    writer tetap mengosongkan antrian agar pemanggil tidak menunggu selamanya.
+    """
+
+    def __init__(self, path, batch_size=512, flush_interval=0.5, max_queue=10_000,
+                 time_index=None):
+        self.path = path
+        self.time_index = time_index
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._closed = False
+        self._error = None  # Error penulisan dari thread writer
+        self._last_second = None
+        self._last_stamp = ""
+        # Mode biner: tidak ada konversi '\n' -> '\r\n' di Windows, jadi offset
+        # byte yang dicatat TimeIndex selalu sama dengan isi file
+        self._file = open(path, "ab")
+        self._thread = threading.Thread(target=self._run, name="soho-log-writer", daemon=True)
+        self._thread.start()
+
+    def _timestamp(self):
+        # strftime cukup dipanggil sekali per detik
+        now = int(time.time())
+        if now != self._last_second:
+            self._last_second = now
+            self._last_stamp = time.strftime(TIMESTAMP_FORMAT, time.localtime(now))
+        return self._last_stamp
+
+    def write(self, source, destination, status, timeout=None):
+        """
+        Masukkan satu keputusan ke antrian log.
+        Jika antrian penuh, fungsi ini menunggu (maksimal timeout detik,
+        lalu queue.Full) sampai writer sempat mengosongkan antrian.
+        """
+        if self._closed:
+            raise ValueError("LogSink sudah ditutup")
+        if self._error is not None:
+            raise self._error
+        line = format_log_line(source, destination, status, self._timestamp())
+        self._queue.put(line, timeout=timeout)
+
+    def flush(self, timeout=None):
+        """Tunggu sampai semua log di antrian sudah tertulis ke disk"""
+        if self._closed:
+            return True
+        if self._error is not None:
+            raise self._error
+        marker = _Flush()
+        self._queue.put(marker)
+        done = marker.done.wait(timeout)
+        if self._error is not None:
+            raise self._error
+        return done
+
+    def close(self):
+        """Tulis sisa log, hentikan thread writer, lalu tutup file"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_CLOSE)
+        self._thread.join()
+        try:
+            self._file.close()
+        except OSError as error:  # Sisa buffer file gagal ditulis
+            self._error = self._error or error
+        if self.time_index is not None:
+            self.time_index.close()
+        if self._error is not None:
+            raise self._error
+
+    def _write_batch(self, buffer):
+        data = "".join(buffer).encode("utf-8")
+        self._file.write(data)
+        self._file.flush()
+        if self.time_index is not None:
+            # Offset awal batch = ukuran file sekarang dikurangi batch ini
+            size = os.fstat(self._file.fileno()).st_size
+            self.time_index.append_lines(buffer, size - len(data))
+
+    def _run(self):
+        buffer = []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if isinstance(item, str):
+                buffer.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+                if len(buffer) < self.batch_size:
+                    continue
+
+            # Batch penuh, interval habis, flush, atau close -> tulis ke disk
+            if buffer and self._error is None:
+                started = metrics.start()
+                try:
+                    self._write_batch(buffer)
+                except Exception as error:  # Simpan untuk pemanggil; thread tidak boleh mati
+                    self._error = error
+                metrics.observe("soho_log_flush_seconds", started)
+            buffer.clear()  # Setelah error, log berikutnya dibuang
+            deadline = None
+
+            if isinstance(item, _Flush):
+                item.done.set()
+            elif item is _CLOSE:
+                return
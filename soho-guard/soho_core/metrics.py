@@ -0,0 +1,199 @@
+# ==================================================
+# METRICS (Counter & Histogram Latensi)
+# ==================================================
+"""
+Instrumentasi ringan untuk jalur panas SOHO Guard.
+
+Secara default metrics nonaktif: start() mengembalikan None dan observe()
+langsung kembali, jadi biaya di jalur panas hanya dua pemanggilan fungsi.
+Setelah enable(), latensi dicatat ke histogram dan bisa diekspor dalam
+format teks Prometheus (file untuk textfile collector, atau endpoint HTTP
+lokal /metrics).
+
+Contoh di kode:
+    started = metrics.start()
+    ...                                  # pekerjaan yang diukur
+    metrics.observe("soho_decision_seconds", started)
+"""
+import bisect
+import os
+import threading
+import time
+
+# Batas bucket histogram latensi (detik), dari 1 mikrodetik sampai 10 detik
+LATENCY_BUCKETS = (1e-6, 5e-6, 1e-5, 5e-5, 1e-4, 5e-4, 1e-3, 5e-3,
+                   0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0)
+
+# Deskripsi metrik yang dikenal (baris # HELP)
+HELP = {
+    "soho_decisions_total": "Jumlah keputusan firewall per aksi",
+    "soho_decision_seconds": "Latensi evaluasi satu traffic",
+    "soho_log_write_seconds": "Latensi write_log (memasukkan baris ke antrian log)",
+    "soho_log_flush_seconds": "Latensi menulis satu batch log ke disk",
+    "soho_subnet_generation_seconds": "Latensi generate_subnet / plan_segments",
+    "soho_report_build_seconds": "Durasi membuat laporan PDF",
+}
+
+_enabled = False
+_lock = threading.Lock()
+_counters = {}     # (nama, label) -> nilai
+_histograms = {}   # nama -> Histogram
+
+
+class Histogram:
+    """Histogram kumulatif dengan batas bucket tetap"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Bucket terakhir = +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q):
+        """Perkiraan kuantil (batas atas bucket yang memuat kuantil q)"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= target:
+                return bound
+        return float("inf")
+
+
+def enable():
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def is_enabled():
+    return _enabled
+
+
+def reset():
+    """Hapus semua nilai metrik (misalnya sebelum benchmark)"""
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+
+
+def start():
+    """Waktu mulai pengukuran, atau None jika metrics nonaktif"""
+    return time.perf_counter() if _enabled else None
+
+
+def observe(name, started):
+    """Catat durasi sejak `started` (hasil start()) ke histogram `name`"""
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    with _lock:
+        histogram = _histograms.get(name)
+        if histogram is None:
+            histogram = _histograms[name] = Histogram()
+        histogram.observe(elapsed)
+
+
+def inc(name, label="", amount=1):
+    """
+    Tambah counter. label berupa teks label Prometheus yang sudah diformat,
+    contoh 'action="BLOCKED"'.
+    """
+    if not _enabled:
+        return
+    key = (name, label)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + amount
+
+
+def snapshot():
+    """
+    Ringkasan metrik saat ini untuk ditampilkan:
+    {'counters': {(nama, label): nilai},
+     'histograms': {nama: (count, rata2, p50, p95)}}
+    """
+    with _lock:
+        counters = dict(_counters)
+        histograms = {
+            name: (h.count, h.sum / h.count if h.count else 0.0, h.quantile(0.5), h.quantile(0.95))
+            for name, h in _histograms.items()
+        }
+    return {"counters": counters, "histograms": histograms}
+
+
+def _format_bound(bound):
+    return "+Inf" if bound == float("inf") else repr(bound)
+
+
+def render_prometheus():
+    """Semua metrik dalam format teks Prometheus (exposition format 0.0.4)"""
+    lines = []
+    with _lock:
+        names = sorted({name for name, _ in _counters})
+        for name in names:
+            lines.append(f"# HELP {name} {HELP.get(name, name)}")
+            lines.append(f"# TYPE {name} counter")
+            for (counter, label), value in sorted(_counters.items()):
+                if counter == name:
+                    lines.append(f"{name}{{{label}}} {value}" if label else f"{name} {value}")
+        for name in sorted(_histograms):
+            histogram = _histograms[name]
+            lines.append(f"# HELP {name} {HELP.get(name, name)}")
+            lines.append(f"# TYPE {name} histogram")
+            cumulative = 0
+            for bound, count in zip(histogram.buckets + (float("inf"),), histogram.counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{{le="{_format_bound(bound)}"}} {cumulative}')
+            lines.append(f"{name}_sum {histogram.sum!r}")
+            lines.append(f"{name}_count {histogram.count}")
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus_file(path):
+    """
+    Tulis metrik ke file (untuk textfile collector node_exporter).
+    Ditulis ke file sementara lalu diganti secara atomik.
+    """
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        file.write(render_prometheus())
+    os.replace(temp_path, path)
+
+
+def serve_http(port, host="127.0.0.1"):
+    """
+    Jalankan endpoint HTTP lokal /metrics di thread daemon.
+    Mengembalikan objek server (panggil shutdown() untuk berhenti).
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # Jangan tulis akses log ke stderr
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    thread = threading.Thread(target=server.serve_forever, name="soho-metrics-http", daemon=True)
+    thread.start()
+    return server
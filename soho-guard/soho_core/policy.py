@@ -0,0 +1,166 @@
+# ==================================================
+# POLICY ENGINE (Segmen Jaringan + Matriks Aturan)
+# ==================================================
+"""
+Policy engine deklaratif untuk banyak segmen jaringan (internal, guest, IoT,
+server, DMZ, ...).
+
+- Setiap alamat dipetakan ke segmennya lewat indeks interval yang terurut
+  (bisect), sehingga lookup tetap O(log jumlah segmen).
+- Aturan allow/deny dievaluasi berurutan (first match wins) lalu
+  dikompilasi menjadi matriks keputusan per pasangan segmen.
+"""
+import bisect
+import ipaddress
+import json
+from collections import namedtuple
+
+ALLOWED = "ALLOWED"
+BLOCKED = "BLOCKED"
+ANY = "*"  # Wildcard: cocok dengan segmen apa pun (termasuk di luar segmen)
+
+# Sinonim yang diterima di file policy
+_ACTIONS = {
+    "allow": ALLOWED, "allowed": ALLOWED,
+    "deny": BLOCKED, "block": BLOCKED, "blocked": BLOCKED,
+}
+
+Segment = namedtuple("Segment", ["name", "network"])
+Rule = namedtuple("Rule", ["src", "dst", "action"])
+Decision = namedtuple("Decision", ["action", "src_segment", "dst_segment"])
+
+
+def normalize_action(action):
+    """Ubah 'allow'/'deny'/... menjadi ALLOWED atau BLOCKED"""
+    try:
+        return _ACTIONS[str(action).strip().lower()]
+    except KeyError:
+        raise ValueError(f"Aksi tidak dikenal: {action!r}") from None
+
+
+class Policy:
+    """
+    Kumpulan segmen + aturan berurutan.
+    - segments: list Segment (tidak boleh saling tumpang tindih)
+    - rules: list Rule, dievaluasi dari atas ke bawah
+    - default_action: aksi jika tidak ada aturan yang cocok
+    """
+
+    def __init__(self, segments, rules=(), default_action=ALLOWED):
+        self.segments = [
+            Segment(seg.name, ipaddress.ip_network(seg.network, strict=False))
+            for seg in segments
+        ]
+        self.rules = [Rule(r.src, r.dst, normalize_action(r.action)) for r in rules]
+        self.default_action = normalize_action(default_action)
+
+        names = [seg.name for seg in self.segments]
+        if len(set(names)) != len(names):
+            raise ValueError("Nama segmen harus unik")
+        for rule in self.rules:
+            for name in (rule.src, rule.dst):
+                if name != ANY and name not in names:
+                    raise ValueError(f"Aturan memakai segmen yang tidak ada: {name!r}")
+
+        self._index = self._build_index()
+        self._matrix = self._compile_matrix(names)
+
+    def _build_index(self):
+        """Membangun indeks interval terurut per versi IP: (starts, ends, names)"""
+        index = {}
+        by_version = {}
+        for seg in self.segments:
+            net = seg.network
+            start = int(net.network_address)
+            end = int(net.broadcast_address)
+            by_version.setdefault(net.version, []).append((start, end, seg.name))
+
+        for version, intervals in by_version.items():
+            intervals.sort()
+            for prev, cur in zip(intervals, intervals[1:]):
+                if cur[0] <= prev[1]:
+                    raise ValueError(f"Segmen tumpang tindih: {prev[2]} dan {cur[2]}")
+            index[version] = (
+                [iv[0] for iv in intervals],
+                [iv[1] for iv in intervals],
+                [iv[2] for iv in intervals],
+            )
+        return index
+
+    def _compile_matrix(self, names):
+        """Hitung keputusan untuk setiap pasangan (src, dst); None = di luar segmen"""
+        matrix = {}
+        candidates = names + [None]
+        for src in candidates:
+            for dst in candidates:
+                matrix[(src, dst)] = self._first_match(src, dst)
+        return matrix
+
+    def _first_match(self, src, dst):
+        for rule in self.rules:
+            if rule.src in (ANY, src) and rule.dst in (ANY, dst):
+                return rule.action
+        return self.default_action
+
+    def segment_of_int(self, value, version=4):
+        """Cari nama segmen untuk alamat integer (None jika di luar semua segmen)"""
+        table = self._index.get(version)
+        if table is None:
+            return None
+        starts, ends, names = table
+        pos = bisect.bisect_right(starts, value) - 1
+        if pos >= 0 and value <= ends[pos]:
+            return names[pos]
+        return None
+
+    def segment_of(self, address):
+        """Cari nama segmen untuk alamat (string atau objek ip_address)"""
+        if not isinstance(address, (ipaddress.IPv4Address, ipaddress.IPv6Address)):
+            address = ipaddress.ip_address(address)
+        return self.segment_of_int(int(address), address.version)
+
+    def decide_segments(self, src_segment, dst_segment):
+        """Keputusan untuk pasangan segmen yang sudah diketahui"""
+        return self._matrix[(src_segment, dst_segment)]
+
+    def evaluate(self, src, dst):
+        """
+        Evaluasi satu traffic.
+        Mengembalikan Decision(action, src_segment, dst_segment).
+        """
+        src_segment = self.segment_of(src)
+        dst_segment = self.segment_of(dst)
+        return Decision(self._matrix[(src_segment, dst_segment)], src_segment, dst_segment)
+
+
+def default_policy(internal_subnet, guest_subnet):
+    """
+    Policy bawaan SOHO Guard (sama seperti aturan lama):
+    - Guest -> Internal = BLOCKED
+    - Semua traffic lainnya = ALLOWED
+    """
+    return Policy(
+        segments=[Segment("internal", internal_subnet), Segment("guest", guest_subnet)],
+        rules=[Rule("guest", "internal", BLOCKED)],
+        default_action=ALLOWED,
+    )
+
+
+def policy_from_dict(data):
+    """
+    Membuat Policy dari dict, contoh:
+    {
+        "segments": {"internal": "10.0.0.0/24", "iot": "10.0.1.0/24"},
+        "rules": [{"src": "iot", "dst": "internal", "action": "deny"}],
+        "default": "allow"
+    }
+    """
+    segments = [Segment(name, network) for name, network in data["segments"].items()]
+    rules = [Rule(r["src"], r["dst"], r["action"]) for r in data.get("rules", [])]
+    return Policy(segments, rules, data.get("default", ALLOWED))
+
+
+def load_policy(path):
+    """Membaca policy dari file JSON"""
+    with open(path, "r") as file:
+        return policy_from_dict(json.load(file))
@@ -0,0 +1,339 @@
+# ==================================================
+# PDF REPORT (Laporan Multi-Halaman untuk Seluruh Log)
+# ==================================================
+"""
+Membuat laporan audit PDF yang mencakup SELURUH riwayat traffic.
+
+Log dibaca baris per baris langsung dari disk (streaming), jadi file log
+tidak pernah dimuat ke memori sekaligus. Canvas ReportLab menyimpan semua
+halaman sampai save(), karena itu riwayat dipecah menjadi volume berisi
+maksimal VOLUME_PAGES halaman: file utama (ringkasan + volume 1), lalu
+<nama>_vol002.pdf, <nama>_vol003.pdf, ... Memori yang dipakai dibatasi oleh
+ukuran satu volume, bukan oleh panjang log.
+"""
+import glob
+import os
+import time
+
+from soho_core import metrics
+from soho_core.logread import tail_lines
+
+MARGIN = 50
+LOG_FONT = ("Courier", 8)
+LOG_LEADING = 11       # Jarak antar baris log (point)
+RECENT_LINES = 12      # Jumlah log terbaru di halaman pertama
+VOLUME_PAGES = 500     # Halaman riwayat maksimum per file PDF
+
+
+def volume_path(report_path, number):
+    """Nama file volume riwayat ke-n (n >= 2), contoh: report_vol002.pdf"""
+    stem, ext = os.path.splitext(report_path)
+    return f"{stem}_vol{number:03d}{ext}"
+
+
+def list_volumes(report_path):
+    """Daftar (nomor, path) volume riwayat yang ada di disk, terurut"""
+    stem, ext = os.path.splitext(report_path)
+    volumes = []
+    for path in glob.glob(glob.escape(stem) + "_vol*" + glob.escape(ext)):
+        number = path[len(stem) + 4:len(path) - len(ext)]
+        if number.isdigit():
+            volumes.append((int(number), path))
+    return sorted(volumes)
+
+
+def _status_of(line):
+    """Ambil status (ALLOWED/BLOCKED/...) dari baris log tanpa parsing penuh"""
+    return line.rstrip("\n").rsplit(" | ", 1)[-1].strip()
+
+
+def _wrap(line, max_chars):
+    """Pecah baris panjang menjadi beberapa baris (tidak ada yang dipotong)"""
+    line = line.rstrip("\n")
+    if len(line) <= max_chars:
+        return [line]
+    first = [line[:max_chars]]
+    rest = [line[i:i + max_chars - 2] for i in range(max_chars, len(line), max_chars - 2)]
+    return first + ["  " + part for part in rest]
+
+
+def scan_log(log_path, max_chars, state=None):
+    """
+    Pass pertama (streaming): hitung total per status dan jumlah baris cetak.
+
+    state: dict hasil scan sebelumnya (lihat return); jika diberikan, hanya
+    byte setelah state['offset'] yang dipindai dan hasilnya digabung.
+    Baris terakhir tanpa '\\n' belum dihitung sampai baris itu lengkap.
+    Mengembalikan dict berisi totals, records, printed, offset dan max_chars.
+    """
+    if state is None or state.get("max_chars") != max_chars:
+        state = {"totals": {}, "records": 0, "printed": 0, "offset": 0}
+    totals = dict(state["totals"])
+    records = state["records"]
+    printed = state["printed"]
+    offset = state["offset"]
+    try:
+        with open(log_path, "rb") as file:
+            file.seek(offset)
+            for raw in file:
+                if not raw.endswith(b"\n"):
+                    break
+                offset += len(raw)
+                line = raw.decode("utf-8", errors="replace")
+                if not line.strip():
+                    continue
+                records += 1
+                status = _status_of(line)
+                totals[status] = totals.get(status, 0) + 1
+                printed += len(_wrap(line, max_chars))
+    except FileNotFoundError:
+        pass
+    return {"totals": totals, "records": records, "printed": printed,
+            "offset": offset, "max_chars": max_chars}
+
+
+def build_report(report_path, log_path, internal_subnet, guest_subnet,
+                 recent_lines=RECENT_LINES, analytics=None, progress=None, scan_state=None,
+                 volume_pages=VOLUME_PAGES, volume_base=None, resume=None):
+    """
+    Membuat laporan PDF:
+    - Halaman 1: informasi subnet, ringkasan total per status, statistik
+      dari TrafficAnalytics (jika diberikan), log terbaru
+    - Halaman berikutnya: seluruh riwayat traffic (streaming, multi-halaman),
+      maksimal volume_pages halaman per file; sisanya di file volume
+      volume_path(volume_base, 2), ... (volume_base default = report_path).
+      Volume lama yang tidak terpakai lagi dihapus.
+
+    progress: callback opsional fungsi(fraksi 0.0-1.0) yang dipanggil setiap
+    halaman selesai; exception dari callback menghentikan pembuatan laporan.
+    scan_state: hasil scan_log dari laporan sebelumnya; ringkasan hanya
+    dihitung ulang untuk log yang ditambahkan sejak itu.
+    resume: nilai 'resume' dari laporan sebelumnya, hanya jika log sejak itu
+    cuma bertambah (pemanggil yang memeriksa). Volume yang sudah penuh
+    dipakai ulang; yang digambar ulang hanya file utama dan riwayat mulai
+    volume terakhir laporan sebelumnya. Diabaikan jika tata letak halaman
+    berbeda atau ada volume yang hilang.
+
+    Mengembalikan dict berisi pages (semua file), drawn (halaman yang
+    digambar), records, totals, volumes (path volume lanjutan), elapsed
+    (detik), pages_per_sec (halaman digambar per detik), scan_state dan
+    resume (untuk laporan berikutnya).
+    """
+    # ReportLab baru di-import saat laporan benar-benar dibuat
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfbase.pdfmetrics import stringWidth
+    from reportlab.pdfgen import canvas
+
+    start = time.perf_counter()
+    started = metrics.start()
+    width, height = A4
+    usable_width = width - 2 * MARGIN
+    max_chars = int(usable_width // stringWidth("M", *LOG_FONT))
+    lines_per_page = int((height - 2 * MARGIN - 30) // LOG_LEADING)
+
+    scan_state = scan_log(log_path, max_chars, scan_state)
+    totals, records, printed = scan_state["totals"], scan_state["records"], scan_state["printed"]
+    history_pages = max(1, -(-printed // lines_per_page))
+    total_pages = 1 + history_pages
+    volume_count = -(-history_pages // volume_pages)
+    volume_base = volume_base or report_path
+
+    def pages_in(number):
+        """Jumlah halaman di file volume ke-n (file utama ditambah halaman ringkasan)"""
+        pages = min(volume_pages, history_pages - (number - 1) * volume_pages)
+        return pages + 1 if number == 1 else pages
+
+    c = canvas.Canvas(report_path, pagesize=A4, pageCompression=1)
+    volume = 1
+    page = 1                # Halaman di file aktif
+    drawn = 0               # Halaman yang benar-benar digambar
+    done = 0                # Halaman selesai, termasuk volume yang dipakai ulang
+    written = []            # (path sementara, path akhir) volume yang digambar
+    starts = {}             # Nomor volume -> (offset baris, indeks potongan) halaman pertamanya
+
+    def footer():
+        label = f"Halaman {page} / {pages_in(volume)}"
+        if volume_count > 1:
+            # Tanpa jumlah volume: volume yang sudah penuh tetap sama saat log bertambah
+            label = f"Volume {volume} - {label}"
+        c.setFont("Helvetica", 8)
+        c.drawRightString(width - MARGIN, MARGIN / 2, label)
+
+    # ---------- Halaman 1: ringkasan ----------
+    c.setFont("Helvetica-Bold", 16)
+    c.drawString(MARGIN, height - 50, "SOHO Guard - Network Security Report")
+
+    c.setFont("Helvetica", 10)
+    y = height - 100
+    c.drawString(MARGIN, y, f"Internal Subnet : {internal_subnet}")
+    y -= 15
+    c.drawString(MARGIN, y, f"Guest Subnet    : {guest_subnet}")
+
+    y -= 30
+    c.setFont("Helvetica-Bold", 11)
+    c.drawString(MARGIN, y, "Ringkasan Traffic:")
+    c.setFont("Helvetica", 10)
+    y -= 18
+    c.drawString(MARGIN + 10, y, f"Total record : {records:,}")
+    for status in sorted(totals):
+        y -= 15
+        c.drawString(MARGIN + 10, y, f"{status:<12} : {totals[status]:,}")
+    y -= 15
+    c.drawString(MARGIN + 10, y, f"Riwayat      : {history_pages:,} halaman")
+    if volume_count > 1:
+        y -= 15
+        c.drawString(MARGIN + 10, y, f"Lanjutan     : {os.path.basename(volume_path(volume_base, 2))} "
+                                     f"s/d {os.path.basename(volume_path(volume_base, volume_count))}")
+
+    if analytics is not None:
+        sections = [
+            ("Top Blocked Sources:",
+             [f"{src:<40} {count:,}" for src, count in analytics.top_blocked_sources(5)]),
+            ("Busiest Destinations:",
+             [f"{dst:<40} {count:,}" for dst, count in analytics.top_destinations(5)]),
+            ("Blocked Ratio per Jam:",
+             [f"{bucket:<20} {total:>10,} log  {ratio:6.1%}"
+              for bucket, total, ratio in analytics.blocked_ratio_series(last=6)]),
+        ]
+        for heading, rows in sections:
+            y -= 25
+            c.setFont("Helvetica-Bold", 11)
+            c.drawString(MARGIN, y, heading)
+            c.setFont(*LOG_FONT)
+            for row in rows or ["-"]:
+                y -= LOG_LEADING
+                c.drawString(MARGIN + 10, y, row)
+
+    y -= 30
+    c.setFont("Helvetica-Bold", 11)
+    c.drawString(MARGIN, y, f"Traffic Terbaru ({recent_lines}):")
+    y -= 18
+    c.setFont(*LOG_FONT)
+    for line in tail_lines(log_path, recent_lines):
+        for part in _wrap(line, max_chars):
+            c.drawString(MARGIN + 10, y, part)
+            y -= LOG_LEADING
+
+    # ---------- Halaman berikutnya: riwayat lengkap ----------
+    def history_header():
+        title = "Riwayat Traffic Lengkap"
+        if volume > 1:
+            title += f" (Volume {volume})"
+        c.setFont("Helvetica-Bold", 11)
+        c.drawString(MARGIN, height - MARGIN, title)
+        c.setFont(*LOG_FONT)
+        return height - MARGIN - 30
+
+    layout = [max_chars, lines_per_page, volume_pages]
+    jump = None  # Posisi volume tempat menggambar dilanjutkan (volume sebelumnya dipakai ulang)
+    if resume and resume.get("layout") == layout and 2 < resume["number"] <= volume_count \
+            and all(os.path.exists(volume_path(volume_base, n)) for n in range(2, resume["number"])):
+        jump = resume
+
+    def history_parts(offset, skip):
+        """(offset baris, indeks potongan, teks) mulai dari offset/skip sampai akhir hasil scan"""
+        end = scan_state["offset"]  # Baris yang sama persis dengan hasil scan
+        try:
+            file = open(log_path, "rb")
+        except FileNotFoundError:
+            return
+        with file:
+            file.seek(offset)
+            position = offset
+            for raw in file:
+                line_start, position = position, position + len(raw)
+                if position > end:
+                    return
+                line = raw.decode("utf-8", errors="replace")
+                if not line.strip():
+                    continue
+                for index, part in enumerate(_wrap(line, max_chars)):
+                    if line_start != offset or index >= skip:
+                        yield line_start, index, part
+
+    parts = history_parts(0, 0)
+
+    def next_page():
+        """
+        Tutup halaman aktif; file yang sudah penuh disimpan lalu volume
+        berikutnya dibuka. True jika volume dilompati (parts diganti).
+        """
+        nonlocal c, volume, page, drawn, done, parts
+        footer()
+        c.showPage()
+        drawn += 1
+        done += 1
+        if progress is not None:
+            progress(done / total_pages)
+        jumped = False
+        if page == pages_in(volume):
+            c.save()  # Halaman volume ini dilepas dari memori
+            if volume == 1 and jump is not None:
+                # Volume 2 .. jump-1 sudah penuh dan isinya tidak berubah: dipakai ulang
+                done += sum(pages_in(number) for number in range(2, jump["number"]))
+                volume = jump["number"]
+                parts.close()
+                parts = history_parts(jump["offset"], jump["skip"])
+                jumped = True
+            else:
+                volume += 1
+            final_path = volume_path(volume_base, volume)
+            written.append((final_path + ".tmp", final_path))
+            c = canvas.Canvas(written[-1][0], pagesize=A4, pageCompression=1)
+            page = 0
+        page += 1
+        return jumped
+
+    try:
+        next_page()
+        y = history_header()
+        remaining = lines_per_page
+        while True:
+            item = next(parts, None)
+            if item is None:
+                break
+            if remaining == 0:
+                if next_page():
+                    item = next(parts, None)
+                    if item is None:
+                        break
+                y = history_header()
+                remaining = lines_per_page
+                if page == 1:
+                    starts[volume] = item[:2]
+            c.drawString(MARGIN, y, item[2])
+            y -= LOG_LEADING
+            remaining -= 1
+        footer()
+        c.showPage()
+        c.save()
+        drawn += 1
+        done += 1
+    except BaseException:
+        parts.close()
+        for tmp_path, _ in written:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        raise
+
+    # Semua volume selesai: ganti volume lama, hapus volume yang tidak terpakai
+    for tmp_path, final_path in written:
+        os.replace(tmp_path, final_path)
+    for number, path in list_volumes(volume_base):
+        if number > volume:
+            os.remove(path)
+
+    elapsed = time.perf_counter() - start
+    metrics.observe("soho_report_build_seconds", started)
+    return {
+        "pages": done,
+        "drawn": drawn,
+        "records": records,
+        "totals": totals,
+        "volumes": [volume_path(volume_base, number) for number in range(2, volume + 1)],
+        "elapsed": elapsed,
+        "pages_per_sec": drawn / elapsed if elapsed > 0 else 0.0,
+        "resume": (dict(layout=layout, number=volume, offset=starts[volume][0], skip=starts[volume][1])
+                   if volume > 1 else None),
+        "scan_state": scan_state,
+    }
@@ -0,0 +1,167 @@
+# ==================================================
+# REPORT CACHE (Laporan PDF Inkremental per Volume + Arsip)
+# ==================================================
+"""
+Cache untuk laporan PDF.
+
+Kunci cache = konfigurasi subnet + ukuran log + digest potongan terakhir
+log (sampai offset terakhir). Hasilnya:
+- Subnet dan log tidak berubah: file laporan yang ada langsung dipakai.
+- Hanya ada baris log baru: ringkasan (total per status, jumlah halaman)
+  dilanjutkan dari hasil scan sebelumnya, dan volume riwayat yang sudah
+  penuh (lihat soho_core.report) dipakai ulang. Yang digambar ulang hanya
+  file utama (ringkasan + volume 1) dan riwayat mulai volume terakhir, jadi
+  waktu build tidak lagi sebanding dengan panjang seluruh log.
+- Subnet berubah atau log dipotong/dirotasi: laporan dibuat dari awal.
+
+Laporan lama tidak ditimpa: file sebelumnya dipindah menjadi
+<nama>_YYYYmmdd_HHMMSS.pdf dan hanya `keep` arsip terbaru yang disimpan.
+Hanya file utama (ringkasan + volume riwayat pertama) yang diarsipkan;
+volume lanjutan <nama>_vol002.pdf, ... selalu berisi riwayat terbaru.
+"""
+import hashlib
+import json
+import os
+import re
+import time
+
+from soho_core.report import RECENT_LINES, VOLUME_PAGES, build_report
+
+SIGNATURE_BYTES = 4096  # Potongan akhir log yang di-hash untuk mendeteksi rotasi
+KEEP_REPORTS = 10       # Jumlah arsip laporan lama yang disimpan
+
+
+def log_signature(log_path, size):
+    """Digest dari SIGNATURE_BYTES byte terakhir sebelum offset `size`"""
+    digest = hashlib.sha1()
+    try:
+        with open(log_path, "rb") as file:
+            start = max(0, size - SIGNATURE_BYTES)
+            file.seek(start)
+            digest.update(file.read(size - start))
+    except FileNotFoundError:
+        pass
+    return digest.hexdigest()
+
+
+class ReportCache:
+    """
+    - report_path: path laporan terbaru (contoh reports/soho_guard_report.pdf)
+    - keep: jumlah arsip laporan lama yang disimpan
+    - state_path: file state cache (default: <report_path>.cache.json)
+    - volume_pages: halaman riwayat maksimum per file PDF
+    """
+
+    def __init__(self, report_path, keep=KEEP_REPORTS, state_path=None, volume_pages=VOLUME_PAGES):
+        self.report_path = report_path
+        self.keep = keep
+        self.volume_pages = volume_pages
+        self.state_path = state_path or f"{report_path}.cache.json"
+
+    # ---------- State ----------
+    def _load_state(self):
+        try:
+            with open(self.state_path, "r") as file:
+                return json.load(file)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _save_state(self, state):
+        tmp_path = self.state_path + ".tmp"
+        with open(tmp_path, "w") as file:
+            json.dump(state, file)
+        os.replace(tmp_path, self.state_path)
+
+    def _report_stamp(self):
+        """(ukuran, mtime) laporan terbaru, atau None jika belum ada"""
+        try:
+            stat = os.stat(self.report_path)
+        except FileNotFoundError:
+            return None
+        return [stat.st_size, stat.st_mtime_ns]
+
+    # ---------- Arsip ----------
+    def _archive_name(self, mtime):
+        stem, ext = os.path.splitext(self.report_path)
+        base = f"{stem}_{time.strftime('%Y%m%d_%H%M%S', time.localtime(mtime))}"
+        name, counter = f"{base}{ext}", 1
+        while os.path.exists(name):
+            counter += 1
+            name = f"{base}_{counter}{ext}"
+        return name
+
+    def archives(self):
+        """Daftar arsip laporan lama, terlama lebih dulu"""
+        directory = os.path.dirname(self.report_path) or "."
+        stem, ext = os.path.splitext(os.path.basename(self.report_path))
+        pattern = re.compile(re.escape(stem) + r"_\d{8}_\d{6}(_\d+)?" + re.escape(ext) + "$")
+        names = sorted(name for name in os.listdir(directory) if pattern.match(name))
+        return [os.path.join(directory, name) for name in names]
+
+    def _rotate(self):
+        """Pindahkan laporan terbaru ke arsip bertimestamp lalu hapus arsip berlebih"""
+        if os.path.exists(self.report_path):
+            os.replace(self.report_path, self._archive_name(os.path.getmtime(self.report_path)))
+        old = self.archives()
+        for path in old[:max(0, len(old) - self.keep)]:
+            os.remove(path)
+
+    # ---------- Build ----------
+    def build(self, log_path, internal_subnet, guest_subnet, analytics=None, progress=None,
+              recent_lines=RECENT_LINES):
+        """
+        Buat laporan jika perlu (lihat docstring modul).
+        Mengembalikan dict hasil build_report ditambah cached (True jika
+        laporan lama dipakai); drawn < pages jika ada volume yang dipakai ulang.
+        """
+        start = time.perf_counter()
+        key = {"internal": str(internal_subnet), "guest": str(guest_subnet),
+               "recent_lines": recent_lines}
+        try:
+            size = os.path.getsize(log_path)
+        except FileNotFoundError:
+            size = 0
+        signature = log_signature(log_path, size)
+        state = self._load_state()
+        same_key = state.get("key") == key
+        report = state.get("report", {})
+
+        if same_key and state.get("log") == {"size": size, "signature": signature} \
+                and report.get("stamp") == self._report_stamp() \
+                and all(os.path.exists(path) for path in report["result"].get("volumes", [])):
+            elapsed = time.perf_counter() - start
+            return dict(report["result"], elapsed=elapsed, pages_per_sec=0.0, drawn=0,
+                        cached=True)
+
+        # Log hanya bertambah jika isi sampai offset scan lama tidak berubah
+        scan_state = state.get("scan") if same_key else None
+        if scan_state is not None:
+            offset = scan_state.get("offset", 0)
+            if offset > size or log_signature(log_path, offset) != scan_state.get("signature"):
+                scan_state = None
+
+        tmp_path = f"{self.report_path}.tmp"
+        try:
+            result = build_report(tmp_path, log_path, internal_subnet, guest_subnet,
+                                  recent_lines=recent_lines, analytics=analytics,
+                                  progress=progress, scan_state=scan_state,
+                                  volume_pages=self.volume_pages, volume_base=self.report_path,
+                                  resume=state.get("resume") if scan_state is not None else None)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._rotate()
+        os.replace(tmp_path, self.report_path)
+
+        new_scan = dict(result.pop("scan_state"))
+        new_scan["signature"] = log_signature(log_path, new_scan["offset"])
+        summary = {name: result[name] for name in ("pages", "records", "totals", "volumes")}
+        self._save_state({
+            "key": key,
+            "log": {"size": size, "signature": signature},
+            "scan": new_scan,
+            "resume": result.pop("resume"),
+            "report": {"stamp": self._report_stamp(), "result": summary},
+        })
+        return dict(result, cached=False)
@@ -0,0 +1,269 @@
+# ==================================================
+# PARALLEL BATCH EVALUATION (Evaluasi File Flow Multi-Core)
+# ==================================================
+"""
+Evaluasi file flow besar secara paralel.
+
+File dibagi menjadi beberapa shard berdasarkan rentang byte yang diratakan ke
+batas baris, lalu setiap shard dievaluasi di process pool dengan aturan
+Guest -> Internal yang sama seperti flows.evaluate_flow_file. Log keputusan
+per shard ditulis ke file sementara dan digabung sesuai urutan shard, jadi
+hasilnya selalu sama dengan evaluasi berurutan (format logs.txt).
+
+Dengan snapshot_path, worker memakai snapshot policy yang di-mmap (lihat
+soho_core.snapshot) sehingga semua segmen policy ikut dievaluasi, dan versi
+policy yang dipakai setiap shard dicatat di hasil.
+"""
+import os
+import shutil
+import socket
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from soho_core.flows import (CHUNK_ROWS, count_blocked, ip_to_int, is_header, parse_flow_lines,
+                             subnet_bounds)
+from soho_core.logsink import TIMESTAMP_FORMAT, format_log_line
+from soho_core.policy import ALLOWED, BLOCKED
+
+SHARDS_PER_WORKER = 4  # Shard lebih kecil dari jumlah worker agar beban merata
+
+_snapshots = {}  # Snapshot policy per proses worker (path -> PolicySnapshot)
+
+
+def shard_ranges(path, shards):
+    """
+    Membagi file menjadi maksimal `shards` rentang byte (awal, akhir).
+    Setiap batas digeser ke awal baris berikutnya, jadi tidak ada baris
+    yang terpotong di antara dua shard.
+    """
+    size = os.path.getsize(path)
+    if size == 0:
+        return []
+    shards = max(1, min(shards, size))
+    bounds = [0]
+    with open(path, "rb") as file:
+        for index in range(1, shards):
+            target = size * index // shards
+            if target <= bounds[-1]:
+                continue
+            file.seek(target - 1)
+            file.readline()  # Maju sampai akhir baris yang sedang terpotong
+            position = file.tell()
+            if position >= size:
+                break
+            if position > bounds[-1]:
+                bounds.append(position)
+    bounds.append(size)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _iter_range_chunks(path, start, end, chunk_rows):
+    """Membaca baris dalam rentang byte [start, end) per potongan"""
+    with open(path, "rb") as file:
+        file.seek(start)
+        remaining = end - start
+        chunk = []
+        while remaining > 0:
+            line = file.readline()
+            if not line:
+                break
+            remaining -= len(line)
+            chunk.append(line.decode("ascii", errors="replace"))
+            if len(chunk) >= chunk_rows:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+def _rule_decider(version, guest_bounds, internal_bounds):
+    """Fungsi keputusan aturan Guest -> Internal untuk alamat integer"""
+    g_lo, g_hi = guest_bounds
+    i_lo, i_hi = internal_bounds
+
+    def decide(src_version, src, dst_version, dst):
+        if src_version == version and dst_version == version \
+                and g_lo <= src <= g_hi and i_lo <= dst <= i_hi:
+            return BLOCKED
+        return ALLOWED
+    return decide
+
+
+def _get_snapshot(snapshot_path):
+    """Snapshot policy untuk proses ini, dimuat ulang jika file sudah diganti"""
+    from soho_core.snapshot import PolicySnapshot
+
+    snapshot = _snapshots.get(snapshot_path)
+    if snapshot is None:
+        snapshot = _snapshots[snapshot_path] = PolicySnapshot(snapshot_path)
+    else:
+        snapshot.maybe_reload()
+    return snapshot
+
+
+def _log_address(text, version, value):
+    """
+    Alamat untuk log dalam bentuk kanonik, sama seperti GuardEngine.evaluate
+    (contoh 'FD00::0001' -> 'fd00::1'). IPv4 dari inet_pton sudah kanonik.
+    """
+    if version == 4:
+        return text
+    return socket.inet_ntop(socket.AF_INET6, value.to_bytes(16, "big"))
+
+
+def _decide_chunk(chunk, decide, timestamp, out):
+    """
+    Evaluasi potongan baris satu per satu dengan fungsi `decide`, dan tulis
+    log keputusannya jika out tidak None.
+    Mengembalikan (total, blocked, invalid).
+    """
+    total = blocked = invalid = 0
+    lines = []
+    for line in chunk:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        parts = line.split(",")
+        try:
+            source = parts[0].strip()
+            destination = parts[1].strip()
+            src_version, src = ip_to_int(source)
+            dst_version, dst = ip_to_int(destination)
+        except (ValueError, IndexError):
+            invalid += 1
+            continue
+        total += 1
+        status = decide(src_version, src, dst_version, dst)
+        if status == BLOCKED:
+            blocked += 1
+        if out is not None:
+            lines.append(format_log_line(_log_address(source, src_version, src),
+                                         _log_address(destination, dst_version, dst),
+                                         status, timestamp))
+    if out is not None:
+        out.write("".join(lines))
+    return total, blocked, invalid
+
+
+def evaluate_shard(path, start, end, internal_subnet, guest_subnet, log_path=None,
+                   timestamp=None, chunk_rows=CHUNK_ROWS, snapshot_path=None):
+    """
+    Evaluasi satu shard (dijalankan di proses worker).
+    Jika log_path diisi, keputusan setiap flow ditulis ke file tersebut.
+    Jika snapshot_path diisi, policy dibaca dari snapshot (subnet diabaikan).
+    Mengembalikan dict berisi total, blocked, invalid dan policy_version.
+    """
+    policy_version = None
+    if snapshot_path:
+        snapshot = _get_snapshot(snapshot_path)
+        decide = snapshot.decide_ints
+        policy_version = snapshot.version
+    else:
+        version = guest_subnet.version
+        guest_bounds = subnet_bounds(guest_subnet)
+        internal_bounds = subnet_bounds(internal_subnet)
+        decide = _rule_decider(version, guest_bounds, internal_bounds)
+    total = blocked = invalid = 0
+
+    out = open(log_path, "w", encoding="utf-8", newline="") if log_path else None
+    try:
+        first_chunk = start == 0
+        for chunk in _iter_range_chunks(path, start, end, chunk_rows):
+            if first_chunk:
+                first_chunk = False
+                # Header hanya mungkin ada di awal file (shard pertama)
+                if chunk and is_header(chunk[0]):
+                    chunk = chunk[1:]
+            if out is not None or snapshot_path:
+                rows, bad_rows, bad = _decide_chunk(chunk, decide, timestamp, out)
+                total += rows
+                blocked += bad_rows
+                invalid += bad
+                continue
+            srcs, dsts, bad, other = parse_flow_lines(chunk, version)
+            invalid += bad
+            total += len(srcs) + other
+            blocked += count_blocked(srcs, dsts, guest_bounds, internal_bounds)
+    finally:
+        if out is not None:
+            out.close()
+    return {"total": total, "blocked": blocked, "invalid": invalid,
+            "policy_version": policy_version}
+
+
+def _merge_logs(shard_logs, log_path):
+    """Gabungkan log shard ke log_path sesuai urutan shard (append)"""
+    with open(log_path, "ab") as target:
+        for shard_log in shard_logs:
+            with open(shard_log, "rb") as source:
+                shutil.copyfileobj(source, target, 1024 * 1024)
+
+
+def evaluate_flow_file_parallel(path, internal_subnet, guest_subnet, workers=None,
+                                log_path=None, progress=None, snapshot_path=None):
+    """
+    Versi paralel dari flows.evaluate_flow_file.
+
+    - workers: jumlah proses (None/0 = semua core); 1 = tanpa process pool
+    - log_path: jika diisi, keputusan setiap flow ditambahkan ke file ini
+      dalam format logs.txt, urut sesuai file input
+    - progress: callback opsional fungsi(fraksi 0.0-1.0) per shard selesai;
+      exception dari callback menghentikan evaluasi
+    - snapshot_path: evaluasi dengan snapshot policy (subnet boleh None)
+    Mengembalikan dict yang sama dengan evaluate_flow_file ditambah
+    workers, shards dan policy_versions (versi snapshot yang dipakai,
+    lebih dari satu jika snapshot diganti di tengah proses).
+    """
+    workers = workers or os.cpu_count() or 1
+    ranges = shard_ranges(path, workers * SHARDS_PER_WORKER)
+    timestamp = time.strftime(TIMESTAMP_FORMAT) if log_path else None
+    shard_logs = [f"{log_path}.shard-{index:04d}" if log_path else None
+                  for index in range(len(ranges))]
+
+    start = time.perf_counter()
+    results = [None] * len(ranges)
+    try:
+        if workers == 1:
+            for index, (lo, hi) in enumerate(ranges):
+                results[index] = evaluate_shard(path, lo, hi, internal_subnet, guest_subnet,
+                                                shard_logs[index], timestamp,
+                                                snapshot_path=snapshot_path)
+                if progress is not None:
+                    progress((index + 1) / len(ranges))
+        else:
+            executor = ProcessPoolExecutor(max_workers=workers)
+            try:
+                futures = {
+                    executor.submit(evaluate_shard, path, lo, hi, internal_subnet,
+                                    guest_subnet, shard_logs[index], timestamp,
+                                    snapshot_path=snapshot_path): index
+                    for index, (lo, hi) in enumerate(ranges)
+                }
+                for done, future in enumerate(as_completed(futures), 1):
+                    results[futures[future]] = future.result()
+                    if progress is not None:
+                        progress(done / len(ranges))
+            finally:
+                executor.shutdown(wait=True, cancel_futures=True)
+        if log_path:
+            _merge_logs(shard_logs, log_path)
+    finally:
+        for shard_log in shard_logs:
+            if shard_log and os.path.exists(shard_log):
+                os.remove(shard_log)
+
+    total = sum(result["total"] for result in results)
+    blocked = sum(result["blocked"] for result in results)
+    elapsed = time.perf_counter() - start
+    return {
+        "total": total,
+        "allowed": total - blocked,
+        "blocked": blocked,
+        "invalid": sum(result["invalid"] for result in results),
+        "elapsed": elapsed,
+        "rows_per_sec": total / elapsed if elapsed > 0 else 0.0,
+        "workers": workers,
+        "shards": len(ranges),
+        "policy_versions": sorted({result["policy_version"] for result in results
+                                   if result["policy_version"]}),
+    }
@@ -0,0 +1,288 @@
+# ==================================================
+# POLICY SNAPSHOT (Policy Terkompilasi untuk Proses Lain)
+# ==================================================
+"""
+Snapshot biner dari policy aktif yang bisa dibaca proses lain lewat mmap.
+
+Layout file (little endian):
+    HEADER   magic, format, default action, jumlah segmen, jumlah rentang
+             IPv4/IPv6, waktu dibuat (ns) dan digest isi (versi policy)
+    NAMES    nama segmen, 32 byte per segmen
+    RANGES   rentang alamat terurut: indeks segmen + awal/akhir (128-bit
+             sebagai dua uint64), semua IPv4 lalu semua IPv6
+    MATRIX   (N+1) x (N+1) byte kode aksi; baris = segmen source,
+             kolom = segmen destination, indeks N = di luar semua segmen
+
+Setiap versi ditulis ke file sendiri (<path>.<versi>) yang tidak pernah
+diganti selama mungkin masih di-mmap proses lain; di Windows file yang
+sedang di-mmap tidak bisa ditimpa. File `path` hanya berisi pointer kecil
+ke file versi aktif dan diganti secara atomik, jadi pembaca tidak pernah
+melihat snapshot setengah jadi. Versi policy adalah digest isi snapshot:
+policy yang sama selalu punya versi yang sama. File versi lama dihapus jika
+sudah tidak dipakai (yang masih di-mmap dicoba lagi saat penulisan
+berikutnya).
+"""
+import glob
+import hashlib
+import ipaddress
+import mmap
+import os
+import struct
+import time
+
+from soho_core.policy import ALLOWED, BLOCKED, Decision, Segment
+
+MAGIC = b"SOHOPOL1"
+POINTER_MAGIC = b"SOHOPTR1"  # File pointer: magic + nama file versi aktif
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<8sHBxIIIQ16s")
+NAME = struct.Struct("<32s")
+RANGE = struct.Struct("<I4xQQQQ")
+ACTION_CODES = {ALLOWED: 0, BLOCKED: 1}
+ACTION_NAMES = {code: action for action, code in ACTION_CODES.items()}
+CHECK_INTERVAL = 1.0  # Jeda minimum (detik) antar pengecekan perubahan file
+KEEP_VERSIONS = 3     # Jumlah file versi yang disimpan (termasuk versi aktif)
+REPLACE_RETRIES = 20  # Percobaan mengganti pointer jika sedang dibaca proses lain (Windows)
+
+_MASK64 = (1 << 64) - 1
+
+
+def _encode_body(policy):
+    """Mengembalikan (default_code, names, v4_ranges, v6_ranges, isi biner)"""
+    names = [segment.name for segment in policy.segments]
+    index = {name: position for position, name in enumerate(names)}
+    parts = []
+    for name in names:
+        encoded = name.encode("utf-8")
+        if len(encoded) > NAME.size:
+            raise ValueError(f"Nama segmen terlalu panjang untuk snapshot: {name!r}")
+        parts.append(NAME.pack(encoded))
+
+    counts = {}
+    for version in (4, 6):
+        starts, ends, seg_names = policy._index.get(version, ((), (), ()))
+        counts[version] = len(starts)
+        for start, end, name in zip(starts, ends, seg_names):
+            parts.append(RANGE.pack(index[name], start >> 64, start & _MASK64,
+                                    end >> 64, end & _MASK64))
+
+    candidates = names + [None]
+    parts.append(bytes(ACTION_CODES[policy.decide_segments(src, dst)]
+                       for src in candidates for dst in candidates))
+    default_code = ACTION_CODES[policy.default_action]
+    return default_code, names, counts[4], counts[6], b"".join(parts)
+
+
+def version_path(path, version):
+    """Nama file snapshot untuk satu versi, contoh: policy.snap.<versi>"""
+    return f"{path}.{version}"
+
+
+def _replace(source, target):
+    """os.replace dengan retry singkat (Windows menolak jika target sedang dibuka)"""
+    for attempt in range(REPLACE_RETRIES):
+        try:
+            os.replace(source, target)
+            return
+        except PermissionError:
+            if attempt == REPLACE_RETRIES - 1:
+                raise
+            time.sleep(0.05)
+
+
+def _prune_versions(path, current):
+    """Hapus file versi lama; yang masih di-mmap (Windows) dilewati"""
+    paths = glob.glob(glob.escape(path) + "." + "[0-9a-f]" * 32)
+    old = sorted((p for p in paths if p != current), key=os.path.getmtime, reverse=True)
+    for stale in old[KEEP_VERSIONS - 1:]:
+        try:
+            os.remove(stale)
+        except OSError:
+            pass
+
+
+def write_snapshot(policy, path):
+    """
+    Tulis snapshot Policy: file versi baru (jika belum ada) lalu pointer
+    `path` diganti secara atomik. Mengembalikan versi policy (string hex).
+    OSError jika file tidak bisa ditulis.
+    """
+    default_code, names, v4_count, v6_count, body = _encode_body(policy)
+    digest = hashlib.sha256(bytes([default_code]) + body).digest()[:16]
+    version = digest.hex()
+    target = version_path(path, version)
+    if not os.path.exists(target):
+        header = HEADER.pack(MAGIC, FORMAT_VERSION, default_code, len(names),
+                             v4_count, v6_count, time.time_ns(), digest)
+        temp_path = f"{target}.tmp.{os.getpid()}"
+        with open(temp_path, "wb") as file:
+            file.write(header + body)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, target)  # File baru: belum di-mmap siapa pun
+
+    temp_path = f"{path}.tmp.{os.getpid()}"
+    with open(temp_path, "wb") as file:
+        file.write(POINTER_MAGIC + os.path.basename(target).encode("utf-8"))
+        file.flush()
+        os.fsync(file.fileno())
+    _replace(temp_path, path)
+    _prune_versions(path, target)
+    return version
+
+
+def resolve_snapshot(path):
+    """Path file versi snapshot yang aktif menurut file pointer `path`"""
+    with open(path, "rb") as file:
+        head = file.read(len(POINTER_MAGIC) + 4096)
+    if not head.startswith(POINTER_MAGIC):
+        raise ValueError(f"Bukan file pointer snapshot policy: {path}")
+    name = head[len(POINTER_MAGIC):].decode("utf-8")
+    return os.path.join(os.path.dirname(path), name)
+
+
+class PolicySnapshot:
+    """
+    Policy read-only dari file snapshot (di-mmap).
+
+    Antarmuka lookup sama dengan Policy (segment_of_int, segment_of,
+    decide_segments, evaluate, segments), jadi bisa dipasang langsung ke
+    GuardEngine.
+    maybe_reload() memuat ulang snapshot jika pointer sudah diganti.
+    """
+
+    def __init__(self, path, check_interval=CHECK_INTERVAL):
+        self.path = path
+        self.check_interval = check_interval
+        self._mmap = None
+        self._load()
+
+    def _load(self):
+        stat = os.stat(self.path)
+        with open(resolve_snapshot(self.path), "rb") as file:
+            view = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, fmt, default_code, count, v4_count, v6_count, created, digest = \
+                HEADER.unpack_from(view, 0)
+            if magic != MAGIC or fmt != FORMAT_VERSION:
+                raise ValueError(f"Bukan file snapshot policy yang didukung: {self.path}")
+            names_offset = HEADER.size
+            ranges_offset = names_offset + count * NAME.size
+            matrix_offset = ranges_offset + (v4_count + v6_count) * RANGE.size
+            if len(view) != matrix_offset + (count + 1) ** 2:
+                raise ValueError(f"Ukuran snapshot policy tidak sesuai: {self.path}")
+            if hashlib.sha256(bytes([default_code]) + view[names_offset:]).digest()[:16] != digest:
+                raise ValueError(f"Digest snapshot policy tidak cocok: {self.path}")
+        except Exception:
+            view.close()
+            raise
+
+        names = [NAME.unpack_from(view, names_offset + i * NAME.size)[0].rstrip(b"\0").decode("utf-8")
+                 for i in range(count)]
+        old = self._mmap
+        self._mmap = view
+        self.names = names
+        self._name_index = {name: position for position, name in enumerate(names)}
+        self._tables = {4: (ranges_offset, v4_count),
+                        6: (ranges_offset + v4_count * RANGE.size, v6_count)}
+        self._matrix_offset = matrix_offset
+        self._outside = count
+        self.default_action = ACTION_NAMES[default_code]
+        self.version = digest.hex()
+        self.created_ns = created
+        self._stat = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        self._next_check = time.monotonic() + self.check_interval
+        if old is not None:
+            old.close()
+
+    def maybe_reload(self, force=False):
+        """
+        Muat ulang jika file snapshot sudah diganti (dicek maksimal sekali
+        per check_interval detik). Mengembalikan True jika snapshot berubah.
+        """
+        now = time.monotonic()
+        if not force and now < self._next_check:
+            return False
+        self._next_check = now + self.check_interval
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return False
+        if (stat.st_ino, stat.st_mtime_ns, stat.st_size) == self._stat:
+            return False
+        previous = self.version
+        self._load()
+        return self.version != previous
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    @property
+    def segments(self):
+        """List Segment (nama, network) seperti Policy.segments, disusun dari rentang"""
+        found = {}
+        for version, (offset, count) in self._tables.items():
+            make = ipaddress.IPv4Address if version == 4 else ipaddress.IPv6Address
+            for index in range(count):
+                position, start_hi, start_lo, end_hi, end_lo = \
+                    RANGE.unpack_from(self._mmap, offset + index * RANGE.size)
+                first = make(start_hi << 64 | start_lo)
+                last = make(end_hi << 64 | end_lo)
+                found[position] = next(ipaddress.summarize_address_range(first, last))
+        return [Segment(name, found[position]) for position, name in enumerate(self.names)
+                if position in found]
+
+    # ---------- Lookup (sama seperti Policy) ----------
+    def _segment_position(self, value, version):
+        """Indeks segmen untuk alamat integer (self._outside jika di luar segmen)"""
+        table = self._tables.get(version)
+        if table is None:
+            return self._outside
+        offset, count = table
+        view = self._mmap
+        lo, hi = 0, count
+        while lo < hi:  # Cari rentang terakhir dengan awal <= value
+            mid = (lo + hi) // 2
+            _, start_hi, start_lo, _, _ = RANGE.unpack_from(view, offset + mid * RANGE.size)
+            if (start_hi << 64 | start_lo) <= value:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo == 0:
+            return self._outside
+        position, _, _, end_hi, end_lo = RANGE.unpack_from(view, offset + (lo - 1) * RANGE.size)
+        return position if value <= (end_hi << 64 | end_lo) else self._outside
+
+    def segment_of_int(self, value, version=4):
+        """Cari nama segmen untuk alamat integer (None jika di luar semua segmen)"""
+        position = self._segment_position(value, version)
+        return None if position == self._outside else self.names[position]
+
+    def segment_of(self, address):
+        """Cari nama segmen untuk alamat (string atau objek ip_address)"""
+        if not isinstance(address, (ipaddress.IPv4Address, ipaddress.IPv6Address)):
+            address = ipaddress.ip_address(address)
+        return self.segment_of_int(int(address), address.version)
+
+    def decide_positions(self, src_position, dst_position):
+        """Keputusan dari indeks segmen (lihat _segment_position)"""
+        offset = self._matrix_offset + src_position * (self._outside + 1) + dst_position
+        return ACTION_NAMES[self._mmap[offset]]
+
+    def decide_ints(self, src_version, src, dst_version, dst):
+        """Keputusan untuk pasangan alamat integer"""
+        return self.decide_positions(self._segment_position(src, src_version),
+                                     self._segment_position(dst, dst_version))
+
+    def decide_segments(self, src_segment, dst_segment):
+        """Keputusan untuk pasangan nama segmen (None = di luar segmen)"""
+        src = self._outside if src_segment is None else self._name_index[src_segment]
+        dst = self._outside if dst_segment is None else self._name_index[dst_segment]
+        return self.decide_positions(src, dst)
+
+    def evaluate(self, src, dst):
+        src_segment = self.segment_of(src)
+        dst_segment = self.segment_of(dst)
+        return Decision(self.decide_segments(src_segment, dst_segment), src_segment, dst_segment)
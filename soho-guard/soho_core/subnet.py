@@ -0,0 +1,87 @@
+# ==================================================
+# SUBNET ENGINE (Ringkasan Subnet dengan Aritmatika Integer)
+# ==================================================
+"""
+Menghitung ringkasan subnet (network, broadcast, host pertama/terakhir, dan
+jumlah host) langsung dari nilai integer alamat.
+
+Tidak ada host yang dienumerasi, jadi waktu eksekusi sama untuk /8 maupun /30,
+dan juga untuk prefix IPv6 seperti /64 (integer Python tidak terbatas ukurannya).
+"""
+import ipaddress
+from collections import namedtuple
+
+_NETWORK_TYPES = (ipaddress.IPv4Network, ipaddress.IPv6Network)
+
+# Hasil ringkasan satu subnet
+SubnetSummary = namedtuple(
+    "SubnetSummary",
+    ["network", "network_address", "broadcast_address",
+     "first_host", "last_host", "host_count"],
+)
+
+
+def summarize_subnet(network):
+    """
+    Membuat SubnetSummary untuk sebuah subnet.
+    - network: objek ip_network atau string CIDR (contoh: "192.168.1.0/24"
+      atau "2001:db8::/64")
+
+    Kasus khusus:
+    - /31 (RFC 3021): kedua alamat bisa dipakai sebagai host
+    - /32: hanya satu host, yaitu alamat itu sendiri
+    - IPv6: tidak ada broadcast; broadcast_address berisi alamat terakhir dan
+      host pertama dimulai setelah alamat Subnet-Router anycast (/127 dan
+      /128 mengikuti aturan seperti /31 dan /32)
+    """
+    if not isinstance(network, _NETWORK_TYPES):
+        network = ipaddress.ip_network(network, strict=False)
+
+    address_class = type(network.network_address)
+    net_int = int(network.network_address)
+    size = 1 << (network.max_prefixlen - network.prefixlen)
+    broadcast_int = net_int + size - 1
+
+    if size <= 2:
+        # /31 dan /32 (/127 dan /128): tidak ada alamat yang "dikorbankan"
+        first_int, last_int = net_int, broadcast_int
+    elif network.version == 6:
+        # IPv6: semua alamat setelah Subnet-Router anycast
+        first_int, last_int = net_int + 1, broadcast_int
+    else:
+        # Host normal: tanpa network address dan broadcast address
+        first_int, last_int = net_int + 1, broadcast_int - 1
+
+    return SubnetSummary(
+        network=network,
+        network_address=address_class(net_int),
+        broadcast_address=address_class(broadcast_int),
+        first_host=address_class(first_int),
+        last_host=address_class(last_int),
+        host_count=last_int - first_int + 1,
+    )
+
+
+def split_network(network):
+    """
+    Membagi network menjadi 2 subnet sama besar (prefix + 1).
+    Subnet pertama = internal, subnet kedua = guest.
+    """
+    if not isinstance(network, _NETWORK_TYPES):
+        network = ipaddress.ip_network(network, strict=False)
+
+    new_prefix = network.prefixlen + 1
+    if new_prefix > network.max_prefixlen:
+        raise ValueError(f"{network} tidak bisa dibagi lagi")
+
+    network_class = type(network)
+    net_int = int(network.network_address)
+    half = 1 << (network.max_prefixlen - new_prefix)
+    internal = network_class((net_int, new_prefix))
+    guest = network_class((net_int + half, new_prefix))
+    return internal, guest
+
+
+def format_host_range(summary):
+    """Format rentang host untuk ditampilkan: 'first - last'"""
+    return f"{summary.first_host} - {summary.last_host}"
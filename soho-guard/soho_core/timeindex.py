@@ -0,0 +1,284 @@
+# ==================================================
+# TIME INDEX (Indeks Waktu -> Offset untuk Pencarian Log)
+# ==================================================
+"""
+Indeks sidecar yang jarang (sparse) untuk mencari log berdasarkan waktu.
+
+File indeks (<log>.tidx) berisi header (magic + jumlah byte log yang sudah
+diindeks) lalu entri (epoch, offset byte) berukuran tetap. Entri baru
+ditambahkan setiap kali timestamp masuk ke menit baru, atau setelah MAX_GAP
+byte tanpa entri, jadi ukurannya sangat kecil dibanding log.
+
+Indeks dibangun bertahap: LogSink menambahkan entri setiap kali menulis
+batch log, dan update() memindai bagian log yang belum terindeks (misalnya
+log lama atau baris yang ditambahkan proses lain).
+
+Pencarian memakai mmap: hanya rentang byte di antara dua entri indeks yang
+mengapit jendela waktu yang dibaca. Log diasumsikan berurutan waktu (append).
+"""
+import mmap
+import os
+import struct
+import time
+
+from soho_core.lineindex import make_filter
+from soho_core.logread import parse_log_line
+from soho_core.logsink import TIMESTAMP_FORMAT
+
+MAGIC = b"SOHOTIX1"
+HEADER = struct.Struct("<8sQ")   # magic, byte log yang sudah diindeks
+ENTRY = struct.Struct("<qQ")     # epoch detik, offset byte awal baris
+MAX_GAP = 1024 * 1024            # Byte maksimum antar entri
+STAMP_SIZE = 19                  # Panjang 'YYYY-mm-dd HH:MM:SS'
+MINUTE_SIZE = 16                 # Panjang 'YYYY-mm-dd HH:MM' (satu entri per menit)
+_TIME_FORMATS = (TIMESTAMP_FORMAT, "%Y-%m-%d %H:%M", "%Y-%m-%d")
+
+
+def index_path_for(log_path):
+    return f"{log_path}.tidx"
+
+
+def parse_time(value):
+    """
+    Waktu query menjadi epoch detik. Menerima angka epoch atau string
+    'YYYY-mm-dd', 'YYYY-mm-dd HH:MM' atau 'YYYY-mm-dd HH:MM:SS' (waktu lokal).
+    """
+    if isinstance(value, (int, float)):
+        return int(value)
+    for fmt in _TIME_FORMATS:
+        try:
+            return int(time.mktime(time.strptime(value.strip(), fmt)))
+        except ValueError:
+            continue
+    raise ValueError(f"Format waktu tidak dikenal: {value!r}")
+
+
+def _stamp_bytes(epoch):
+    return time.strftime(TIMESTAMP_FORMAT, time.localtime(epoch)).encode("ascii")
+
+
+class TimeIndex:
+    """
+    Indeks waktu untuk satu file log.
+    - log_path: file log (format logs.txt)
+    - index_path: file sidecar (default: <log>.tidx)
+    """
+
+    def __init__(self, log_path, index_path=None, max_gap=MAX_GAP):
+        self.log_path = log_path
+        self.index_path = index_path or index_path_for(log_path)
+        self.max_gap = max_gap
+        self.last_scanned_bytes = 0   # Byte log yang dibaca oleh query terakhir
+        self._file = None
+        self._open()
+
+    # ---------- File indeks ----------
+    def _open(self):
+        exists = os.path.exists(self.index_path)
+        self._file = open(self.index_path, "r+b" if exists else "w+b")
+        header = self._file.read(HEADER.size)
+        if len(header) == HEADER.size and HEADER.unpack(header)[0] == MAGIC:
+            self.covered = HEADER.unpack(header)[1]
+            size = os.fstat(self._file.fileno()).st_size
+            count = (size - HEADER.size) // ENTRY.size
+            self._file.truncate(HEADER.size + count * ENTRY.size)  # Buang entri setengah jadi
+            if count:
+                self._file.seek(HEADER.size + (count - 1) * ENTRY.size)
+                epoch, offset = ENTRY.unpack(self._file.read(ENTRY.size))
+                self._last_minute = _stamp_bytes(epoch)[:MINUTE_SIZE]
+                self._last_offset = offset
+            else:
+                self._last_minute = self._last_offset = None
+        else:
+            self.reset()
+        try:
+            log_size = os.path.getsize(self.log_path)
+        except FileNotFoundError:
+            log_size = 0
+        if log_size < self.covered:
+            self.reset()  # Log dipotong/dirotasi: bangun ulang indeks
+
+    def reset(self):
+        self._file.seek(0)
+        self._file.truncate()
+        self._file.write(HEADER.pack(MAGIC, 0))
+        self._file.flush()
+        self.covered = 0
+        self._last_minute = self._last_offset = None
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _commit(self, entries, covered):
+        """Tambahkan entri baru lalu perbarui jumlah byte yang sudah diindeks"""
+        if entries:
+            self._file.seek(0, 2)
+            self._file.write(b"".join(ENTRY.pack(epoch, offset) for epoch, offset in entries))
+        self._file.seek(0)
+        self._file.write(HEADER.pack(MAGIC, covered))
+        self._file.flush()
+        self.covered = covered
+
+    def _observe(self, stamp, offset, entries):
+        """Catat entri untuk baris ber-timestamp `stamp` (bytes) di `offset` jika perlu"""
+        minute = stamp[:MINUTE_SIZE]
+        if minute == self._last_minute and offset - self._last_offset < self.max_gap:
+            return  # Timestamp hanya di-parse saat entri baru dibutuhkan
+        try:
+            epoch = int(time.mktime(time.strptime(stamp.decode("ascii"), TIMESTAMP_FORMAT)))
+        except (UnicodeDecodeError, ValueError):
+            return  # Baris tanpa timestamp valid tidak diindeks
+        entries.append((epoch, offset))
+        self._last_minute = minute
+        self._last_offset = offset
+
+    # ---------- Pembangunan indeks ----------
+    def append_lines(self, lines, start_offset):
+        """
+        Dipanggil LogSink setelah menulis batch: `lines` (string) tertulis
+        mulai dari `start_offset`. Celah sebelum start_offset (baris dari
+        proses lain) dipindai dulu agar indeks tetap lengkap.
+        """
+        if start_offset != self.covered:
+            self.update(limit=start_offset)
+            if start_offset != self.covered:
+                return  # Posisi tidak konsisten; sisanya dipindai oleh update()
+        entries = []
+        offset = start_offset
+        for line in lines:
+            self._observe(line[:STAMP_SIZE].encode("ascii", "replace"), offset, entries)
+            offset += len(line) if line.isascii() else len(line.encode("utf-8"))
+        self._commit(entries, offset)
+
+    def update(self, limit=None):
+        """
+        Indeks bagian log yang belum terindeks (sampai baris lengkap terakhir,
+        atau sampai `limit` byte). Mengembalikan jumlah byte yang dipindai.
+        """
+        try:
+            log = open(self.log_path, "rb")
+        except FileNotFoundError:
+            return 0
+        with log:
+            size = os.fstat(log.fileno()).st_size
+            if size < self.covered:
+                self.reset()
+            end = size if limit is None else min(limit, size)
+            if end <= self.covered:
+                return 0
+            with mmap.mmap(log.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                end = view.rfind(b"\n", self.covered, end) + 1
+                if end <= self.covered:
+                    return 0
+                start = self.covered
+                entries = []
+                offset = start
+                while offset < end:
+                    newline = view.find(b"\n", offset, end)
+                    self._observe(view[offset:offset + STAMP_SIZE], offset, entries)
+                    offset = newline + 1
+        self._commit(entries, end)
+        return end - start
+
+    # ---------- Query ----------
+    def _read_entries(self):
+        """Mengembalikan (mmap indeks, jumlah entri) atau (None, 0)"""
+        with open(self.index_path, "rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            count = (size - HEADER.size) // ENTRY.size
+            if count <= 0:
+                return None, 0
+            return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ), count
+
+    def _bisect(self, view, count, epoch, strict):
+        """Jumlah entri dengan epoch < epoch (strict) atau <= epoch"""
+        lo, hi = 0, count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            value = ENTRY.unpack_from(view, HEADER.size + mid * ENTRY.size)[0]
+            if value < epoch or (not strict and value == epoch):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def byte_range(self, start=None, end=None):
+        """
+        Rentang byte log (awal, akhir) yang pasti memuat semua baris dengan
+        timestamp di [start, end] (epoch). akhir None = sampai akhir indeks.
+        """
+        view, count = self._read_entries()
+        if view is None:
+            return 0, None
+        with view:
+            lo_offset, hi_offset = 0, None
+            if start is not None:
+                position = self._bisect(view, count, start, strict=True)
+                if position:
+                    lo_offset = ENTRY.unpack_from(view, HEADER.size + (position - 1) * ENTRY.size)[1]
+            if end is not None:
+                position = self._bisect(view, count, end, strict=False)
+                if position < count:
+                    hi_offset = ENTRY.unpack_from(view, HEADER.size + position * ENTRY.size)[1]
+        return lo_offset, hi_offset
+
+    def search(self, start=None, end=None, source=None, destination=None, status=None,
+               limit=None, refresh=True):
+        """
+        Cari baris log dalam jendela waktu [start, end] (epoch atau string,
+        lihat parse_time) dengan filter source/destination (alamat persis)
+        dan status. Menghasilkan LogRecord secara berurutan.
+        """
+        if refresh:
+            self.update()
+        start = None if start is None else parse_time(start)
+        end = None if end is None else parse_time(end)
+        lo_key = None if start is None else _stamp_bytes(start)
+        hi_key = None if end is None else _stamp_bytes(end)
+        predicate = make_filter(status, source, destination, exact=True)
+        lo_offset, hi_offset = self.byte_range(start, end)
+        self.last_scanned_bytes = 0
+
+        try:
+            log = open(self.log_path, "rb")
+        except FileNotFoundError:
+            return
+        with log:
+            if os.fstat(log.fileno()).st_size == 0:
+                return
+            with mmap.mmap(log.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                stop = len(view) if hi_offset is None else hi_offset
+                offset = lo_offset
+                found = 0
+                while offset < stop:
+                    newline = view.find(b"\n", offset, stop)
+                    line_end = stop if newline < 0 else newline
+                    line = view[offset:line_end]
+                    offset = line_end + 1
+                    stamp = line[:STAMP_SIZE]
+                    if lo_key is not None and stamp < lo_key:
+                        continue
+                    if hi_key is not None and stamp > hi_key:
+                        break
+                    if predicate is not None and not predicate(line):
+                        continue
+                    record = parse_log_line(line.decode("utf-8", errors="replace"))
+                    if record is None:
+                        continue
+                    yield record
+                    found += 1
+                    if limit is not None and found >= limit:
+                        break
+                self.last_scanned_bytes = min(offset, stop) - lo_offset
+
+
+def search_log(log_path, start=None, end=None, source=None, destination=None, status=None,
+               limit=None):
+    """Fungsi praktis: cari log dan kembalikan list LogRecord (lihat TimeIndex.search)"""
+    index = TimeIndex(log_path)
+    try:
+        return list(index.search(start, end, source, destination, status, limit))
+    finally:
+        index.close()
@@ -0,0 +1,120 @@
+# ==================================================
+# VLSM PLANNER (Variable Length Subnet Mask)
+# ==================================================
+"""
+Membagi satu network menjadi banyak segmen dengan ukuran yang pas untuk
+kebutuhan host masing-masing (VLSM).
+
+Segmen dialokasikan dari yang terbesar ke yang terkecil memakai free-block
+allocator (gaya buddy allocator): blok bebas disimpan per panjang prefix,
+dan blok yang lebih besar dibelah dua hanya saat dibutuhkan.
+"""
+import heapq
+import ipaddress
+from collections import namedtuple
+
+from soho_core.subnet import summarize_subnet
+
+Allocation = namedtuple("Allocation", ["name", "hosts", "network", "summary"])
+VlsmPlan = namedtuple("VlsmPlan", ["parent", "allocations", "free_blocks",
+                                   "allocated_addresses", "utilization"])
+
+
+def prefix_for_hosts(hosts, max_prefixlen=32):
+    """
+    Prefix terpanjang (subnet terkecil) yang masih muat `hosts` host.
+    Mengikuti aturan summarize_subnet: /32 = 1 host, /31 = 2 host,
+    selebihnya ukuran blok - 2 (network & broadcast). Untuk IPv6
+    (max_prefixlen 128) hanya alamat Subnet-Router anycast yang tidak dipakai.
+    """
+    if hosts < 1:
+        raise ValueError("Jumlah host minimal 1")
+    if hosts == 1:
+        return max_prefixlen
+    if hosts == 2:
+        return max_prefixlen - 1
+    reserved = 1 if max_prefixlen == 128 else 2
+    bits = (hosts + reserved - 1).bit_length()  # ukuran blok 2**bits >= hosts + reserved
+    return max_prefixlen - bits
+
+
+def parse_requirements(text):
+    """
+    Parsing teks 'internal=100, guest=20, iot=50' menjadi
+    list (nama, jumlah host).
+    """
+    requirements = []
+    for item in text.replace(";", ",").split(","):
+        item = item.strip()
+        if not item:
+            continue
+        name, _, hosts = item.partition("=")
+        if not name.strip() or not hosts.strip():
+            raise ValueError(f"Format kebutuhan tidak valid: {item!r}")
+        requirements.append((name.strip(), int(hosts)))
+    return requirements
+
+
+def plan_vlsm(parent, requirements):
+    """
+    Membuat rencana VLSM.
+    - parent: network induk (string CIDR atau ip_network)
+    - requirements: list (nama, jumlah host)
+
+    Mengembalikan VlsmPlan dengan alokasi dalam urutan alamat. ValueError
+    langsung dilempar jika total kebutuhan tidak muat di network induk.
+    """
+    parent = ipaddress.ip_network(parent, strict=False)
+    max_prefixlen = parent.max_prefixlen
+    network_class = type(parent)
+
+    names = [name for name, _ in requirements]
+    if len(set(names)) != len(names):
+        raise ValueError("Nama segmen harus unik")
+
+    # Hitung prefix setiap kebutuhan lalu cek kapasitas sebelum alokasi.
+    # Blok berukuran 2^n yang dialokasikan dari terbesar selalu muat
+    # selama total ukurannya <= ukuran network induk.
+    sized = []
+    needed = 0
+    for order, (name, hosts) in enumerate(requirements):
+        prefix = prefix_for_hosts(hosts, max_prefixlen)
+        if prefix < parent.prefixlen:
+            raise ValueError(f"Segmen {name!r} ({hosts} host) lebih besar dari {parent}")
+        sized.append((prefix, order, name, hosts))
+        needed += 1 << (max_prefixlen - prefix)
+
+    capacity = parent.num_addresses
+    if needed > capacity:
+        raise ValueError(f"Kebutuhan {needed:,} alamat tidak muat di {parent} ({capacity:,} alamat)")
+
+    # Free list per prefix: heap berisi alamat awal blok bebas
+    free = {parent.prefixlen: [int(parent.network_address)]}
+    allocations = []
+
+    for prefix, _, name, hosts in sorted(sized):
+        # Cari blok bebas terkecil yang masih cukup besar
+        source = prefix
+        while not free.get(source):
+            source -= 1
+        start = heapq.heappop(free[source])
+        # Belah blok sampai ukurannya pas; separuh kanan kembali ke free list
+        while source < prefix:
+            source += 1
+            heapq.heappush(free.setdefault(source, []),
+                           start + (1 << (max_prefixlen - source)))
+        network = network_class((start, prefix))
+        allocations.append(Allocation(name, hosts, network, summarize_subnet(network)))
+
+    allocations.sort(key=lambda alloc: int(alloc.network.network_address))
+    free_blocks = sorted(
+        (network_class((start, prefix)) for prefix, starts in free.items() for start in starts),
+        key=lambda net: int(net.network_address),
+    )
+    return VlsmPlan(
+        parent=parent,
+        allocations=allocations,
+        free_blocks=free_blocks,
+        allocated_addresses=needed,
+        utilization=sum(hosts for _, hosts in requirements) / capacity,
+    )
@@ -3,20 +3,37 @@
 # ==================================================
 import tkinter as tk                    # Library utama untuk membuat GUI desktop
 from tkinter import messagebox, ttk     # messagebox untuk popup, ttk untuk widget modern
-import ipaddress                        # Library untuk manipulasi alamat IP dan subnet
-from datetime import datetime           # Untuk mendapatkan timestamp (waktu saat ini)
-from reportlab.lib.pagesizes import A4  # Ukuran halaman PDF (A4)
-from reportlab.pdfgen import canvas     # Untuk membuat file PDF
+from tkinter import filedialog          # Dialog untuk memilih file flow (batch mode)
 import os                               # Untuk operasi file dan folder
+from soho_core.engine import GuardEngine, LOG_FILE, POLICY_SNAPSHOT, REPORT_FILE, ensure_storage  # Inti tanpa GUI
+from soho_core.subnet import format_host_range, summarize_subnet
+from soho_core.vlsm import parse_requirements
+from soho_core.policy import BLOCKED
+from soho_core.analytics import TrafficAnalytics
+from soho_core import metrics
+from soho_gui.theme import ThemeRegistry
+from soho_gui.layout import ResponsiveLayout
+from soho_gui.jobs import JobRunner
+from soho_gui.logview import LogViewer
 
 # ==================================================
 # GLOBAL STATE (Variabel Global)
 # ==================================================
-# Variabel untuk menyimpan subnet yang sudah digenerate
-internal_subnet = None   # Menyimpan subnet untuk jaringan internal (karyawan/server)
-guest_subnet = None      # Menyimpan subnet untuk jaringan tamu (guest WiFi)
+# Subnet Internal/Guest, policy aktif dan log disimpan di GuardEngine (soho_core).
+# Setiap policy baru juga ditulis ke POLICY_SNAPSHOT agar worker/daemon lain
+# (python -m soho_core --snapshot policy.snap ...) memakai policy yang sama.
+engine = GuardEngine(LOG_FILE, snapshot_path=POLICY_SNAPSHOT)
 current_theme = "dark"   # Tema warna aplikasi (dark/light mode)
 
+# Metrics selalu aktif di GUI (ditampilkan di status card). Ekspor opsional:
+# SOHO_METRICS_PORT=9108 -> http://127.0.0.1:9108/metrics
+# SOHO_METRICS_FILE=path -> file teks Prometheus yang diperbarui berkala
+metrics.enable()
+METRICS_FILE = os.environ.get("SOHO_METRICS_FILE")
+METRICS_REFRESH_MS = 2000
+if os.environ.get("SOHO_METRICS_PORT"):
+    metrics.serve_http(int(os.environ["SOHO_METRICS_PORT"]))
+
 # ==================================================
 # MODERN COLOR PALETTE
 # ==================================================
@@ -63,31 +80,25 @@ THEMES = {
 # ==================================================
 # INITIAL FILE SETUP (Pengaturan File Awal)
 # ==================================================
-LOG_FILE = "logs.txt"                                    # Nama file untuk menyimpan log traffic
-REPORT_DIR = "reports"                                   # Folder untuk menyimpan laporan PDF
-REPORT_FILE = os.path.join(REPORT_DIR, "soho_guard_report.pdf")  # Path lengkap file PDF
-
-# Membuat file log jika belum ada
-if not os.path.exists(LOG_FILE):
-    open(LOG_FILE, "w").close()  # Buat file kosong
+# LOG_FILE (logs.txt), REPORT_DIR (reports) dan REPORT_FILE didefinisikan di soho_core.engine
+# Membuat file log dan folder reports jika belum ada
+ensure_storage()
 
-# Membuat folder reports jika belum ada
-if not os.path.exists(REPORT_DIR):
-    os.makedirs(REPORT_DIR)
+# Statistik traffic inkremental (checkpoint offset disimpan di logs.analytics.json)
+analytics = TrafficAnalytics(LOG_FILE)
 
 # ==================================================
 # THEME HANDLER
 # ==================================================
+# Setiap widget didaftarkan sekali dengan role-nya; ganti tema = satu putaran configure()
+theme_registry = ThemeRegistry(THEMES, COLORS["primary"])
+
 def apply_theme():
     theme = THEMES[current_theme]
     root.configure(bg=theme["bg"])
-    main_container.configure(bg=theme["bg"])
-    canvas_widget.configure(bg=theme["bg"])
-    scrollable_frame.configure(bg=theme["bg"])
-    
-    # Update all widgets recursively
-    for widget in scrollable_frame.winfo_children():
-        update_widget_theme(widget, theme)
+
+    # Update semua widget terdaftar (opsi per role sudah dihitung sebelumnya)
+    theme_registry.apply(current_theme)
 
     # Update Combobox Style
     style = ttk.Style()
@@ -100,50 +111,10 @@ def apply_theme():
               foreground=[('readonly', theme["fg"])],
               arrowcolor=[('readonly', theme["fg"])]) # Attempt to color arrow if supported
 
-def update_widget_theme(widget, theme):
-    widget_class = widget.winfo_class()
-    
-    try:
-        if widget_class == "Frame":
-            if hasattr(widget, 'is_card') and widget.is_card:
-                widget.configure(bg=theme["card"])
-            else:
-                widget.configure(bg=theme["bg"])
-        elif widget_class == "Label":
-            parent_bg = widget.master.cget('bg') if widget.master else theme["bg"]
-            # Keep special colored labels
-            current_fg = widget.cget('fg')
-            if current_fg not in [COLORS["success"], COLORS["warning"], COLORS["danger"], 
-                                  COLORS["primary"], COLORS["secondary"], COLORS["accent"]]:
-                if hasattr(widget, 'is_muted') and widget.is_muted:
-                    widget.configure(bg=parent_bg, fg=theme["muted"])
-                else:
-                    widget.configure(bg=parent_bg, fg=theme["fg"])
-            else:
-                widget.configure(bg=parent_bg)
-        elif widget_class == "Entry":
-            widget.configure(
-                bg=theme["surface"],
-                fg=theme["fg"],
-                insertbackground=theme["fg"],
-                relief="flat",
-                highlightthickness=2,
-                highlightbackground=theme["border"],
-                highlightcolor=COLORS["primary"]
-            )
-        elif widget_class == "Button":
-            widget.configure(
-                bg=theme["surface"],
-                fg=theme["fg"],
-                activebackground=COLORS["primary"],
-                activeforeground="white"
-            )
-    except tk.TclError:
-        pass
-    
-    # Recursively update children
-    for child in widget.winfo_children():
-        update_widget_theme(child, theme)
+def show_theme_timing(theme_name, seconds):
+    """Timing hook: tampilkan durasi ganti tema di status card"""
+    label_status.config(text=f"🎨 Tema {theme_name} diterapkan ({seconds * 1000:.1f} ms)",
+                        fg=COLORS["secondary"])
 
 def toggle_theme():
     global current_theme
@@ -168,6 +139,14 @@ def on_mousewheel(event):
 # CUSTOM STYLED BUTTON
 # ==================================================
 class GradientButton(tk.Canvas):
+    """
+    Tombol canvas bergaya rounded (retained mode):
+    item canvas dibuat sekali, lalu hover/disabled/busy hanya mengganti
+    warna dan teks lewat itemconfig (tanpa delete/create ulang).
+    """
+    # Cache titik rounded rectangle per ukuran: (x1, y1, x2, y2, radius) -> points
+    _points_cache = {}
+
     def __init__(self, parent, text, command, colors=None, width=200, height=45):
         super().__init__(parent, width=width, height=height, 
                         highlightthickness=0, cursor="hand2")
@@ -177,6 +156,8 @@ class GradientButton(tk.Canvas):
         self.btn_width = width
         self.btn_height = height
         self.colors = colors or [COLORS["primary"], COLORS["secondary"]]
+        self.state = "normal"   # normal / disabled / busy
+        self.hover = False
         
         self.configure(bg=parent.cget('bg'))
         self.draw_button()
@@ -185,69 +166,87 @@ class GradientButton(tk.Canvas):
         self.bind("<Enter>", lambda e: self.on_hover())
         self.bind("<Leave>", lambda e: self.on_leave())
     
-    def draw_button(self, hover=False):
-        self.delete("all")
-        
-        # Draw rounded rectangle with gradient effect
+    def draw_button(self):
+        """Membuat item canvas (sekali saja saat tombol dibuat)"""
         radius = 12
-        if hover:
-            self.create_rounded_rect(0, 0, self.btn_width, self.btn_height, radius, 
-                                    fill=COLORS["primary_dark"], outline="")
-        else:
-            self.create_rounded_rect(0, 0, self.btn_width, self.btn_height, radius,
-                                    fill=self.colors[0], outline="")
-        
-        # Add inner rectangle
-        self.create_rounded_rect(2, 2, self.btn_width-2, self.btn_height-2, radius-2,
-                                fill=self.colors[0] if not hover else COLORS["primary_dark"],
-                                outline="")
+        fill = self.colors[0]
+
+        # Draw rounded rectangle + inner rectangle
+        self.outer_item = self.create_polygon(
+            self.rounded_rect_points(0, 0, self.btn_width, self.btn_height, radius),
+            smooth=True, fill=fill, outline="")
+        self.inner_item = self.create_polygon(
+            self.rounded_rect_points(2, 2, self.btn_width-2, self.btn_height-2, radius-2),
+            smooth=True, fill=fill, outline="")
         
         # Draw text
-        self.create_text(self.btn_width/2, self.btn_height/2, text=self.text,
-                        fill="white", font=("Segoe UI", 11, "bold"))
-    
-    def create_rounded_rect(self, x1, y1, x2, y2, radius, **kwargs):
-        points = [
-            x1+radius, y1,
-            x2-radius, y1,
-            x2, y1,
-            x2, y1+radius,
-            x2, y2-radius,
-            x2, y2,
-            x2-radius, y2,
-            x1+radius, y2,
-            x1, y2,
-            x1, y2-radius,
-            x1, y1+radius,
-            x1, y1,
-        ]
-        return self.create_polygon(points, smooth=True, **kwargs)
+        self.text_item = self.create_text(self.btn_width/2, self.btn_height/2, text=self.text,
+                                          fill="white", font=("Segoe UI", 11, "bold"))
+
+    @classmethod
+    def rounded_rect_points(cls, x1, y1, x2, y2, radius):
+        key = (x1, y1, x2, y2, radius)
+        points = cls._points_cache.get(key)
+        if points is None:
+            points = cls._points_cache[key] = [
+                x1+radius, y1,
+                x2-radius, y1,
+                x2, y1,
+                x2, y1+radius,
+                x2, y2-radius,
+                x2, y2,
+                x2-radius, y2,
+                x1+radius, y2,
+                x1, y2,
+                x1, y2-radius,
+                x1, y1+radius,
+                x1, y1,
+            ]
+        return points
+
+    def update_colors(self):
+        """Ganti warna sesuai state/hover dengan itemconfig saja"""
+        if self.state == "disabled":
+            fill, text_fill = COLORS["text_muted"], COLORS["light_border"]
+        elif self.state == "busy" or self.hover:
+            fill, text_fill = COLORS["primary_dark"], "white"
+        else:
+            fill, text_fill = self.colors[0], "white"
+        self.itemconfig(self.outer_item, fill=fill)
+        self.itemconfig(self.inner_item, fill=fill)
+        self.itemconfig(self.text_item, fill=text_fill)
+
+    def set_state(self, state, text=None):
+        """
+        Ubah state tombol:
+        - "normal": bisa diklik
+        - "disabled": tidak bisa diklik
+        - "busy": tidak bisa diklik, teks diganti (default "⏳ Memproses...")
+        """
+        if state == self.state and text is None:
+            return
+        self.state = state
+        if state == "busy":
+            label = text or "⏳ Memproses..."
+        else:
+            label = text or self.text
+        self.itemconfig(self.text_item, text=label)
+        self.configure(cursor="hand2" if state == "normal" else "arrow")
+        self.update_colors()
     
     def on_click(self):
-        if self.command:
+        if self.command and self.state == "normal":
             self.command()
     
     def on_hover(self):
-        self.draw_button(hover=True)
+        if not self.hover:
+            self.hover = True
+            self.update_colors()
     
     def on_leave(self):
-        self.draw_button(hover=False)
-
-# ==================================================
-# LOGGING
-# ==================================================
-def write_log(source, destination, status):
-    """
-    Fungsi untuk mencatat log traffic ke file logs.txt
-    - source: IP sumber traffic
-    - destination: IP tujuan traffic
-    - status: ALLOWED atau BLOCKED
-    """
-    # Membuat timestamp dengan format: Tahun-Bulan-Tanggal Jam:Menit:Detik
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    # Menulis log ke file dengan mode append (menambahkan di akhir file)
-    with open(LOG_FILE, "a") as file:
-        file.write(f"{timestamp} | SRC={source} -> DST={destination} | {status}\n")
+        if self.hover:
+            self.hover = False
+            self.update_colors()
 
 # ==================================================
 # SUBNET GENERATOR (Pembuat Subnet)
@@ -259,43 +258,59 @@ def generate_subnet():
     2. Guest Subnet - untuk tamu/pengunjung (dibatasi aksesnya)
     
     Konsep: Network Segmentation untuk keamanan SOHO (Small Office Home Office)
+
+    Jika kolom "Kebutuhan Host" diisi (contoh: internal=100, guest=20),
+    network dibagi dengan VLSM sesuai jumlah host tiap segmen.
     """
-    global internal_subnet, guest_subnet
     try:
         # Ambil input IP dan Subnet Mask dari user
         ip_input = entry_ip.get()
         mask_input = combo_mask.get()
+        vlsm_input = entry_vlsm.get().strip()
         
         # Gabungkan menjadi format CIDR (contoh: 192.168.1.0/24)
         network_input = f"{ip_input}/{mask_input}"
-        
-        # Konversi string menjadi objek ip_network
-        # strict=False: mengizinkan host bits (misal 192.168.1.5/24)
-        network = ipaddress.ip_network(network_input, strict=False)
-
-        # SUBNETTING: Membagi network menjadi 2 subnet yang lebih kecil
-        # Contoh: /24 dibagi menjadi 2 subnet /25
-        # new_prefix = network.prefixlen + 1
-        subnets = list(network.subnets(new_prefix=network.prefixlen + 1))
-        internal_subnet, guest_subnet = subnets  # Subnet pertama = internal, kedua = guest
 
-        # Mendapatkan daftar host yang bisa dipakai di setiap subnet
-        i_hosts = list(internal_subnet.hosts())  # Host internal (tanpa network & broadcast)
-        g_hosts = list(guest_subnet.hosts())     # Host guest
+        if vlsm_input:
+            # VLSM: setiap segmen mendapat subnet seukuran kebutuhannya
+            try:
+                plan = engine.plan_segments(network_input, parse_requirements(vlsm_input))
+            except ValueError as error:
+                messagebox.showerror("Error", f"VLSM gagal: {error}")
+                return
+            i_summary = summarize_subnet(engine.internal_subnet) if engine.internal_subnet else None
+            g_summary = summarize_subnet(engine.guest_subnet) if engine.guest_subnet else None
+            status_text = (f"✨ VLSM: {len(plan.allocations)} segmen, "
+                           f"utilisasi {plan.utilization:.1%}")
+        else:
+            # SUBNETTING: Membagi network menjadi 2 subnet yang lebih kecil
+            # Contoh: /24 dibagi menjadi 2 subnet /25
+            # Subnet pertama = internal, kedua = guest (host bits diizinkan, misal 192.168.1.5/24)
+            # Ringkasan host dihitung dengan aritmatika integer (tanpa list(hosts()))
+            i_summary, g_summary = engine.generate_subnet(network_input)
+            status_text = "✨ Subnet berhasil dibuat!"
 
         # Update tampilan GUI untuk Internal Subnet
-        label_internal_net.config(text=f"{internal_subnet.network_address}")
-        label_internal_broadcast.config(text=f"{internal_subnet.broadcast_address}")
-        label_internal_range.config(text=f"{i_hosts[0]} - {i_hosts[-1]}")
+        label_internal_net.config(text=f"{i_summary.network_address}" if i_summary else "-")
+        label_internal_broadcast.config(text=f"{i_summary.broadcast_address}" if i_summary else "-")
+        label_internal_range.config(text=format_host_range(i_summary) if i_summary else "-")
 
         # Update tampilan GUI untuk Guest Subnet
-        label_guest_net.config(text=f"{guest_subnet.network_address}")
-        label_guest_broadcast.config(text=f"{guest_subnet.broadcast_address}")
-        label_guest_range.config(text=f"{g_hosts[0]} - {g_hosts[-1]}")
+        label_guest_net.config(text=f"{g_summary.network_address}" if g_summary else "-")
+        label_guest_broadcast.config(text=f"{g_summary.broadcast_address}" if g_summary else "-")
+        label_guest_range.config(text=format_host_range(g_summary) if g_summary else "-")
+
+        if engine.policy_version:
+            status_text += f" (policy {engine.policy_version[:8]})"
+        if engine.snapshot_error is not None:
+            # Subnet tetap berlaku di GUI; hanya proses lain yang belum mendapat policy baru
+            label_status.config(text=f"{status_text} ⚠️ snapshot policy gagal ditulis",
+                                fg=COLORS["warning"])
+            messagebox.showwarning("Warning", f"Snapshot policy gagal ditulis:\n{engine.snapshot_error}")
+            return
+        label_status.config(text=status_text, fg=COLORS["success"])
 
-        label_status.config(text="✨ Subnet berhasil dibuat!", fg=COLORS["success"])
-
-    except Exception:
+    except ValueError:
         messagebox.showerror("Error", "Format IP Network tidak valid!")
 
 # ==================================================
@@ -305,41 +320,147 @@ def simulate_traffic():
     """
     Fungsi INTI untuk simulasi firewall/traffic filtering
     
-    ATURAN KEAMANAN (Firewall Rule):
+    ATURAN KEAMANAN (Firewall Rule) bawaan:
     - Guest TIDAK BOLEH mengakses Internal (BLOCKED)
     - Internal boleh mengakses Guest (ALLOWED)
     - Internal ke Internal (ALLOWED)
     - Guest ke Guest (ALLOWED)
+
+    Aturan dievaluasi oleh policy aktif di engine (lihat soho_core.policy), sehingga
+    policy dengan banyak segmen dari file JSON juga bisa dipakai.
     
     Ini adalah implementasi sederhana dari Network Access Control (NAC)
     """
-    # Validasi: Pastikan subnet sudah dibuat terlebih dahulu
-    if internal_subnet is None or guest_subnet is None:
+    # Validasi: Pastikan subnet/policy sudah dibuat terlebih dahulu
+    if engine.policy is None:
         messagebox.showwarning("Warning", "Subnet belum dibuat!")
         return
 
     try:
-        # Konversi input string menjadi objek IP address
-        src_ip = ipaddress.ip_address(entry_source.get())       # IP sumber
-        dst_ip = ipaddress.ip_address(entry_destination.get())  # IP tujuan
-
         # ============================================
         # LOGIKA FIREWALL RULE:
-        # Jika source IP ada di Guest subnet DAN 
-        # destination IP ada di Internal subnet -> BLOKIR!
+        # Cari segmen source & destination, lalu ambil
+        # keputusan dari matriks aturan policy.
+        # Default: Guest -> Internal = BLOKIR!
+        # Keputusan langsung dicatat ke logs.txt oleh engine.
         # ============================================
-        if src_ip in guest_subnet and dst_ip in internal_subnet:
-            # Traffic dari Guest ke Internal = DIBLOKIR (keamanan!)
-            label_status.config(text="🚫 BLOCKED - Guest ke Internal", fg=COLORS["danger"])
-            write_log(src_ip, dst_ip, "BLOCKED")
+        decision = engine.evaluate(entry_source.get(), entry_destination.get())
+        if decision.action == BLOCKED:
+            # Traffic yang dilarang policy = DIBLOKIR (keamanan!)
+            src_name = (decision.src_segment or "luar").title()
+            dst_name = (decision.dst_segment or "luar").title()
+            label_status.config(text=f"🚫 BLOCKED - {src_name} ke {dst_name}", fg=COLORS["danger"])
         else:
             # Semua traffic lainnya = DIIZINKAN
             label_status.config(text="✅ ALLOWED - Traffic diizinkan", fg=COLORS["success"])
-            write_log(src_ip, dst_ip, "ALLOWED")
 
     except ValueError:
         # Error handling jika format IP tidak valid
         messagebox.showerror("Error", "IP Source atau Destination tidak valid!")
+    except OSError as error:
+        # Log gagal ditulis (misalnya disk penuh)
+        messagebox.showerror("Error", f"Gagal menulis log: {error}")
+
+def load_policy_file():
+    """
+    Memuat policy multi-segmen dari file JSON (lihat soho_core.policy.policy_from_dict)
+    dan menjadikannya policy aktif untuk simulate_traffic.
+    """
+    path = filedialog.askopenfilename(
+        title="Pilih file policy (JSON)",
+        filetypes=[("JSON", "*.json"), ("All files", "*.*")]
+    )
+    if not path:
+        return
+
+    try:
+        policy = engine.load_policy(path)
+    except (OSError, ValueError, KeyError, TypeError):
+        messagebox.showerror("Error", "File policy tidak valid!")
+        return
+
+    label_status.config(
+        text=f"📜 Policy dimuat: {len(policy.segments)} segmen, {len(policy.rules)} aturan",
+        fg=COLORS["secondary"]
+    )
+    if engine.snapshot_error is not None:
+        messagebox.showwarning("Warning", f"Snapshot policy gagal ditulis:\n{engine.snapshot_error}")
+
+def check_inventory_file():
+    """
+    Cek subnet yang sudah dibuat terhadap inventaris CIDR yang sudah ada
+    (file teks, satu CIDR per baris): overlap, containment dan gap.
+    Hasil ditampilkan di status card (lihat soho_core.inventory).
+    """
+    if engine.policy is None:
+        messagebox.showwarning("Warning", "Subnet belum dibuat!")
+        return
+
+    path = filedialog.askopenfilename(
+        title="Pilih file inventaris CIDR",
+        filetypes=[("Text", "*.txt"), ("CSV", "*.csv"), ("All files", "*.*")]
+    )
+    if not path:
+        return
+
+    try:
+        report = engine.check_inventory(path)
+    except (OSError, ValueError, RuntimeError) as error:
+        messagebox.showerror("Error", f"File inventaris tidak valid!\n{error}")
+        return
+
+    if report.conflicts:
+        first = report.conflicts[0]
+        label_status.config(
+            text=(f"⚠️ {len(report.conflicts)} konflik dengan inventaris "
+                  f"({first.segment.name} {first.kind} {first.existing.name})"),
+            fg=COLORS["danger"]
+        )
+        return
+    label_status.config(
+        text=(f"✅ Tidak ada konflik dengan {report.prefixes:,} prefix "
+              f"({report.gap_count:,} gap, {report.elapsed * 1000:.0f} ms)"),
+        fg=COLORS["success"]
+    )
+
+def simulate_flow_file():
+    """
+    Batch mode: evaluasi seluruh file flow (CSV src,dst) dengan aturan yang
+    sama seperti simulate_traffic, lalu tampilkan jumlah ALLOWED/BLOCKED
+    dan throughput (baris per detik).
+
+    Evaluasi berjalan di background job (GUI tetap responsif, bisa dibatalkan).
+    """
+    if engine.internal_subnet is None or engine.guest_subnet is None:
+        messagebox.showwarning("Warning", "Subnet belum dibuat!")
+        return
+    if job_runner.is_running("batch"):
+        label_status.config(text="⏳ Batch flow masih berjalan...", fg=COLORS["warning"])
+        return
+
+    from soho_core.flows import evaluate_flow_file  # Import saat batch mode dipakai
+
+    path = filedialog.askopenfilename(
+        title="Pilih file flow (CSV src,dst)",
+        filetypes=[("CSV", "*.csv"), ("Text", "*.txt"), ("All files", "*.*")]
+    )
+    if not path:
+        return
+
+    internal, guest = engine.internal_subnet, engine.guest_subnet
+
+    def work(job):
+        return evaluate_flow_file(path, internal, guest,
+                                  progress=lambda fraction: job.report(fraction, "Batch flow"))
+
+    def done(job, result):
+        label_status.config(
+            text=(f"📊 {result['allowed']:,} ALLOWED / {result['blocked']:,} BLOCKED "
+                  f"({result['rows_per_sec']:,.0f} baris/detik)"),
+            fg=COLORS["secondary"]
+        )
+
+    run_job("batch", work, done, batch_btn, "File flow tidak bisa dibaca!")
 
 # ==================================================
 # PDF REPORT GENERATOR (Pembuat Laporan PDF)
@@ -348,45 +469,168 @@ def generate_pdf_report():
     """
     Fungsi untuk membuat laporan PDF yang berisi:
     - Informasi subnet yang sudah dibuat
+    - Ringkasan total traffic per status (ALLOWED/BLOCKED)
     - Log traffic terakhir (12 entri terbaru)
+    - Seluruh riwayat traffic, dibagi ke beberapa halaman
     
-    Menggunakan library ReportLab untuk generate PDF
+    Menggunakan library ReportLab (lihat soho_core.report). Laporan dibuat di
+    background job dengan progress per halaman. Jika subnet dan log tidak
+    berubah, laporan yang ada langsung dipakai; laporan lama diarsipkan
+    dengan timestamp (lihat soho_core.reportcache).
     """
     # Validasi: Pastikan ada data subnet
-    if internal_subnet is None:
+    if engine.internal_subnet is None:
         messagebox.showwarning("Warning", "Tidak ada data subnet untuk dilaporkan!")
         return
+    if job_runner.is_running("report"):
+        label_status.config(text="⏳ Laporan PDF masih dibuat...", fg=COLORS["warning"])
+        return
+
+    from soho_core.reportcache import ReportCache  # ReportLab di-import saat dibutuhkan
+
+    internal, guest = engine.internal_subnet, engine.guest_subnet
+
+    def work(job):
+        # Pastikan semua log di antrian sudah tertulis sebelum dibaca
+        engine.flush()
+        # Perbarui statistik, lalu baca log langsung dari disk halaman demi halaman (streaming)
+        analytics.refresh(progress=lambda fraction: job.report(fraction, "Analytics"))
+        return ReportCache(REPORT_FILE).build(
+            LOG_FILE, internal, guest, analytics=analytics,
+            progress=lambda fraction: job.report(fraction, "Laporan PDF"))
+
+    def done(job, result):
+        update_analytics_view()
+        if result["cached"]:
+            label_status.config(
+                text=f"📄 Laporan sudah terbaru: {result['pages']} halaman, {result['records']:,} log",
+                fg=COLORS["success"]
+            )
+            messagebox.showinfo("Success", "Tidak ada perubahan, laporan PDF yang ada sudah terbaru!")
+            return
+        label_status.config(
+            text=f"📄 Laporan: {result['pages']} halaman, {result['records']:,} log ({result['pages_per_sec']:,.0f} halaman/detik)",
+            fg=COLORS["success"]
+        )
+        if result["volumes"]:
+            messagebox.showinfo("Success", f"Laporan PDF berhasil dibuat! Riwayat dilanjutkan di "
+                                           f"{len(result['volumes'])} file volume (*_vol002.pdf, ...)")
+            return
+        messagebox.showinfo("Success", "Laporan PDF berhasil dibuat!")
+
+    run_job("report", work, done, report_btn, "Laporan PDF gagal dibuat!")
+
+# ==================================================
+# BACKGROUND JOBS (Progress & Cancel)
+# ==================================================
+def run_job(kind, work, on_done, button, error_message):
+    """
+    Jalankan work(job) di background lewat job_runner.
+    Tombol pemicu (GradientButton atau tk.Button) menjadi "busy"/disabled dan
+    progress bar + tombol cancel muncul di status card sampai job selesai.
+    """
+    def set_busy(busy):
+        if isinstance(button, GradientButton):
+            button.set_state("busy" if busy else "normal")
+        else:
+            button.config(state="disabled" if busy else "normal")
+
+    def finish(job):
+        set_busy(False)
+        if not job_runner.active_kinds:
+            progress_frame.pack_forget()
+
+    def done(job, result):
+        finish(job)
+        on_done(job, result)
+
+    def failed(job, error):
+        finish(job)
+        label_status.config(text=f"❌ {error_message}", fg=COLORS["danger"])
+        messagebox.showerror("Error", f"{error_message}\n{error}")
+
+    def cancelled(job):
+        finish(job)
+        label_status.config(text="⛔ Proses dibatalkan", fg=COLORS["warning"])
 
-    # Membuat canvas PDF dengan ukuran A4
-    c = canvas.Canvas(REPORT_FILE, pagesize=A4)
-    width, height = A4  # Mendapatkan dimensi halaman A4
+    job = job_runner.submit(kind, work, on_done=done, on_error=failed,
+                            on_progress=show_job_progress, on_cancel=cancelled)
+    if job is None:
+        return
+    set_busy(True)
+    progress_bar["value"] = 0
+    progress_frame.pack(fill="x", pady=(10, 0))
+    label_status.config(text="⏳ Memproses...", fg=COLORS["secondary"])
 
-    # Menulis judul laporan (font bold, ukuran 16)
-    c.setFont("Helvetica-Bold", 16)
-    c.drawString(50, height - 50, "SOHO Guard - Network Security Report")
+def show_job_progress(job, fraction, message=None):
+    """Update progress bar dan status dari event progress job"""
+    progress_bar["value"] = fraction * 100
+    label_status.config(text=f"⏳ {message or job.kind}: {fraction:.0%}", fg=COLORS["secondary"])
 
-    # Menulis informasi subnet (font normal, ukuran 10)
-    c.setFont("Helvetica", 10)
-    y = height - 100  # Posisi Y untuk mulai menulis
+def cancel_jobs():
+    """Batalkan semua job yang sedang berjalan"""
+    job_runner.cancel()
 
-    c.drawString(50, y, f"Internal Subnet : {internal_subnet}")
-    y -= 15
-    c.drawString(50, y, f"Guest Subnet    : {guest_subnet}")
+# ==================================================
+# TRAFFIC ANALYTICS VIEW
+# ==================================================
+def update_analytics_view():
+    """Tampilkan statistik dari objek analytics ke label di Analytics card"""
+    label_analytics_total.config(
+        text=f"{analytics.total:,} log ({analytics.blocked_ratio:.1%} blocked)"
+    )
+    top_sources = analytics.top_blocked_sources(3)
+    label_analytics_sources.config(
+        text=", ".join(f"{src} ({count:,})" for src, count in top_sources) or "-"
+    )
+    top_destinations = analytics.top_destinations(3)
+    label_analytics_destinations.config(
+        text=", ".join(f"{dst} ({count:,})" for dst, count in top_destinations) or "-"
+    )
+
+def refresh_analytics():
+    """
+    Proses log baru sejak refresh terakhir (inkremental) di background job,
+    lalu update tampilan. Refresh pertama pada log besar tanpa checkpoint
+    bisa lama, jadi tidak dijalankan di thread Tk.
+    """
+    def work(job):
+        engine.flush()
+        return analytics.refresh(progress=lambda fraction: job.report(fraction, "Analytics"))
 
-    # Menulis log traffic
-    y -= 30
-    c.drawString(50, y, "Traffic Logs:")
-    y -= 20
+    def done(job, added):
+        update_analytics_view()
+        label_status.config(text=f"📈 Analytics diperbarui: {added:,} log baru", fg=COLORS["secondary"])
 
-    # Membaca file log dan menampilkan 12 baris terakhir
-    with open(LOG_FILE, "r") as file:
-        for line in file.readlines()[-12:]:  # Ambil 12 log terakhir
-            c.drawString(60, y, line[:95])    # Batasi 95 karakter per baris
-            y -= 15  # Geser posisi ke bawah
+    run_job("analytics", work, done, analytics_btn, "Analytics gagal diperbarui!")
 
-    # Simpan file PDF
-    c.save()
-    messagebox.showinfo("Success", "Laporan PDF berhasil dibuat!")
+# ==================================================
+# LIVE METRICS READOUT
+# ==================================================
+def format_latency(seconds):
+    """Latensi dalam satuan yang mudah dibaca (µs/ms/s)"""
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.0f} µs"
+    if seconds < 1:
+        return f"{seconds * 1e3:.1f} ms"
+    return f"{seconds:.2f} s"
+
+def refresh_metrics_view():
+    """Update ringkasan metrics di status card (dan file ekspor jika diatur)"""
+    snapshot = metrics.snapshot()
+    histograms = snapshot["histograms"]
+    parts = []
+    for name, title in (("soho_decision_seconds", "Keputusan"),
+                        ("soho_log_write_seconds", "Log"),
+                        ("soho_subnet_generation_seconds", "Subnet"),
+                        ("soho_report_build_seconds", "PDF")):
+        if name in histograms:
+            count, _, p50, p95 = histograms[name]
+            parts.append(f"{title} {count:,}× p50≤{format_latency(p50)} p95≤{format_latency(p95)}")
+    label_metrics.config(text="⏱ " + " | ".join(parts) if parts else "⏱ Belum ada metrics")
+    if METRICS_FILE:
+        metrics.write_prometheus_file(METRICS_FILE)
+    root.after(METRICS_REFRESH_MS, refresh_metrics_view)
 
 # ==================================================
 # GUI SETUP - RESPONSIVE
@@ -397,6 +641,9 @@ root.geometry("900x780")
 root.minsize(360, 600)  # Minimum size updated for mobile
 root.configure(bg=COLORS["dark_bg"])
 
+# Job runner: pekerjaan berat berjalan di thread worker, hasilnya dibaca dengan root.after
+job_runner = JobRunner(root)
+
 # Configure grid weights for responsiveness
 root.grid_rowconfigure(0, weight=1)
 root.grid_columnconfigure(0, weight=1)
@@ -405,12 +652,14 @@ root.grid_columnconfigure(0, weight=1)
 # MAIN SCROLLABLE CONTAINER
 # ==================================================
 main_container = tk.Frame(root, bg=COLORS["dark_bg"])
+theme_registry.register(main_container, "root")
 main_container.grid(row=0, column=0, sticky="nsew")
 main_container.grid_rowconfigure(0, weight=1)
 main_container.grid_columnconfigure(0, weight=1)
 
 # Canvas for scrolling
 canvas_widget = tk.Canvas(main_container, bg=COLORS["dark_bg"], highlightthickness=0)
+theme_registry.register(canvas_widget, "root")
 canvas_widget.grid(row=0, column=0, sticky="nsew")
 
 # Scrollbar
@@ -420,6 +669,7 @@ canvas_widget.configure(yscrollcommand=scrollbar.set)
 
 # Scrollable frame inside canvas
 scrollable_frame = tk.Frame(canvas_widget, bg=COLORS["dark_bg"])
+theme_registry.register(scrollable_frame, "root")
 canvas_window = canvas_widget.create_window((0, 0), window=scrollable_frame, anchor="nw")
 
 # Bind scroll events
@@ -431,6 +681,7 @@ root.bind_all("<MouseWheel>", on_mousewheel)
 # HEADER SECTION
 # ==================================================
 header_frame = tk.Frame(scrollable_frame, bg=COLORS["dark_bg"])
+theme_registry.register(header_frame, "root")
 header_frame.pack(pady=20, fill="x", padx=20)
 
 # Logo/Title
@@ -441,6 +692,7 @@ title_label = tk.Label(
     fg=COLORS["primary"],
     bg=COLORS["dark_bg"]
 )
+theme_registry.register(title_label, "accent")
 title_label.pack()
 
 # Try to load logo image
@@ -461,7 +713,7 @@ subtitle_label = tk.Label(
     fg=COLORS["text_muted"],
     bg=COLORS["dark_bg"]
 )
-subtitle_label.is_muted = True
+theme_registry.register(subtitle_label, "muted")
 subtitle_label.pack(pady=(5, 0))
 
 # Theme toggle button
@@ -479,6 +731,7 @@ theme_btn = tk.Button(
     activebackground=COLORS["primary"],
     activeforeground="white"
 )
+theme_registry.register(theme_btn, "button")
 theme_btn.pack(pady=10)
 
 # ==================================================
@@ -486,7 +739,7 @@ theme_btn.pack(pady=10)
 # ==================================================
 input_card = tk.Frame(scrollable_frame, bg=COLORS["dark_card"], padx=25, pady=20)
 input_card.pack(pady=10, padx=20, fill="x")
-input_card.is_card = True
+theme_registry.register(input_card, "card")
 
 input_title = tk.Label(
     input_card,
@@ -495,6 +748,7 @@ input_title = tk.Label(
     fg=COLORS["secondary"],
     bg=COLORS["dark_card"]
 )
+theme_registry.register(input_title, "card_accent")
 input_title.pack(anchor="w")
 
 input_subtitle = tk.Label(
@@ -504,10 +758,11 @@ input_subtitle = tk.Label(
     fg=COLORS["text_muted"],
     bg=COLORS["dark_card"]
 )
-input_subtitle.is_muted = True
+theme_registry.register(input_subtitle, "card_muted")
 input_subtitle.pack(anchor="w", pady=(10, 5))
 
 input_fields_frame = tk.Frame(input_card, bg=COLORS["dark_card"])
+theme_registry.register(input_fields_frame, "card")
 input_fields_frame.pack(anchor="w", fill="x", pady=(0, 5))
 
 # Configure grid weights
@@ -516,15 +771,16 @@ input_fields_frame.grid_columnconfigure(1, weight=3)
 
 # IP Address Input
 ip_frame = tk.Frame(input_fields_frame, bg=COLORS["dark_card"])
+theme_registry.register(ip_frame, "card")
 ip_frame.grid(row=0, column=0, sticky="ew", padx=(0, 10))
 
-tk.Label(
+theme_registry.register(tk.Label(
     ip_frame,
     text="IP Address",
     font=("Segoe UI", 10),
     fg=COLORS["text_muted"],
     bg=COLORS["dark_card"]
-).pack(anchor="w")
+), "card_muted").pack(anchor="w")
 
 entry_ip = tk.Entry(
     ip_frame,
@@ -537,23 +793,28 @@ entry_ip = tk.Entry(
     highlightbackground=COLORS["dark_border"],
     highlightcolor=COLORS["primary"]
 )
+theme_registry.register(entry_ip, "entry")
 entry_ip.pack(anchor="w", fill="x", ipady=8)
 
 # Subnet Mask Input (Combobox)
 mask_frame = tk.Frame(input_fields_frame, bg=COLORS["dark_card"])
+theme_registry.register(mask_frame, "card")
 mask_frame.grid(row=0, column=1, sticky="ew", padx=(10, 0))
 
-tk.Label(
+theme_registry.register(tk.Label(
     mask_frame,
     text="Subnet Mask",
     font=("Segoe UI", 10),
     fg=COLORS["text_muted"],
     bg=COLORS["dark_card"]
-).pack(anchor="w")
+), "card_muted").pack(anchor="w")
+
+IPV4_MASKS = [str(i) for i in range(8, 31)]    # CIDR /8 to /30
+IPV6_MASKS = [str(i) for i in range(16, 128)]  # CIDR /16 to /127
 
 combo_mask = ttk.Combobox(
     mask_frame,
-    values=[str(i) for i in range(8, 31)], # CIDR /8 to /30
+    values=IPV4_MASKS,
     font=("Consolas", 12),
     state="readonly",
     width=5
@@ -561,6 +822,16 @@ combo_mask = ttk.Combobox(
 combo_mask.set("24") # Default to /24
 combo_mask.pack(anchor="w", fill="x", ipady=8)
 
+def update_mask_choices(event=None):
+    """Ganti pilihan prefix sesuai versi IP yang diketik (IPv4 atau IPv6)"""
+    masks = IPV6_MASKS if ":" in entry_ip.get() else IPV4_MASKS
+    if list(combo_mask.cget("values")) != masks:
+        combo_mask.configure(values=masks)
+        combo_mask.set("64" if masks is IPV6_MASKS else "24")
+
+entry_ip.bind("<KeyRelease>", update_mask_choices)
+entry_ip.bind("<FocusOut>", update_mask_choices)
+
 # Style for Combobox (needs some wrestling with ttk styles)
 style = ttk.Style()
 style.theme_use('default')
@@ -570,9 +841,38 @@ style.map('TCombobox', fieldbackground=[('readonly', COLORS["dark_surface"])],
                       background=[('readonly', COLORS["dark_surface"])],
                       foreground=[('readonly', COLORS["text_light"])])
 
+# VLSM Requirements Input (opsional)
+vlsm_frame = tk.Frame(input_card, bg=COLORS["dark_card"])
+theme_registry.register(vlsm_frame, "card")
+vlsm_frame.pack(anchor="w", fill="x", pady=(10, 0))
+
+vlsm_label = tk.Label(
+    vlsm_frame,
+    text="Kebutuhan Host (opsional, VLSM) - contoh: internal=100, guest=20",
+    font=("Segoe UI", 10),
+    fg=COLORS["text_muted"],
+    bg=COLORS["dark_card"]
+)
+theme_registry.register(vlsm_label, "card_muted")
+vlsm_label.pack(anchor="w")
+
+entry_vlsm = tk.Entry(
+    vlsm_frame,
+    font=("Consolas", 12),
+    bg=COLORS["dark_surface"],
+    fg=COLORS["text_light"],
+    insertbackground=COLORS["text_light"],
+    relief="flat",
+    highlightthickness=2,
+    highlightbackground=COLORS["dark_border"],
+    highlightcolor=COLORS["primary"]
+)
+theme_registry.register(entry_vlsm, "entry")
+entry_vlsm.pack(anchor="w", fill="x", ipady=8)
 
 # Generate Button
 generate_btn_frame = tk.Frame(input_card, bg=COLORS["dark_card"])
+theme_registry.register(generate_btn_frame, "card")
 generate_btn_frame.pack(anchor="w", pady=(15, 0))
 
 generate_btn = GradientButton(
@@ -583,12 +883,14 @@ generate_btn = GradientButton(
     width=180,
     height=42
 )
+theme_registry.register(generate_btn, "card")
 generate_btn.pack()
 
 # ==================================================
 # SUBNET DISPLAY CARDS - RESPONSIVE GRID
 # ==================================================
 subnet_container = tk.Frame(scrollable_frame, bg=COLORS["dark_bg"])
+theme_registry.register(subnet_container, "root")
 subnet_container.pack(pady=15, padx=20, fill="x")
 
 # Configure column weights for responsiveness
@@ -603,7 +905,7 @@ internal_card = tk.Frame(
     pady=15
 )
 internal_card.grid(row=0, column=0, sticky="nsew", padx=(0, 8), pady=5)
-internal_card.is_card = True
+theme_registry.register(internal_card, "card")
 
 internal_title = tk.Label(
     internal_card,
@@ -612,19 +914,22 @@ internal_title = tk.Label(
     fg=COLORS["success"],
     bg=COLORS["dark_card"]
 )
+theme_registry.register(internal_title, "card_accent")
 internal_title.pack(anchor="w")
 
-tk.Frame(internal_card, bg=COLORS["dark_border"], height=1).pack(fill="x", pady=10)
+theme_registry.register(tk.Frame(internal_card, bg=COLORS["dark_border"], height=1), "divider").pack(fill="x", pady=10)
 
 # Internal subnet details
 for row_data in [("Network", "label_internal_net"), ("Broadcast", "label_internal_broadcast"), ("Host Range", "label_internal_range")]:
     row = tk.Frame(internal_card, bg=COLORS["dark_card"])
     row.pack(fill="x", pady=2)
+    theme_registry.register(row, "card")
     lbl_title = tk.Label(row, text=f"{row_data[0]}:", font=("Segoe UI", 9), fg=COLORS["text_muted"], bg=COLORS["dark_card"], width=12, anchor="w")
-    lbl_title.is_muted = True
+    theme_registry.register(lbl_title, "card_muted")
     lbl_title.pack(side="left")
     lbl = tk.Label(row, text="-", font=("Consolas", 10), fg=COLORS["text_light"], bg=COLORS["dark_card"])
     lbl.pack(side="left", fill="x", expand=True)
+    theme_registry.register(lbl, "card_label")
     globals()[row_data[1]] = lbl
 
 # Guest Subnet Card
@@ -635,7 +940,7 @@ guest_card = tk.Frame(
     pady=15
 )
 guest_card.grid(row=0, column=1, sticky="nsew", padx=(8, 0), pady=5)
-guest_card.is_card = True
+theme_registry.register(guest_card, "card")
 
 guest_title = tk.Label(
     guest_card,
@@ -644,19 +949,22 @@ guest_title = tk.Label(
     fg=COLORS["warning"],
     bg=COLORS["dark_card"]
 )
+theme_registry.register(guest_title, "card_accent")
 guest_title.pack(anchor="w")
 
-tk.Frame(guest_card, bg=COLORS["dark_border"], height=1).pack(fill="x", pady=10)
+theme_registry.register(tk.Frame(guest_card, bg=COLORS["dark_border"], height=1), "divider").pack(fill="x", pady=10)
 
 # Guest subnet details
 for row_data in [("Network", "label_guest_net"), ("Broadcast", "label_guest_broadcast"), ("Host Range", "label_guest_range")]:
     row = tk.Frame(guest_card, bg=COLORS["dark_card"])
     row.pack(fill="x", pady=2)
+    theme_registry.register(row, "card")
     lbl_title = tk.Label(row, text=f"{row_data[0]}:", font=("Segoe UI", 9), fg=COLORS["text_muted"], bg=COLORS["dark_card"], width=12, anchor="w")
-    lbl_title.is_muted = True
+    theme_registry.register(lbl_title, "card_muted")
     lbl_title.pack(side="left")
     lbl = tk.Label(row, text="-", font=("Consolas", 10), fg=COLORS["text_light"], bg=COLORS["dark_card"])
     lbl.pack(side="left", fill="x", expand=True)
+    theme_registry.register(lbl, "card_label")
     globals()[row_data[1]] = lbl
 
 # ==================================================
@@ -664,7 +972,7 @@ for row_data in [("Network", "label_guest_net"), ("Broadcast", "label_guest_broa
 # ==================================================
 traffic_card = tk.Frame(scrollable_frame, bg=COLORS["dark_card"], padx=25, pady=20)
 traffic_card.pack(pady=10, padx=20, fill="x")
-traffic_card.is_card = True
+theme_registry.register(traffic_card, "card")
 
 traffic_title = tk.Label(
     traffic_card,
@@ -673,10 +981,12 @@ traffic_title = tk.Label(
     fg=COLORS["accent"],
     bg=COLORS["dark_card"]
 )
+theme_registry.register(traffic_title, "card_accent")
 traffic_title.pack(anchor="w")
 
 # Input fields container - responsive
 input_fields = tk.Frame(traffic_card, bg=COLORS["dark_card"])
+theme_registry.register(input_fields, "card")
 input_fields.pack(fill="x", pady=(15, 0))
 
 # Configure columns for responsiveness
@@ -685,6 +995,7 @@ input_fields.grid_columnconfigure(1, weight=1)
 
 # Source IP
 src_container = tk.Frame(input_fields, bg=COLORS["dark_card"])
+theme_registry.register(src_container, "card")
 src_container.grid(row=0, column=0, sticky="ew", padx=(0, 10))
 
 src_label = tk.Label(
@@ -694,7 +1005,7 @@ src_label = tk.Label(
     fg=COLORS["text_muted"],
     bg=COLORS["dark_card"]
 )
-src_label.is_muted = True
+theme_registry.register(src_label, "card_muted")
 src_label.pack(anchor="w")
 
 entry_source = tk.Entry(
@@ -708,10 +1019,12 @@ entry_source = tk.Entry(
     highlightbackground=COLORS["dark_border"],
     highlightcolor=COLORS["primary"]
 )
+theme_registry.register(entry_source, "entry")
 entry_source.pack(anchor="w", ipady=6, fill="x")
 
 # Destination IP
 dst_container = tk.Frame(input_fields, bg=COLORS["dark_card"])
+theme_registry.register(dst_container, "card")
 dst_container.grid(row=0, column=1, sticky="ew", padx=(10, 0))
 
 dst_label = tk.Label(
@@ -721,7 +1034,7 @@ dst_label = tk.Label(
     fg=COLORS["text_muted"],
     bg=COLORS["dark_card"]
 )
-dst_label.is_muted = True
+theme_registry.register(dst_label, "card_muted")
 dst_label.pack(anchor="w")
 
 entry_destination = tk.Entry(
@@ -735,10 +1048,12 @@ entry_destination = tk.Entry(
     highlightbackground=COLORS["dark_border"],
     highlightcolor=COLORS["primary"]
 )
+theme_registry.register(entry_destination, "entry")
 entry_destination.pack(anchor="w", ipady=6, fill="x")
 
 # Simulate Button
 simulate_btn_frame = tk.Frame(traffic_card, bg=COLORS["dark_card"])
+theme_registry.register(simulate_btn_frame, "card")
 simulate_btn_frame.pack(anchor="w", pady=(15, 0))
 
 simulate_btn = GradientButton(
@@ -749,16 +1064,64 @@ simulate_btn = GradientButton(
     width=180,
     height=42
 )
-simulate_btn.pack()
+theme_registry.register(simulate_btn, "card")
+simulate_btn.pack(side="left")
+
+batch_btn = GradientButton(
+    simulate_btn_frame,
+    text="📂 Batch Flow File",
+    command=simulate_flow_file,
+    colors=[COLORS["primary"], COLORS["accent"]],
+    width=180,
+    height=42
+)
+theme_registry.register(batch_btn, "card")
+batch_btn.pack(side="left", padx=(10, 0))
+
+policy_btn = tk.Button(
+    traffic_card,
+    text="📜 Load Policy (JSON)",
+    command=load_policy_file,
+    font=("Segoe UI", 10),
+    bg=COLORS["dark_surface"],
+    fg=COLORS["text_light"],
+    relief="flat",
+    padx=15,
+    pady=5,
+    cursor="hand2",
+    activebackground=COLORS["primary"],
+    activeforeground="white"
+)
+theme_registry.register(policy_btn, "button")
+policy_btn.pack(anchor="w", pady=(10, 0))
+
+inventory_btn = tk.Button(
+    traffic_card,
+    text="📋 Check Inventory",
+    command=check_inventory_file,
+    font=("Segoe UI", 10),
+    bg=COLORS["dark_surface"],
+    fg=COLORS["text_light"],
+    relief="flat",
+    padx=15,
+    pady=5,
+    cursor="hand2",
+    activebackground=COLORS["primary"],
+    activeforeground="white"
+)
+theme_registry.register(inventory_btn, "button")
+inventory_btn.pack(anchor="w", pady=(6, 0))
 
 # ==================================================
 # BOTTOM SECTION - REPORT & STATUS
 # ==================================================
 bottom_frame = tk.Frame(scrollable_frame, bg=COLORS["dark_bg"])
+theme_registry.register(bottom_frame, "root")
 bottom_frame.pack(pady=15, padx=20, fill="x")
 
 # PDF Report Button - centered
 report_btn_frame = tk.Frame(bottom_frame, bg=COLORS["dark_bg"])
+theme_registry.register(report_btn_frame, "root")
 report_btn_frame.pack()
 
 report_btn = GradientButton(
@@ -769,12 +1132,91 @@ report_btn = GradientButton(
     width=220,
     height=45
 )
+theme_registry.register(report_btn, "root")
 report_btn.pack()
 
+# ==================================================
+# TRAFFIC ANALYTICS CARD
+# ==================================================
+analytics_card = tk.Frame(scrollable_frame, bg=COLORS["dark_card"], padx=25, pady=20)
+analytics_card.pack(pady=10, padx=20, fill="x")
+theme_registry.register(analytics_card, "card")
+
+analytics_title = tk.Label(
+    analytics_card,
+    text="📈 Traffic Analytics",
+    font=("Segoe UI", 14, "bold"),
+    fg=COLORS["secondary"],
+    bg=COLORS["dark_card"]
+)
+theme_registry.register(analytics_title, "card_accent")
+analytics_title.pack(anchor="w")
+
+theme_registry.register(tk.Frame(analytics_card, bg=COLORS["dark_border"], height=1), "divider").pack(fill="x", pady=10)
+
+# Analytics details
+for row_data in [("Total", "label_analytics_total"), ("Top Blocked", "label_analytics_sources"), ("Busiest Dst", "label_analytics_destinations")]:
+    row = tk.Frame(analytics_card, bg=COLORS["dark_card"])
+    row.pack(fill="x", pady=2)
+    theme_registry.register(row, "card")
+    lbl_title = tk.Label(row, text=f"{row_data[0]}:", font=("Segoe UI", 9), fg=COLORS["text_muted"], bg=COLORS["dark_card"], width=12, anchor="w")
+    theme_registry.register(lbl_title, "card_muted")
+    lbl_title.pack(side="left")
+    lbl = tk.Label(row, text="-", font=("Consolas", 10), fg=COLORS["text_light"], bg=COLORS["dark_card"], anchor="w", justify="left")
+    lbl.pack(side="left", fill="x", expand=True)
+    theme_registry.register(lbl, "card_label")
+    globals()[row_data[1]] = lbl
+
+analytics_btn = tk.Button(
+    analytics_card,
+    text="🔄 Refresh Analytics",
+    command=refresh_analytics,
+    font=("Segoe UI", 10),
+    bg=COLORS["dark_surface"],
+    fg=COLORS["text_light"],
+    relief="flat",
+    padx=15,
+    pady=5,
+    cursor="hand2",
+    activebackground=COLORS["primary"],
+    activeforeground="white"
+)
+theme_registry.register(analytics_btn, "button")
+analytics_btn.pack(anchor="w", pady=(10, 0))
+
+# ==================================================
+# LIVE TRAFFIC LOG CARD
+# ==================================================
+log_card = tk.Frame(scrollable_frame, bg=COLORS["dark_card"], padx=25, pady=20)
+log_card.pack(pady=10, padx=20, fill="x")
+theme_registry.register(log_card, "card")
+
+log_title = tk.Label(
+    log_card,
+    text="📜 Live Traffic Log",
+    font=("Segoe UI", 14, "bold"),
+    fg=COLORS["accent"],
+    bg=COLORS["dark_card"]
+)
+theme_registry.register(log_title, "card_accent")
+log_title.pack(anchor="w")
+
+theme_registry.register(tk.Frame(log_card, bg=COLORS["dark_border"], height=1), "divider").pack(fill="x", pady=10)
+
+# Viewer tervirtualisasi: hanya baris yang terlihat yang dibaca dari logs.txt
+log_viewer = LogViewer(
+    log_card,
+    LOG_FILE,
+    rows=12,
+    register=theme_registry.register,
+    blocked_color=COLORS["danger"]
+)
+log_viewer.pack(fill="x")
+
 # Status Label Card
 status_card = tk.Frame(scrollable_frame, bg=COLORS["dark_card"], padx=20, pady=15)
 status_card.pack(pady=10, padx=20, fill="x")
-status_card.is_card = True
+theme_registry.register(status_card, "card")
 
 label_status = tk.Label(
     status_card,
@@ -783,9 +1225,46 @@ label_status = tk.Label(
     fg=COLORS["text_muted"],
     bg=COLORS["dark_card"]
 )
-label_status.is_muted = True
+theme_registry.register(label_status, "card_accent")  # fg diatur oleh status
 label_status.pack()
 
+# Live metrics (latensi keputusan, log, subnet, PDF)
+label_metrics = tk.Label(
+    status_card,
+    text="⏱ Belum ada metrics",
+    font=("Segoe UI", 9),
+    fg=COLORS["text_muted"],
+    bg=COLORS["dark_card"],
+    wraplength=760,
+    justify="center"
+)
+theme_registry.register(label_metrics, "card_muted")
+label_metrics.pack(pady=(5, 0))
+
+# Progress bar + tombol cancel (hanya tampil saat ada background job)
+progress_frame = tk.Frame(status_card, bg=COLORS["dark_card"])
+theme_registry.register(progress_frame, "card")
+
+progress_bar = ttk.Progressbar(progress_frame, mode="determinate", maximum=100)
+progress_bar.pack(side="left", fill="x", expand=True, padx=(0, 10))
+
+cancel_btn = tk.Button(
+    progress_frame,
+    text="✖ Cancel",
+    command=cancel_jobs,
+    font=("Segoe UI", 10),
+    bg=COLORS["dark_surface"],
+    fg=COLORS["text_light"],
+    relief="flat",
+    padx=15,
+    pady=5,
+    cursor="hand2",
+    activebackground=COLORS["primary"],
+    activeforeground="white"
+)
+theme_registry.register(cancel_btn, "button")
+cancel_btn.pack(side="right")
+
 # ==================================================
 # FOOTER
 # ==================================================
@@ -796,17 +1275,21 @@ footer_label = tk.Label(
     fg=COLORS["text_muted"],
     bg=COLORS["dark_bg"]
 )
-footer_label.is_muted = True
+theme_registry.register(footer_label, "muted")
 footer_label.pack(pady=(5, 20))
 
 # ==================================================
 # RESPONSIVE LAYOUT ADJUSTMENTS
 # ==================================================
-def adjust_layout(event=None):
-    """Adjust layout based on window width"""
-    width = root.winfo_width()
-    
-    if width < 700:
+def adjust_layout(breakpoint):
+    """
+    Adjust layout based on window width breakpoint:
+    - "small"  (< 450 px): semua input ditumpuk vertikal
+    - "medium" (< 700 px): card & input traffic ditumpuk vertikal
+    - "large"  (>= 700 px): side by side
+    Dipanggil oleh ResponsiveLayout hanya saat breakpoint berubah.
+    """
+    if breakpoint in ("small", "medium"):
         # Stack subnet cards vertically on small screens
         internal_card.grid(row=0, column=0, columnspan=2, sticky="ew", padx=0, pady=5)
         guest_card.grid(row=1, column=0, columnspan=2, sticky="ew", padx=0, pady=5)
@@ -822,7 +1305,7 @@ def adjust_layout(event=None):
         src_container.grid(row=0, column=0, columnspan=1, sticky="ew", padx=(0, 10))
         dst_container.grid(row=0, column=1, columnspan=1, sticky="ew", padx=(10, 0))
 
-    if width < 450:
+    if breakpoint == "small":
          # Stack network input fields vertically very small screens
         ip_frame.grid(row=0, column=0, columnspan=2, sticky="ew", padx=0, pady=(0, 10))
         mask_frame.grid(row=1, column=0, columnspan=2, sticky="ew", padx=0, pady=0)
@@ -831,8 +1314,26 @@ def adjust_layout(event=None):
         ip_frame.grid(row=0, column=0, columnspan=1, sticky="ew", padx=(0, 10), pady=0)
         mask_frame.grid(row=0, column=1, columnspan=1, sticky="ew", padx=(10, 0), pady=0)
 
-# Bind resize event
-root.bind("<Configure>", adjust_layout)
+# Bind resize event: event <Configure> digabung (debounce) dan grid ulang
+# hanya dilakukan saat melewati batas 450/700 px (lihat layout.stats)
+layout = ResponsiveLayout(root, [(450, "small"), (700, "medium")], adjust_layout)
+layout.bind()
+
+def on_close():
+    """Hentikan background job dan tulis sisa log di antrian sebelum aplikasi ditutup"""
+    job_runner.shutdown()
+    try:
+        engine.close()
+    except OSError as error:
+        messagebox.showerror("Error", f"Sebagian log gagal ditulis: {error}")
+    analytics.close()
+    root.destroy()
+
+root.protocol("WM_DELETE_WINDOW", on_close)
 
 apply_theme()
+theme_registry.on_apply = show_theme_timing  # Timing hook untuk toggle berikutnya
+refresh_analytics()
+refresh_metrics_view()
+log_viewer.start()
 root.mainloop()
@@ -0,0 +1,8 @@
+# ==================================================
+# SOHO GUARD GUI HELPERS
+# ==================================================
+"""
+Komponen pendukung GUI Tkinter SOHO Guard (tema, layout, dan sejenisnya).
+
+Berbeda dengan soho_core, paket ini hanya dipakai oleh soho_guard.py.
+"""
@@ -0,0 +1,137 @@
+# ==================================================
+# JOB RUNNER (Pekerjaan Berat di Background Thread)
+# ==================================================
+"""
+Menjalankan pekerjaan berat (batch flow, laporan PDF, ...) di thread pool
+supaya event loop Tk tetap responsif.
+
+Thread worker tidak pernah menyentuh widget: progress dan hasil dikirim lewat
+queue thread-safe yang dibaca di thread Tk dengan root.after().
+"""
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class JobCancelled(Exception):
+    """Dilempar di thread worker saat job dibatalkan"""
+
+
+class Job:
+    """Handle satu job; diberikan ke fungsi worker sebagai argumen pertama"""
+
+    def __init__(self, runner, kind):
+        self.kind = kind
+        self._runner = runner
+        self._cancel = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def report(self, fraction, message=None):
+        """
+        Kirim progress (0.0 - 1.0) ke GUI. Melempar JobCancelled jika job
+        sudah dibatalkan, jadi bisa langsung dipakai sebagai callback progress.
+        """
+        if self._cancel.is_set():
+            raise JobCancelled()
+        self._runner._events.put(("progress", self, (fraction, message)))
+
+
+class JobRunner:
+    """
+    - root: jendela Tk (untuk root.after)
+    - poll_ms: interval membaca queue hasil
+    - max_workers: jumlah thread worker
+    Hanya satu job per jenis (kind) yang boleh berjalan bersamaan.
+    """
+
+    def __init__(self, root, poll_ms=50, max_workers=2):
+        self.root = root
+        self.poll_ms = poll_ms
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="soho-job")
+        self._events = queue.Queue()
+        self._active = {}     # kind -> (job, callbacks)
+        self._polling = False
+
+    def is_running(self, kind):
+        return kind in self._active
+
+    @property
+    def active_kinds(self):
+        return list(self._active)
+
+    def submit(self, kind, func, on_done=None, on_error=None, on_progress=None,
+               on_cancel=None):
+        """
+        Jalankan func(job) di thread worker.
+        Callback (dipanggil di thread Tk):
+        - on_progress(job, fraction, message)
+        - on_done(job, hasil)
+        - on_error(job, exception)
+        - on_cancel(job)
+        Mengembalikan Job, atau None jika job dengan kind yang sama masih berjalan.
+        """
+        if kind in self._active:
+            return None
+        job = Job(self, kind)
+        self._active[kind] = (job, (on_done, on_error, on_progress, on_cancel))
+        self._pool.submit(self._run, job, func)
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.poll_ms, self._poll)
+        return job
+
+    def cancel(self, kind=None):
+        """Batalkan job dengan kind tertentu, atau semua job jika kind=None"""
+        for active_kind, (job, _) in list(self._active.items()):
+            if kind is None or kind == active_kind:
+                job.cancel()
+
+    def shutdown(self):
+        self.cancel()
+        self._pool.shutdown(wait=False)
+
+    def _run(self, job, func):
+        try:
+            result = func(job)
+        except JobCancelled:
+            self._events.put(("cancelled", job, None))
+        except Exception as error:  # Diteruskan ke on_error di thread Tk
+            self._events.put(("error", job, error))
+        else:
+            if job.cancelled:
+                self._events.put(("cancelled", job, None))
+            else:
+                self._events.put(("done", job, result))
+
+    def _poll(self):
+        while True:
+            try:
+                event, job, payload = self._events.get_nowait()
+            except queue.Empty:
+                break
+            entry = self._active.get(job.kind)
+            if entry is None or entry[0] is not job:
+                continue
+            on_done, on_error, on_progress, on_cancel = entry[1]
+            if event == "progress":
+                if on_progress is not None:
+                    on_progress(job, *payload)
+                continue
+            del self._active[job.kind]
+            if event == "done" and on_done is not None:
+                on_done(job, payload)
+            elif event == "error" and on_error is not None:
+                on_error(job, payload)
+            elif event == "cancelled" and on_cancel is not None:
+                on_cancel(job)
+
+        if self._active:
+            self.root.after(self.poll_ms, self._poll)
+        else:
+            self._polling = False
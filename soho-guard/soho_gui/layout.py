@@ -0,0 +1,65 @@
+# ==================================================
+# RESPONSIVE LAYOUT MANAGER (Debounce + Breakpoint)
+# ==================================================
+"""
+Mengatur layout responsif berdasarkan lebar jendela.
+
+Event <Configure> yang datang beruntun digabung (debounce dengan after),
+lalu layout hanya di-grid ulang jika lebar jendela melewati breakpoint.
+"""
+
+
+class ResponsiveLayout:
+    """
+    - root: jendela utama (Tk)
+    - breakpoints: list (batas_lebar, nama) terurut naik, contoh
+      [(450, "small"), (700, "medium")]; lebar >= batas terakhir = wide_name
+    - on_breakpoint: fungsi(nama_breakpoint) yang melakukan grid ulang
+    - delay_ms: jeda debounce sebelum lebar jendela dibaca
+    """
+
+    def __init__(self, root, breakpoints, on_breakpoint, wide_name="large", delay_ms=80):
+        self.root = root
+        self.breakpoints = sorted(breakpoints)
+        self.on_breakpoint = on_breakpoint
+        self.wide_name = wide_name
+        self.delay_ms = delay_ms
+        self.current = None
+        self._pending = None
+        # Counter untuk melihat seberapa banyak kerja yang benar-benar dilakukan
+        self.stats = {"events": 0, "checks": 0, "relayouts": 0}
+
+    def breakpoint_for(self, width):
+        """Nama breakpoint untuk lebar tertentu"""
+        for limit, name in self.breakpoints:
+            if width < limit:
+                return name
+        return self.wide_name
+
+    def bind(self):
+        """Pasang handler <Configure> pada root"""
+        self.root.bind("<Configure>", self.on_configure)
+
+    def on_configure(self, event):
+        # Event <Configure> dari widget anak tidak mengubah lebar jendela
+        if event.widget is not self.root:
+            return
+        self.stats["events"] += 1
+        if self._pending is not None:
+            self.root.after_cancel(self._pending)
+        self._pending = self.root.after(self.delay_ms, self._settle)
+
+    def _settle(self):
+        self._pending = None
+        self.stats["checks"] += 1
+        self.relayout(self.root.winfo_width())
+
+    def relayout(self, width, force=False):
+        """Grid ulang hanya jika breakpoint berubah (atau force=True)"""
+        name = self.breakpoint_for(width)
+        if name == self.current and not force:
+            return False
+        self.current = name
+        self.stats["relayouts"] += 1
+        self.on_breakpoint(name)
+        return True
@@ -0,0 +1,166 @@
+# ==================================================
+# LIVE LOG VIEWER (Daftar Log Tervirtualisasi)
+# ==================================================
+"""
+Panel log yang menampilkan logs.txt secara live (tail) dengan filter
+ALLOWED/BLOCKED serta source/destination.
+
+Hanya baris yang terlihat di viewport yang ada di widget Text; baris lain
+diambil sesuai kebutuhan lewat SparseLineIndex (seek ke offset byte), jadi
+memori sebanding dengan ukuran viewport, bukan ukuran file.
+"""
+import tkinter as tk
+from tkinter import ttk
+
+from soho_core.lineindex import SparseLineIndex, make_filter
+
+SCAN_BUDGET = 4 * 1024 * 1024  # Byte yang dipindai per giliran (GUI tetap responsif)
+STATUS_CHOICES = ["ALL", "ALLOWED", "BLOCKED"]
+
+
+class LogViewer(tk.Frame):
+    """
+    - parent: container Tk
+    - log_path: file log yang ditampilkan
+    - rows: jumlah baris yang terlihat
+    - poll_ms: interval cek baris baru
+    - register: fungsi opsional (widget, role) untuk mendaftarkan widget ke ThemeRegistry
+    - blocked_color: warna teks baris BLOCKED
+    """
+
+    def __init__(self, parent, log_path, rows=12, poll_ms=1000, register=None,
+                 blocked_color="#FF5252", font=("Consolas", 9)):
+        super().__init__(parent, bg=parent.cget("bg"))
+        self.log_path = log_path
+        self.rows = rows
+        self.poll_ms = poll_ms
+        self.index = SparseLineIndex(log_path)
+        self.top = 0           # Index baris pertama yang terlihat
+        self.follow = True     # Ikuti baris terbaru (live tail)
+        self._shown = None     # (top, count) terakhir yang dirender
+        self._after_id = None
+        register = register or (lambda widget, role: widget)
+        register(self, "card")
+
+        # ---------- Filter bar ----------
+        filter_bar = register(tk.Frame(self, bg=self.cget("bg")), "card")
+        filter_bar.pack(fill="x", pady=(0, 8))
+
+        register(tk.Label(filter_bar, text="Status", font=("Segoe UI", 9),
+                          bg=self.cget("bg")), "card_muted").pack(side="left")
+        self.status_choice = ttk.Combobox(filter_bar, values=STATUS_CHOICES,
+                                          state="readonly", width=9)
+        self.status_choice.set("ALL")
+        self.status_choice.pack(side="left", padx=(5, 10))
+
+        register(tk.Label(filter_bar, text="SRC", font=("Segoe UI", 9),
+                          bg=self.cget("bg")), "card_muted").pack(side="left")
+        self.source_entry = register(tk.Entry(filter_bar, font=("Consolas", 10), width=16), "entry")
+        self.source_entry.pack(side="left", padx=(5, 10), ipady=3)
+
+        register(tk.Label(filter_bar, text="DST", font=("Segoe UI", 9),
+                          bg=self.cget("bg")), "card_muted").pack(side="left")
+        self.destination_entry = register(tk.Entry(filter_bar, font=("Consolas", 10), width=16), "entry")
+        self.destination_entry.pack(side="left", padx=(5, 10), ipady=3)
+
+        filter_btn = register(tk.Button(filter_bar, text="🔍 Filter", command=self.apply_filter,
+                                        relief="flat", padx=10, cursor="hand2"), "button")
+        filter_btn.pack(side="left")
+
+        # ---------- Viewport ----------
+        body = register(tk.Frame(self, bg=self.cget("bg")), "card")
+        body.pack(fill="both", expand=True)
+
+        self.text = register(tk.Text(body, height=rows, wrap="none", font=font,
+                                     state="disabled", cursor="arrow"), "entry")
+        self.text.tag_configure("blocked", foreground=blocked_color)
+        self.text.pack(side="left", fill="both", expand=True)
+
+        self.scrollbar = ttk.Scrollbar(body, orient="vertical", command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.info_label = register(tk.Label(self, text="0 baris", font=("Segoe UI", 9),
+                                            bg=self.cget("bg"), anchor="w"), "card_muted")
+        self.info_label.pack(fill="x", pady=(5, 0))
+
+        self.text.bind("<MouseWheel>", self._on_wheel)
+        self.text.bind("<Button-4>", lambda e: self.scroll_to(self.top - 3) or "break")
+        self.text.bind("<Button-5>", lambda e: self.scroll_to(self.top + 3) or "break")
+
+    # ---------- Live tail ----------
+    def start(self):
+        """Mulai memantau file log"""
+        if self._after_id is None:
+            self._poll()
+
+    def destroy(self):
+        if self._after_id is not None:
+            self.after_cancel(self._after_id)
+            self._after_id = None
+        super().destroy()
+
+    def _poll(self):
+        done = self.index.refresh(budget_bytes=SCAN_BUDGET)
+        if self.follow:
+            self.top = max(0, self.index.count - self.rows)
+        self.render()
+        # Jika file belum selesai dipindai, lanjutkan secepatnya di giliran berikutnya
+        self._after_id = self.after(self.poll_ms if done else 1, self._poll)
+
+    # ---------- Rendering ----------
+    def render(self, force=False):
+        """Isi widget Text hanya dengan baris yang terlihat"""
+        count = self.index.count
+        # Isi viewport hanya berubah jika posisi atau jumlah baris terlihat berubah
+        key = (self.top, min(count, self.top + self.rows))
+        if force or key != self._shown:
+            self._shown = key
+            lines = self.index.read_lines(self.top, self.rows)
+            self.text.configure(state="normal")
+            self.text.delete("1.0", "end")
+            for line in lines:
+                self.text.insert("end", line + "\n", "blocked" if line.endswith("BLOCKED") else ())
+            self.text.configure(state="disabled")
+
+        if count:
+            self.scrollbar.set(self.top / count, min(1.0, (self.top + self.rows) / count))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+        mode = "live" if self.follow else "paused"
+        self.info_label.config(text=f"{count:,} baris ({mode}) - baris {self.top + 1:,}")
+
+    def scroll_to(self, top):
+        max_top = max(0, self.index.count - self.rows)
+        self.top = min(max(0, int(top)), max_top)
+        self.follow = self.top >= max_top
+        self.render()
+
+    def _on_scrollbar(self, action, *args):
+        if action == "moveto":
+            self.scroll_to(float(args[0]) * self.index.count)
+        elif action == "scroll":
+            amount = int(args[0])
+            step = self.rows if args[1] == "pages" else 1
+            self.scroll_to(self.top + amount * step)
+
+    def _on_wheel(self, event):
+        self.scroll_to(self.top - int(event.delta / 120) * 3)
+        return "break"  # Jangan ikut menggulung halaman utama
+
+    # ---------- Filter ----------
+    def apply_filter(self):
+        """Buat indeks baru sesuai filter (dipindai bertahap oleh _poll)"""
+        status = self.status_choice.get()
+        predicate = make_filter(
+            status=None if status == "ALL" else status,
+            source=self.source_entry.get(),
+            destination=self.destination_entry.get(),
+        )
+        self.index = SparseLineIndex(self.log_path, predicate)
+        self.top = 0
+        self.follow = True
+        self._shown = None
+        if self._after_id is not None:
+            self.after_cancel(self._after_id)
+            self._after_id = None
+        self._poll()
@@ -0,0 +1,101 @@
+# ==================================================
+# THEME REGISTRY (Tema per Role Widget)
+# ==================================================
+"""
+Registry tema: setiap widget didaftarkan sekali dengan sebuah role
+(card, label muted, entry, button, ...). Saat tema diganti, dict opsi yang
+sudah dihitung sebelumnya untuk tiap role langsung di-configure dalam satu
+putaran, tanpa query Tk (winfo_class, cget, dsb).
+"""
+import time
+import tkinter as tk
+
+ROLES = (
+    "root",         # Background utama (frame polos, canvas)
+    "card",         # Background card
+    "divider",      # Garis pemisah di dalam card
+    "label",        # Label biasa di atas background utama
+    "muted",        # Label redup di atas background utama
+    "accent",       # Label berwarna khusus di atas background utama (fg tetap)
+    "card_label",   # Label biasa di dalam card
+    "card_muted",   # Label redup di dalam card
+    "card_accent",  # Label berwarna khusus di dalam card (fg tetap)
+    "entry",        # Input teks
+    "button",       # Tombol tk.Button biasa
+)
+
+
+def build_role_options(theme, highlight):
+    """Hitung dict opsi configure() untuk setiap role dari satu tema"""
+    return {
+        "root": {"bg": theme["bg"]},
+        "card": {"bg": theme["card"]},
+        "divider": {"bg": theme["border"]},
+        "label": {"bg": theme["bg"], "fg": theme["fg"]},
+        "muted": {"bg": theme["bg"], "fg": theme["muted"]},
+        "accent": {"bg": theme["bg"]},
+        "card_label": {"bg": theme["card"], "fg": theme["fg"]},
+        "card_muted": {"bg": theme["card"], "fg": theme["muted"]},
+        "card_accent": {"bg": theme["card"]},
+        "entry": {
+            "bg": theme["surface"],
+            "fg": theme["fg"],
+            "insertbackground": theme["fg"],
+            "relief": "flat",
+            "highlightthickness": 2,
+            "highlightbackground": theme["border"],
+            "highlightcolor": highlight,
+        },
+        "button": {
+            "bg": theme["surface"],
+            "fg": theme["fg"],
+            "activebackground": highlight,
+            "activeforeground": "white",
+        },
+    }
+
+
+class ThemeRegistry:
+    """
+    - themes: dict nama tema -> palet (lihat THEMES di soho_guard.py)
+    - highlight: warna fokus/aktif untuk entry dan button
+    - on_apply: hook opsional fungsi(nama_tema, detik) untuk mengukur waktu toggle
+    """
+
+    def __init__(self, themes, highlight):
+        self._widgets = {role: [] for role in ROLES}
+        self._options = {name: build_role_options(theme, highlight)
+                         for name, theme in themes.items()}
+        self.on_apply = None
+        self.last_apply_seconds = 0.0
+
+    def register(self, widget, role):
+        """Daftarkan widget dengan role tertentu; mengembalikan widget itu sendiri"""
+        if role not in self._widgets:
+            raise ValueError(f"Role tema tidak dikenal: {role!r}")
+        self._widgets[role].append(widget)
+        return widget
+
+    def options(self, theme_name, role):
+        """Opsi configure() untuk role pada tema tertentu"""
+        return self._options[theme_name][role]
+
+    def apply(self, theme_name):
+        """Terapkan tema ke semua widget terdaftar; mengembalikan durasi (detik)"""
+        start = time.perf_counter()
+        options = self._options[theme_name]
+        for role, widgets in self._widgets.items():
+            role_options = options[role]
+            alive = []
+            for widget in widgets:
+                try:
+                    widget.configure(**role_options)
+                except tk.TclError:
+                    continue  # Widget sudah dihancurkan: buang dari registry
+                alive.append(widget)
+            if len(alive) != len(widgets):
+                self._widgets[role] = alive
+        self.last_apply_seconds = time.perf_counter() - start
+        if self.on_apply is not None:
+            self.on_apply(theme_name, self.last_apply_seconds)
+        return self.last_apply_seconds
@@ -0,0 +1,5 @@
+# Agar soho_core bisa di-import saat pytest dijalankan dari folder mana pun
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
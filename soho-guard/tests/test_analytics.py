@@ -0,0 +1,96 @@
+import os
+import threading
+
+import pytest
+
+from soho_core import analytics as analytics_module
+from soho_core.analytics import TrafficAnalytics
+from soho_core.logsink import format_log_line
+
+
+def append_log(path, count, start=0):
+    with open(path, "a") as file:
+        for index in range(start, start + count):
+            status = "BLOCKED" if index % 4 == 0 else "ALLOWED"
+            file.write(format_log_line(f"192.168.1.{index % 200}", "192.168.1.4", status,
+                                       "2026-01-14 08:00:00"))
+
+
+def test_incremental_refresh_matches_full_scan(tmp_path):
+    log_path = str(tmp_path / "logs.txt")
+    append_log(log_path, 1000)
+    incremental = TrafficAnalytics(log_path, checkpoint_interval=0)
+    assert incremental.refresh() == 1000
+    append_log(log_path, 500, start=1000)
+    assert incremental.refresh() == 500
+
+    full = TrafficAnalytics(log_path, checkpoint_path=str(tmp_path / "other.json"))
+    full.refresh()
+    assert incremental.status_counts == full.status_counts
+    assert incremental.top_blocked_sources(5) == full.top_blocked_sources(5)
+
+
+def test_checkpoint_writes_are_throttled(tmp_path):
+    log_path = str(tmp_path / "logs.txt")
+    append_log(log_path, 10)
+    stats = TrafficAnalytics(log_path, checkpoint_interval=3600)
+    stats.refresh()  # Refresh pertama selalu menulis checkpoint
+    saved = os.path.getmtime(stats.checkpoint_path), os.path.getsize(stats.checkpoint_path)
+
+    append_log(log_path, 10, start=10)
+    stats.refresh()
+    assert (os.path.getmtime(stats.checkpoint_path), os.path.getsize(stats.checkpoint_path)) == saved
+
+    stats.close()
+    reloaded = TrafficAnalytics(log_path)
+    assert reloaded.offset == os.path.getsize(log_path)
+    assert reloaded.total == 20
+
+
+def test_cancelled_refresh_keeps_counters_and_offset_consistent(tmp_path, monkeypatch):
+    monkeypatch.setattr(analytics_module, "READ_SIZE", 4096)
+    log_path = str(tmp_path / "logs.txt")
+    append_log(log_path, 2000)
+    stats = TrafficAnalytics(log_path, checkpoint_interval=0)
+
+    def cancel(fraction):
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        stats.refresh(progress=cancel)
+    partial = stats.total
+    assert 0 < partial < 2000
+    assert stats.refresh() == 2000 - partial
+    assert TrafficAnalytics(log_path).total == 2000
+
+
+def test_queries_during_refresh_see_consistent_counters(tmp_path, monkeypatch):
+    monkeypatch.setattr(analytics_module, "READ_SIZE", 4096)
+    log_path = str(tmp_path / "logs.txt")
+    append_log(log_path, 5000)
+    stats = TrafficAnalytics(log_path, checkpoint_interval=0)
+    seen = []
+
+    def query(fraction):
+        # Dipanggil di tengah refresh: query tidak menunggu refresh selesai
+        seen.append((stats.total, stats.blocked_ratio, stats.top_blocked_sources(3),
+                     stats.top_destinations(3), stats.blocked_ratio_series()))
+
+    stats.refresh(progress=query)
+    totals = [entry[0] for entry in seen]
+    assert len(totals) > 1 and totals == sorted(totals) and totals[-1] == 5000
+
+
+def test_refresh_in_thread_while_reading(tmp_path, monkeypatch):
+    monkeypatch.setattr(analytics_module, "READ_SIZE", 512)
+    log_path = str(tmp_path / "logs.txt")
+    append_log(log_path, 20000)
+    stats = TrafficAnalytics(log_path, checkpoint_interval=0)
+    worker = threading.Thread(target=stats.refresh)
+    worker.start()
+    while worker.is_alive():
+        stats.top_blocked_sources(5)
+        stats.top_destinations(5)
+        stats.blocked_ratio_series()
+    worker.join()
+    assert stats.total == 20000
@@ -0,0 +1,92 @@
+import os
+
+from soho_core import binlog
+from soho_core.logsink import format_log_line
+
+STAMP = "2026-01-14 08:00:00"
+
+
+def write_text_log(path, rows):
+    with open(path, "w") as file:
+        for source, destination, status in rows:
+            file.write(format_log_line(source, destination, status, STAMP))
+
+
+def segment_bytes(base_path):
+    return sum(os.path.getsize(path) for path in binlog.list_segments(base_path))
+
+
+def test_round_trip_is_faithful(tmp_path):
+    rows = [
+        ("192.168.1.200", "192.168.1.10", "BLOCKED"),
+        ("fd00::1", "192.168.1.10", "ALLOWED"),
+        ("::ffff:192.168.1.5", "::ffff:10.0.0.1", "BLOCKED"),  # IPv6 asli, bukan IPv4
+        ("192.168.1.20", "192.168.1.30", "ALLOWED"),
+        ("fe80::1", "fe80::2", "ALLOWED"),
+    ]
+    text_path, base_path, back_path = tmp_path / "logs.txt", tmp_path / "logs.bin", tmp_path / "back.txt"
+    write_text_log(text_path, rows)
+
+    assert binlog.text_to_binary(str(text_path), str(base_path)) == len(rows)
+    assert binlog.binary_to_text(str(base_path), str(back_path)) == len(rows)
+    assert back_path.read_text() == text_path.read_text()
+
+
+def test_single_ipv6_record_does_not_widen_later_records(tmp_path):
+    base_path = str(tmp_path / "logs.bin")
+    writer = binlog.BinaryLogWriter(base_path)
+    writer.write("fd00::1", "fd00::2", "ALLOWED", epoch=0)
+    for index in range(1000):
+        writer.write("192.168.1.200", f"192.168.1.{index % 128}", "BLOCKED", epoch=index)
+    writer.close()
+
+    ipv4_record = binlog.RECORD.size
+    overhead = len(binlog.MAGIC) * len(binlog.list_segments(base_path))
+    assert segment_bytes(base_path) == overhead + (1 + 4 + 32) + 1000 * ipv4_record
+
+    # Writer yang dibuka ulang tetap menulis record ringkas
+    writer = binlog.BinaryLogWriter(base_path)
+    writer.write("10.0.0.1", "10.0.0.2", "ALLOWED", epoch=5)
+    writer.close()
+    records = list(binlog.iter_records(base_path))
+    assert len(records) == 1002
+    assert records[0] == (0, "fd00::1", "fd00::2", "ALLOWED")
+    assert records[-1] == (5, "10.0.0.1", "10.0.0.2", "ALLOWED")
+
+
+def test_text_to_binary_skips_invalid_lines(tmp_path):
+    good = format_log_line("192.168.1.200", "192.168.1.10", "BLOCKED", STAMP)
+    text_path, base_path = tmp_path / "logs.txt", str(tmp_path / "logs.bin")
+    with open(text_path, "wb") as file:
+        file.write(good.encode())
+        file.write(format_log_line("192.168.1.x", "192.168.1.10", "BLOCKED", STAMP).encode())
+        file.write(format_log_line("fe80::1%eth0", "fe80::2", "ALLOWED", STAMP).encode())
+        file.write(format_log_line("10.0.0.1", "10.0.0.2", "ALLOWED", "2026-13-45 99:00:00").encode())
+        file.write(format_log_line("10.0.0.1", "10.0.0.2", "ALLOWED", "1900-01-01 00:00:00").encode())
+        file.write(b"2026-01-14 08:00:00 | SRC=10.0.0.\xff -> DST=10.0.0.2 | ALLOWED\n")
+        file.write(good.encode())
+
+    assert binlog.text_to_binary(str(text_path), base_path) == 2
+    assert [record[1:] for record in binlog.iter_records(base_path)] == [
+        ("192.168.1.200", "192.168.1.10", "BLOCKED"),
+    ] * 2
+
+
+def test_engine_writes_live_decisions_to_binary_log(tmp_path):
+    from soho_core.engine import GuardEngine
+
+    base_path = str(tmp_path / "logs.bin")
+    engine = GuardEngine(str(tmp_path / "logs.txt"), binary_log=base_path)
+    engine.generate_subnet("192.168.1.0/24")
+    engine.evaluate("192.168.1.130", "192.168.1.4")
+    engine.evaluate("192.168.1.4", "fd00::1")
+    engine.write_log("192.168.1.5", "192.168.1.6", "ALLOWED", timeout=0)
+    engine.flush()
+    engine.close()
+
+    assert not os.path.exists(tmp_path / "logs.txt")
+    assert [record[1:] for record in binlog.iter_records(base_path)] == [
+        ("192.168.1.130", "192.168.1.4", "BLOCKED"),
+        ("192.168.1.4", "fd00::1", "ALLOWED"),
+        ("192.168.1.5", "192.168.1.6", "ALLOWED"),
+    ]
@@ -0,0 +1,40 @@
+from soho_core.engine import GuardEngine
+from soho_core.policy import BLOCKED, Policy, Rule, Segment
+
+MIXED_SEGMENTS = [
+    Segment("guest", "10.0.0.0/24"),
+    Segment("srv", "::/120"),
+    Segment("v6g", "a00:1::/32"),
+    Segment("v4i", "0.0.0.0/24"),
+]
+
+
+def make_engine(tmp_path, policy):
+    engine = GuardEngine(str(tmp_path / "logs.txt"))
+    engine.set_policy(policy)
+    return engine
+
+
+def test_mixed_family_pairs_do_not_share_cache_entries(tmp_path):
+    policy = Policy(MIXED_SEGMENTS, [Rule("guest", "srv", BLOCKED)])
+    engine = make_engine(tmp_path, policy)
+
+    first = engine.evaluate("10.0.0.1", "::1", log=False)
+    second = engine.evaluate("a00:1::", "0.0.0.1", log=False)
+
+    assert first == policy.evaluate("10.0.0.1", "::1")
+    assert second == policy.evaluate("a00:1::", "0.0.0.1")
+    assert second.src_segment == "v6g" and second.dst_segment == "v4i"
+
+
+def test_cached_decisions_match_uncached_policy(tmp_path):
+    policy = Policy(MIXED_SEGMENTS, [Rule("guest", "srv", BLOCKED), Rule("v6g", "guest", BLOCKED)])
+    engine = make_engine(tmp_path, policy)
+    pairs = [
+        ("10.0.0.1", "::1"), ("a00:1::", "0.0.0.1"), ("a00:1::5", "10.0.0.9"),
+        ("0.0.0.1", "a00:1::"), ("::1", "10.0.0.1"), ("192.0.2.1", "10.0.0.1"),
+    ]
+    for _ in range(2):  # Putaran kedua dilayani dari cache
+        for source, destination in pairs:
+            assert engine.evaluate(source, destination, log=False) == policy.evaluate(source, destination)
+    assert engine.cache.hits == len(pairs)
@@ -0,0 +1,91 @@
+import ipaddress
+
+import pytest
+
+from soho_core.flows import evaluate_flow_file, is_header
+from soho_core.shards import evaluate_flow_file_parallel
+
+INTERNAL = ipaddress.ip_network("fd00::/65")
+GUEST = ipaddress.ip_network("fd00:0:0:0:8000::/65")
+
+
+@pytest.mark.parametrize("line, expected", [
+    ("src,dst\n", True),
+    ("source_ip,destination_ip\n", True),
+    ("192.168.1.10,192.168.1.200\n", False),
+    ("fd00::1,fd00::8000:0:0:1\n", False),
+    ("fe80::1,fe80::2\n", False),
+    ("abcd::1,abcd::2\n", False),
+    ("# komentar\n", False),
+    ("\n", False),
+])
+def test_is_header(line, expected):
+    assert is_header(line) is expected
+
+
+@pytest.mark.parametrize("header", ["", "src,dst\n"])
+def test_ipv6_first_row_is_not_dropped(tmp_path, header):
+    path = tmp_path / "flows.csv"
+    path.write_text(header + "fd00::8000:0:0:1,fd00::1\nfd00::1,fd00::8000:0:0:1\n")
+
+    serial = evaluate_flow_file(str(path), INTERNAL, GUEST)
+    parallel = evaluate_flow_file_parallel(str(path), INTERNAL, GUEST, workers=1)
+
+    for result in (serial, parallel):
+        assert result["total"] == 2
+        assert result["blocked"] == 1
+        assert result["invalid"] == 0
+
+
+def test_parallel_log_matches_serial_counts(tmp_path):
+    path = tmp_path / "flows.csv"
+    rows = [f"192.168.1.{128 + i % 100},192.168.1.{i % 128}" for i in range(500)]
+    rows += [f"192.168.1.{i % 128},192.168.1.{128 + i % 100}" for i in range(500)]
+    path.write_text("src,dst\n" + "\n".join(rows) + "\n")
+    internal, guest = ipaddress.ip_network("192.168.1.0/25"), ipaddress.ip_network("192.168.1.128/25")
+    log_path = tmp_path / "logs.txt"
+
+    serial = evaluate_flow_file(str(path), internal, guest)
+    parallel = evaluate_flow_file_parallel(str(path), internal, guest, workers=1, log_path=str(log_path))
+
+    assert (parallel["total"], parallel["blocked"]) == (serial["total"], serial["blocked"]) == (1000, 500)
+    assert log_path.read_text().count("BLOCKED") == 500
+
+
+def strip_timestamps(text):
+    return [line.split(" | ", 1)[1] for line in text.splitlines()]
+
+
+def test_process_pool_matches_serial_evaluation(tmp_path):
+    from soho_core.engine import GuardEngine
+
+    rows = []
+    for i in range(3000):
+        if i % 3 == 0:
+            rows.append(f"FD00:0:0:0:8000::{i:X},fd00::{i % 50:04x}")  # IPv6 non-kanonik
+        elif i % 3 == 1:
+            rows.append(f"192.168.1.{128 + i % 100},192.168.1.{i % 128}")
+        else:
+            rows.append(f"192.168.1.{i % 128}, 192.168.1.{128 + i % 100}")
+    rows[1234] = "bukan,alamat"
+    path = tmp_path / "flows.csv"
+    path.write_text("src,dst\n" + "\n".join(rows) + "\n")
+    internal, guest = ipaddress.ip_network("192.168.1.0/25"), ipaddress.ip_network("192.168.1.128/25")
+
+    # Log berurutan: GuardEngine.evaluate untuk setiap baris
+    engine = GuardEngine(str(tmp_path / "serial.txt"))
+    engine.generate_subnet("192.168.1.0/24")
+    engine.evaluate_many((tuple(part.strip() for part in row.split(",")) for row in rows), log=True)
+    engine.close()
+    serial_log = strip_timestamps((tmp_path / "serial.txt").read_text())
+    serial = evaluate_flow_file(str(path), internal, guest)
+
+    for workers in (1, 2):
+        log_path = tmp_path / f"parallel-{workers}.txt"
+        result = evaluate_flow_file_parallel(str(path), internal, guest, workers=workers,
+                                             log_path=str(log_path))
+        assert result["shards"] > 1
+        assert [result[key] for key in ("total", "blocked", "invalid")] == \
+            [serial[key] for key in ("total", "blocked", "invalid")] == [2999, 999, 1]
+        assert strip_timestamps(log_path.read_text()) == serial_log
+        assert not list(tmp_path.glob("*.shard-*"))
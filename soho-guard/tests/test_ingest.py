@@ -0,0 +1,73 @@
+import asyncio
+import time
+
+from soho_core.engine import GuardEngine
+from soho_core.ingest import FlowIngestService, parse_event
+
+
+def make_service(tmp_path, **kwargs):
+    engine = GuardEngine(str(tmp_path / "logs.txt"))
+    engine.generate_subnet("192.168.1.0/24")
+    return FlowIngestService(engine, udp_port=0, log=False, **kwargs)
+
+
+def test_parse_event_formats():
+    assert parse_event("192.168.1.130,192.168.1.4") == ("192.168.1.130", "192.168.1.4")
+    assert parse_event("fd00::1 fd00::2") == ("fd00::1", "fd00::2")
+    assert parse_event("<134>gw kernel: IN=br0 SRC=192.168.1.130 DST=192.168.1.4 PROTO=TCP") \
+        == ("192.168.1.130", "192.168.1.4")
+    assert parse_event("# komentar") is None
+
+
+def test_idle_udp_peers_are_expired(tmp_path):
+    service = make_service(tmp_path, udp_idle_timeout=30)
+    for port in range(1000):
+        service._handle_datagram(b"192.168.1.200,192.168.1.10\n", ("127.0.0.1", 40000 + port))
+    service._handle_datagram(b"192.168.1.10,192.168.1.200\n", ("127.0.0.1", 50000))
+    service._udp_peers[("127.0.0.1", 50000)].last_seen += 60  # Masih aktif
+
+    service.prune(now=time.monotonic() + 45)
+
+    assert len(service.connections) == 1
+    assert list(service._udp_peers) == [("127.0.0.1", 50000)]
+    totals = service.totals()
+    assert totals["events"] == 1001
+    assert totals["blocked"] == 1000
+
+    # Pengirim yang kembali setelah kedaluwarsa mendapat statistik baru
+    service._handle_datagram(b"192.168.1.200,192.168.1.10\n", ("127.0.0.1", 40000))
+    assert len(service.connections) == 2
+    assert service.totals()["events"] == 1002
+
+
+def test_tcp_and_udp_count_blank_lines_the_same(tmp_path):
+    payload = b"192.168.1.200,192.168.1.10\n\n  \r\n192.168.1.10,192.168.1.200\nbukan event\n\n"
+
+    async def run():
+        engine = GuardEngine(str(tmp_path / "logs.txt"))
+        engine.generate_subnet("192.168.1.0/24")
+        service = FlowIngestService(engine, udp_port=0, tcp_port=0, log=False)
+        await service.start()
+        try:
+            _, writer = await asyncio.open_connection(service.host, service.tcp_port)
+            writer.write(payload + b"   ")  # Sisa tanpa '\n' juga hanya spasi
+            await writer.drain()
+            writer.close()
+            await writer.wait_closed()
+            loop = asyncio.get_running_loop()
+            transport, _ = await loop.create_datagram_endpoint(
+                asyncio.DatagramProtocol, remote_addr=(service.host, service.udp_port))
+            transport.sendto(payload)
+            transport.close()
+            for _ in range(200):
+                if len(service.connections) == 2 and service.connections[0].closed \
+                        and service.connections[1].events:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            await service.close()
+        return {stats.protocol: (stats.events, stats.allowed, stats.blocked, stats.invalid)
+                for stats in service.connections}
+
+    counts = asyncio.run(run())
+    assert counts["tcp"] == counts["udp"] == (3, 1, 1, 1)
@@ -0,0 +1,88 @@
+import random
+import time
+
+from soho_core.inventory import CONTAINS, EQUAL, INSIDE, check_inventory, load_inventory, parse_prefix
+
+
+def brute_force_conflicts(inventory, segments):
+    found = set()
+    for name, network in segments:
+        segment = parse_prefix(network, name)
+        for prefix in inventory:
+            if prefix.version == segment.version and prefix.start <= segment.end \
+                    and segment.start <= prefix.end:
+                found.add((name, prefix.name))
+    return found
+
+
+def test_conflict_kinds(tmp_path):
+    path = tmp_path / "inventory.txt"
+    path.write_text("# inventaris\n10.20.0.0/25 kantor\n10.20.0.192/26,dmz\n10.0.0.0/8 besar\n"
+                    "10.20.0.64/27 nested\n192.168.0.0/16\n")
+    inventory = load_inventory(str(path))
+    report = check_inventory(inventory, [("internal", "10.20.0.0/25"), ("guest", "10.20.0.128/25")])
+
+    kinds = {(c.segment.name, c.existing.name): c.kind for c in report.conflicts}
+    assert kinds == {
+        ("internal", "besar"): INSIDE,
+        ("internal", "kantor"): EQUAL,
+        ("internal", "nested"): CONTAINS,
+        ("guest", "besar"): INSIDE,
+        ("guest", "dmz"): CONTAINS,
+    }
+    assert report.inventory_overlaps == 3
+
+
+def test_no_conflict_reports_gaps():
+    inventory = [parse_prefix("10.0.0.0/24"), parse_prefix("10.0.2.0/24")]
+    report = check_inventory(inventory, [("internal", "10.0.1.0/25")])
+    assert report.conflicts == []
+    assert report.segment_gaps["internal"] == (0, 128)
+    assert report.gap_count == 1
+
+
+def test_duplicates_are_merged_and_stay_fast():
+    inventory = [parse_prefix("10.1.0.0/24", f"dup{i}") for i in range(20_000)]
+    inventory.append(parse_prefix("10.0.0.0/8", "besar"))
+    started = time.perf_counter()
+    report = check_inventory(inventory, [("internal", "10.1.0.0/25"), ("guest", "172.16.0.0/24")])
+    assert time.perf_counter() - started < 1.0
+    assert report.inventory_overlaps == 20_000
+    assert len(report.conflicts) == 20_001  # Semua duplikat + prefix besar
+
+
+def test_matches_brute_force_on_random_inventory():
+    rng = random.Random(7)
+    inventory = []
+    for i in range(2_000):
+        length = rng.choice([16, 20, 22, 24, 24, 26, 28])
+        address = f"10.{rng.randrange(8)}.{rng.randrange(256)}.{rng.randrange(256)}/{length}"
+        inventory.append(parse_prefix(address, f"p{i}"))
+    inventory += inventory[:50]  # Duplikat persis
+    segments = [("internal", "10.3.0.0/23"), ("guest", "10.3.2.0/23"), ("iot", "10.9.0.0/24")]
+
+    report = check_inventory(inventory, segments)
+    found = {(c.segment.name, c.existing.name) for c in report.conflicts}
+    assert found == brute_force_conflicts(inventory, segments)
+    assert len(report.conflicts) == sum(
+        1 for name, network in segments for p in inventory
+        if p.start <= parse_prefix(network).end and parse_prefix(network).start <= p.end)
+
+
+def test_engine_checks_inventory_from_snapshot(tmp_path):
+    from soho_core.engine import GuardEngine
+    from soho_core.vlsm import parse_requirements
+
+    snapshot_path = str(tmp_path / "policy.snap")
+    writer = GuardEngine(str(tmp_path / "logs.txt"), snapshot_path=snapshot_path)
+    writer.plan_segments("10.20.0.0/24", parse_requirements("internal=100,guest=20,lab=6"))
+
+    reader = GuardEngine(str(tmp_path / "logs.txt"))
+    reader.use_snapshot(snapshot_path)
+    assert sorted(reader.policy.segments) == sorted(writer.policy.segments)
+
+    inventory = [parse_prefix("10.20.0.0/25", "kantor")]
+    expected = writer.check_inventory(inventory)
+    report = reader.check_inventory(inventory)
+    assert report.conflicts == expected.conflicts
+    assert report.segment_gaps == expected.segment_gaps
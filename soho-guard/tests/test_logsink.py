@@ -0,0 +1,56 @@
+import struct
+
+import pytest
+
+from soho_core import timeindex
+from soho_core.logsink import LogSink
+from soho_core.timeindex import TimeIndex
+
+
+def test_time_index_offsets_point_at_line_starts(tmp_path):
+    log_path = str(tmp_path / "logs.txt")
+    index = TimeIndex(log_path, max_gap=256)
+    sink = LogSink(log_path, batch_size=50, time_index=index)
+    for i in range(500):
+        sink.write(f"192.168.1.{i % 250}", "fd00::1", "BLOCKED" if i % 3 else "ALLOWED")
+    sink.close()
+
+    data = open(log_path, "rb").read()
+    assert b"\r\n" not in data
+    with open(index.index_path, "rb") as file:
+        entries = file.read()[timeindex.HEADER.size:]
+    offsets = [offset for _, offset in struct.iter_unpack(timeindex.ENTRY.format, entries)]
+    assert len(offsets) > 1
+    assert all(offset == 0 or data[offset - 1:offset] == b"\n" for offset in offsets)
+
+    found = timeindex.search_log(log_path, source="192.168.1.7")
+    assert len(found) == 2
+
+
+class FailingFile:
+    """File yang selalu gagal ditulis (seperti disk penuh)"""
+
+    def write(self, data):
+        raise OSError(28, "No space left on device")
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def test_write_error_is_reported_instead_of_hanging(tmp_path):
+    sink = LogSink(str(tmp_path / "logs.txt"), batch_size=1, max_queue=2)
+    sink._file.close()
+    sink._file = FailingFile()
+    sink.write("192.168.1.130", "192.168.1.4", "BLOCKED")
+
+    with pytest.raises(OSError):
+        sink.flush()  # Tanpa timeout: tidak boleh menunggu selamanya
+    assert sink._thread.is_alive()
+    with pytest.raises(OSError):
+        sink.write("192.168.1.130", "192.168.1.4", "BLOCKED")
+    with pytest.raises(OSError):
+        sink.close()
+    assert not sink._thread.is_alive()
@@ -0,0 +1,47 @@
+import ipaddress
+
+import pytest
+
+from soho_core.policy import (ALLOWED, ANY, BLOCKED, Policy, Rule, Segment, default_policy,
+                              policy_from_dict)
+
+
+def test_default_policy_blocks_guest_to_internal():
+    policy = default_policy(ipaddress.ip_network("192.168.1.0/25"),
+                            ipaddress.ip_network("192.168.1.128/25"))
+    assert policy.evaluate("192.168.1.130", "192.168.1.4") == (BLOCKED, "guest", "internal")
+    assert policy.evaluate("192.168.1.4", "192.168.1.130").action == ALLOWED
+    assert policy.evaluate("192.168.1.130", "8.8.8.8") == (ALLOWED, "guest", None)
+
+
+def test_first_matching_rule_wins():
+    policy = policy_from_dict({
+        "segments": {"lan": "10.0.0.0/24", "iot": "10.0.1.0/24", "v6": "fd00::/64"},
+        "rules": [
+            {"src": "iot", "dst": "lan", "action": "allow"},
+            {"src": "iot", "dst": ANY, "action": "deny"},
+        ],
+    })
+    assert policy.evaluate("10.0.1.5", "10.0.0.5").action == ALLOWED
+    assert policy.evaluate("10.0.1.5", "fd00::1") == (BLOCKED, "iot", "v6")
+    assert policy.evaluate("10.0.1.5", "1.1.1.1") == (BLOCKED, "iot", None)
+    assert policy.evaluate("fd00::1", "10.0.1.5") == (ALLOWED, "v6", "iot")
+
+
+def test_default_action_applies_without_match():
+    policy = Policy([Segment("lan", "10.0.0.0/24")], [Rule("lan", "lan", "allow")],
+                    default_action="deny")
+    assert policy.evaluate("10.0.0.1", "10.0.0.2").action == ALLOWED
+    assert policy.evaluate("10.0.0.1", "10.0.9.9").action == BLOCKED
+    assert policy.evaluate("10.0.0.1", "::1").action == BLOCKED
+
+
+@pytest.mark.parametrize("segments, rules", [
+    ([Segment("a", "10.0.0.0/24"), Segment("b", "10.0.0.128/25")], []),
+    ([Segment("a", "10.0.0.0/24"), Segment("a", "10.0.1.0/24")], []),
+    ([Segment("a", "10.0.0.0/24")], [Rule("a", "missing", "deny")]),
+    ([Segment("a", "10.0.0.0/24")], [Rule("a", "a", "maybe")]),
+])
+def test_invalid_policy_rejected(segments, rules):
+    with pytest.raises(ValueError):
+        Policy(segments, rules)
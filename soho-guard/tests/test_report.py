@@ -0,0 +1,52 @@
+import ipaddress
+import re
+
+import pytest
+
+pytest.importorskip("reportlab")
+
+from soho_core.logsink import format_log_line
+from soho_core.report import build_report, list_volumes
+
+INTERNAL = ipaddress.ip_network("192.168.1.0/25")
+GUEST = ipaddress.ip_network("192.168.1.128/25")
+
+
+def append_log(path, count):
+    with open(path, "a") as file:
+        for index in range(count):
+            file.write(format_log_line(f"192.168.1.{128 + index % 100}", "192.168.1.4", "BLOCKED",
+                                       "2026-01-14 08:00:00"))
+
+
+def page_count(path):
+    with open(path, "rb") as file:
+        return len(re.findall(rb"/Type /Page\b", file.read()))
+
+
+def test_history_is_split_into_bounded_volumes(tmp_path):
+    log_path, report_path = str(tmp_path / "logs.txt"), str(tmp_path / "report.pdf")
+    append_log(log_path, 2000)  # 32 halaman riwayat (63 baris per halaman)
+    result = build_report(report_path, log_path, INTERNAL, GUEST, volume_pages=10)
+
+    assert result["volumes"] == [str(tmp_path / f"report_vol00{n}.pdf") for n in (2, 3, 4)]
+    assert [page_count(path) for path in [report_path] + result["volumes"]] == [11, 10, 10, 2]
+    assert result["pages"] == 33
+
+    # Log lebih pendek: volume yang tidak terpakai lagi dihapus
+    open(log_path, "w").close()
+    append_log(log_path, 700)
+    result = build_report(report_path, log_path, INTERNAL, GUEST, volume_pages=10)
+    assert [path for _, path in list_volumes(report_path)] == result["volumes"]
+    assert len(result["volumes"]) == 1
+
+
+def test_partial_last_line_is_not_drawn(tmp_path):
+    log_path, report_path = str(tmp_path / "logs.txt"), str(tmp_path / "report.pdf")
+    append_log(log_path, 63)
+    with open(log_path, "a") as file:
+        file.write("2026-01-14 08:00:00 | SRC=192.168.1.130")  # Masih ditulis oleh sink
+    result = build_report(report_path, log_path, INTERNAL, GUEST, volume_pages=1)
+    assert result["records"] == 63
+    assert result["volumes"] == []
+    assert page_count(report_path) == result["pages"] == 2
@@ -0,0 +1,78 @@
+import ipaddress
+import os
+
+import pytest
+
+pytest.importorskip("reportlab")
+
+from soho_core.logsink import format_log_line
+from soho_core.reportcache import ReportCache
+
+INTERNAL = ipaddress.ip_network("192.168.1.0/25")
+GUEST = ipaddress.ip_network("192.168.1.128/25")
+
+
+def append_log(path, count, start=0):
+    with open(path, "a") as file:
+        for index in range(start, start + count):
+            status = "BLOCKED" if index % 3 == 0 else "ALLOWED"
+            file.write(format_log_line(f"192.168.1.{128 + index % 100}", "192.168.1.4", status,
+                                       "2026-01-14 08:00:00"))
+
+
+def test_unchanged_log_reuses_report(tmp_path):
+    log_path = str(tmp_path / "logs.txt")
+    append_log(log_path, 200)
+    cache = ReportCache(str(tmp_path / "report.pdf"))
+    first = cache.build(log_path, INTERNAL, GUEST)
+    second = cache.build(log_path, INTERNAL, GUEST)
+    assert not first["cached"]
+    assert second["cached"]
+    assert second["pages"] == first["pages"]
+    assert "incremental" not in second
+
+
+def test_appended_log_matches_full_build(tmp_path):
+    log_path = str(tmp_path / "logs.txt")
+    append_log(log_path, 200)
+    cache = ReportCache(str(tmp_path / "report.pdf"), keep=1)
+    cache.build(log_path, INTERNAL, GUEST)
+    append_log(log_path, 300, start=200)
+    rebuilt = cache.build(log_path, INTERNAL, GUEST)
+
+    fresh = ReportCache(str(tmp_path / "fresh.pdf")).build(log_path, INTERNAL, GUEST)
+    assert not rebuilt["cached"]
+    assert rebuilt["records"] == fresh["records"] == 500
+    assert rebuilt["totals"] == fresh["totals"]
+    assert rebuilt["pages"] == fresh["pages"]
+    assert len(cache.archives()) == 1
+
+
+def test_appended_log_reuses_full_volumes(tmp_path, monkeypatch):
+    from reportlab import rl_config
+
+    monkeypatch.setattr(rl_config, "invariant", 1)  # PDF tanpa tanggal/ID acak: bisa dibandingkan
+    log_path = str(tmp_path / "logs.txt")
+    append_log(log_path, 2000)
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    cache = ReportCache(str(tmp_path / "a" / "report.pdf"), keep=0, volume_pages=5)
+    first = cache.build(log_path, INTERNAL, GUEST)
+    assert first["drawn"] == first["pages"] and len(first["volumes"]) == 6
+    stamps = {path: os.stat(path).st_mtime_ns for path in first["volumes"]}
+
+    append_log(log_path, 700, start=2000)
+    rebuilt = cache.build(log_path, INTERNAL, GUEST)
+    assert not rebuilt["cached"]
+    assert rebuilt["drawn"] < rebuilt["pages"]
+    assert len(rebuilt["volumes"]) == 8
+    # Volume 2-6 penuh dan tidak disentuh; volume 7 (sebelumnya belum penuh) digambar ulang
+    assert all(os.stat(path).st_mtime_ns == stamps[path] for path in first["volumes"][:-1])
+
+    fresh = ReportCache(str(tmp_path / "b" / "report.pdf"), volume_pages=5).build(log_path, INTERNAL, GUEST)
+    assert (rebuilt["pages"], rebuilt["records"], rebuilt["totals"]) == \
+        (fresh["pages"], fresh["records"], fresh["totals"])
+    for path, fresh_path in zip([cache.report_path] + rebuilt["volumes"],
+                                [str(tmp_path / "b" / "report.pdf")] + fresh["volumes"]):
+        with open(path, "rb") as file, open(fresh_path, "rb") as fresh_file:
+            assert file.read() == fresh_file.read(), path
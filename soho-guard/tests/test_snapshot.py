@@ -0,0 +1,67 @@
+import os
+
+import pytest
+
+from soho_core.engine import GuardEngine
+from soho_core.policy import BLOCKED, Policy, Rule, Segment
+from soho_core.snapshot import PolicySnapshot, resolve_snapshot, write_snapshot
+
+POLICY = Policy([Segment("internal", "192.168.1.0/25"), Segment("guest", "192.168.1.128/25"),
+                 Segment("lab", "fd00::/64")],
+                [Rule("guest", "internal", BLOCKED), Rule("lab", "*", BLOCKED)])
+
+
+@pytest.mark.parametrize("source, destination", [
+    ("192.168.1.200", "192.168.1.10"), ("192.168.1.10", "192.168.1.200"),
+    ("fd00::1", "192.168.1.10"), ("10.0.0.1", "fd00::1"), ("10.0.0.1", "10.0.0.2"),
+])
+def test_snapshot_matches_policy(tmp_path, source, destination):
+    path = str(tmp_path / "policy.snap")
+    version = write_snapshot(POLICY, path)
+    snapshot = PolicySnapshot(path)
+    try:
+        assert snapshot.version == version
+        assert snapshot.evaluate(source, destination) == POLICY.evaluate(source, destination)
+    finally:
+        snapshot.close()
+
+
+def test_new_version_does_not_replace_mapped_file(tmp_path):
+    path = str(tmp_path / "policy.snap")
+    write_snapshot(POLICY, path)
+    reader = PolicySnapshot(path, check_interval=0)
+    mapped = resolve_snapshot(path)
+
+    other = Policy(POLICY.segments, [])
+    version = write_snapshot(other, path)
+
+    assert os.path.exists(mapped)            # File yang di-mmap tidak ditimpa
+    assert resolve_snapshot(path) != mapped
+    assert reader.maybe_reload(force=True)
+    assert reader.version == version
+    assert reader.evaluate("192.168.1.200", "192.168.1.10").action == "ALLOWED"
+    reader.close()
+
+
+def test_old_versions_are_pruned(tmp_path):
+    path = str(tmp_path / "policy.snap")
+    for index in range(6):
+        write_snapshot(Policy([Segment("internal", f"10.{index}.0.0/24")]), path)
+    versions = [name for name in os.listdir(tmp_path) if name.startswith("policy.snap.")]
+    assert len(versions) == 3
+
+
+def test_snapshot_write_error_keeps_local_policy(tmp_path):
+    engine = GuardEngine(str(tmp_path / "logs.txt"),
+                         snapshot_path=str(tmp_path / "missing" / "policy.snap"))
+    engine.generate_subnet("192.168.1.0/24")
+    assert isinstance(engine.snapshot_error, OSError)
+    assert engine.policy_version is None
+    assert engine.evaluate("192.168.1.200", "192.168.1.10", log=False).action == BLOCKED
+
+
+def test_only_pointer_files_are_opened(tmp_path):
+    path = str(tmp_path / "policy.snap")
+    write_snapshot(POLICY, path)
+    with pytest.raises(ValueError):
+        PolicySnapshot(resolve_snapshot(path))  # File versi, bukan pointer
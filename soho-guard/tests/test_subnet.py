@@ -0,0 +1,43 @@
+import ipaddress
+
+import pytest
+
+from soho_core.subnet import split_network, summarize_subnet
+
+NETWORKS = [
+    "192.168.1.0/24", "192.168.1.77/24", "10.0.0.0/30", "10.0.0.4/31", "10.0.0.9/32",
+    "0.0.0.0/0", "10.0.0.0/8", "2001:db8::/64", "2001:db8::5/64", "fd00::/126", "fd00::/127",
+    "fd00::1/128", "::/0",
+]
+
+
+def reference(network):
+    """Ringkasan yang sama, dihitung lewat ipaddress (hosts() hanya untuk subnet kecil)"""
+    if network.num_addresses <= 1024:
+        hosts = list(network.hosts())
+        return hosts[0], hosts[-1], len(hosts)
+    reserved = 2 if network.version == 4 else 1
+    last = network[-2] if network.version == 4 else network[-1]
+    return next(network.hosts()), last, network.num_addresses - reserved
+
+
+@pytest.mark.parametrize("cidr", NETWORKS)
+def test_summary_matches_ipaddress(cidr):
+    network = ipaddress.ip_network(cidr, strict=False)
+    summary = summarize_subnet(cidr)
+    assert summary.network == network
+    assert summary.network_address == network.network_address
+    assert summary.broadcast_address == network.broadcast_address
+    assert (summary.first_host, summary.last_host, summary.host_count) == reference(network)
+
+
+@pytest.mark.parametrize("cidr", [cidr for cidr in NETWORKS if not cidr.endswith(("/32", "/128"))])
+def test_split_matches_ipaddress(cidr):
+    network = ipaddress.ip_network(cidr, strict=False)
+    assert list(split_network(cidr)) == list(network.subnets(prefixlen_diff=1))
+
+
+@pytest.mark.parametrize("cidr", ["10.0.0.9/32", "fd00::1/128"])
+def test_single_address_cannot_be_split(cidr):
+    with pytest.raises(ValueError):
+        split_network(cidr)
@@ -0,0 +1,81 @@
+import ipaddress
+import random
+
+import pytest
+
+from soho_core.subnet import summarize_subnet
+from soho_core.vlsm import parse_requirements, plan_vlsm, prefix_for_hosts
+
+
+def check_plan(plan, requirements):
+    blocks = sorted([alloc.network for alloc in plan.allocations] + plan.free_blocks,
+                    key=lambda net: int(net.network_address))
+    # Alokasi + blok bebas menutup network induk tanpa overlap dan tanpa celah
+    position = int(plan.parent.network_address)
+    for block in blocks:
+        assert block.subnet_of(plan.parent)
+        assert int(block.network_address) == position
+        assert int(block.network_address) % block.num_addresses == 0  # Rata dengan ukuran blok
+        position += block.num_addresses
+    assert position == int(plan.parent.broadcast_address) + 1
+
+    wanted = dict(requirements)
+    assert sorted(alloc.name for alloc in plan.allocations) == sorted(wanted)
+    for alloc in plan.allocations:
+        assert alloc.summary.host_count >= wanted[alloc.name]
+        if alloc.network.prefixlen < alloc.network.max_prefixlen:
+            # Subnet satu tingkat lebih kecil tidak akan muat
+            smaller = next(alloc.network.subnets(prefixlen_diff=1))
+            assert summarize_subnet(smaller).host_count < wanted[alloc.name]
+
+
+@pytest.mark.parametrize("parent, text", [
+    ("192.168.1.0/24", "internal=100, guest=20"),
+    ("192.168.1.0/24", "a=126, b=62, c=30, d=14, e=6, f=2, g=1"),
+    ("10.0.0.0/16", "lan=1000, iot=500, dmz=30, p2p=2, loop=1"),
+    ("2001:db8::/120", "lan=127, iot=63, mgmt=1"),
+])
+def test_plan_has_no_overlap_and_aligned_blocks(parent, text):
+    requirements = parse_requirements(text)
+    check_plan(plan_vlsm(parent, requirements), requirements)
+
+
+def test_random_plans_stay_consistent():
+    rng = random.Random(7)
+    for _ in range(200):
+        requirements = [(f"s{index}", rng.choice([1, 2, 5, 14, 30, 60, 120]))
+                        for index in range(rng.randint(1, 8))]
+        try:
+            plan = plan_vlsm("10.0.0.0/24", requirements)
+        except ValueError:
+            needed = sum(1 << (32 - prefix_for_hosts(hosts)) for _, hosts in requirements)
+            assert needed > 256
+            continue
+        check_plan(plan, requirements)
+
+
+def test_exhausted_space_is_rejected():
+    with pytest.raises(ValueError):
+        plan_vlsm("192.168.1.0/24", parse_requirements("internal=200, guest=20"))
+    with pytest.raises(ValueError):
+        plan_vlsm("192.168.1.0/24", [("big", 300)])
+    plan = plan_vlsm("192.168.1.0/24", [("a", 126), ("b", 126)])
+    assert plan.free_blocks == [] and plan.allocated_addresses == 256
+
+
+@pytest.mark.parametrize("hosts", [0, -1])
+def test_zero_hosts_rejected(hosts):
+    with pytest.raises(ValueError):
+        prefix_for_hosts(hosts)
+    with pytest.raises(ValueError):
+        plan_vlsm("192.168.1.0/24", [("empty", hosts)])
+
+
+@pytest.mark.parametrize("hosts, prefix, prefix_v6", [
+    (1, 32, 128), (2, 31, 127), (3, 29, 126), (6, 29, 125), (7, 28, 125), (254, 24, 120),
+    (255, 23, 120), (256, 23, 119),
+])
+def test_prefix_for_hosts(hosts, prefix, prefix_v6):
+    assert prefix_for_hosts(hosts) == prefix
+    assert prefix_for_hosts(hosts, 128) == prefix_v6
+    assert summarize_subnet(ipaddress.ip_network(f"10.0.0.0/{prefix}")).host_count >= hosts